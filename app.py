@@ -1,6 +1,194 @@
+import altair as alt
+import numpy as np
+import pandas as pd
 import streamlit as st
-from pulp import LpStatusOptimal, LpStatusInfeasible, LpStatusUnbounded, LpStatusUndefined, LpMaximize, LpMinimize
+from pulp import (LpStatusOptimal, LpStatusInfeasible, LpStatusUnbounded, LpStatusUndefined, LpStatusNotSolved,
+                  LpMaximize, LpMinimize, LpContinuous, LpInteger, LpBinary)
+from background import DONE, FAILED, QUEUED, SolveJob
+from constraint_store import SENSE_SYMBOLS
 from linear_optimization import Optimizer
+from model_table import (RHS_COLUMN, SENSE_COLUMN, SENSE_OPTIONS, empty_tables, model_arrays,
+                         read_table, resize_tables)
+from sensitivity import dense_matrix
+import session_store
+from solution_cache import shared_cache
+from solver_backends import STATUS_TIME_LIMIT
+
+# Quanto o clique em "Calcular" espera pela resolução em segundo plano: modelos
+# pequenos aparecem direto, sem passar pela barra de progresso
+SOLVE_WAIT = 2.0
+# Intervalo de atualização da barra de progresso, em segundos
+PROGRESS_INTERVAL = 0.5
+# Aviso quando o snapshot da sessão foi descartado pelo limite de memória (ver `session_store`)
+SNAPSHOT_EVICTED = "O modelo desta sessão saiu da memória do servidor. Clique em Calcular Otimização novamente."
+
+# Tipos de variável oferecidos na entrada (ver `Optimizer.set_variable_type`)
+VARIABLE_TYPES = {"Contínua": LpContinuous, "Inteira": LpInteger, "Binária": LpBinary}
+
+# Nomes das fases de `Optimizer.solve` exibidos no painel de desempenho
+PHASE_LABELS = {
+    "presolve": "Presolve",
+    "cache": "Consulta ao cache",
+    "montagem_modelo": "Montagem do modelo",
+    "escrita_arquivo": "Escrita do arquivo MPS",
+    "solver": "Solver",
+    "leitura_solucao": "Leitura da solução",
+    "postsolve": "Postsolve",
+    "resultados": "Montagem dos resultados",
+    "faixas": "Faixas dos custos",
+    "relaxacao": "Relaxação linear",
+}
+
+
+def sweep_chart(sweep_result, parameter_label):
+    """
+    Monta o gráfico da função valor ótimo de `Optimizer.sweep`: uma linha pelos
+    extremos dos trechos e um ponto em cada ponto de quebra.
+    """
+    points = [(segment[edge], segment[f"valor_{edge}"])
+              for segment in sweep_result["segmentos"] if segment["status"] == LpStatusOptimal
+              for edge in ("inicio", "fim")]
+    curve = pd.DataFrame(points, columns=["parametro", "valor"])
+    breaks = curve[curve["parametro"].isin(sweep_result["pontos_de_quebra"])]
+    x = alt.X("parametro:Q", title=parameter_label)
+    y = alt.Y("valor:Q", title="Z*")
+    line = alt.Chart(curve).mark_line().encode(x=x, y=y)
+    dots = alt.Chart(breaks).mark_point(filled=True, size=60).encode(x=x, y=y)
+    return line + dots
+
+
+def conflict_table(optimizer, variable_names, rows):
+    """Descreve as restrições de um IIS (ver `Optimizer.infeasible_subset`) para exibição."""
+    indptr, indices, data = optimizer.constraints.csr()
+    expressions = []
+    for i in rows:
+        terms = " + ".join(f"{value:g}·{variable_names[j]}"
+                           for j, value in zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]))
+        sense = SENSE_SYMBOLS[int(optimizer.constraints.senses[i])]
+        expressions.append(f"{terms} {sense} {optimizer.constraints.rhs[i]:g}")
+    return {"Restrição": [optimizer.constraints.names[i] for i in rows], "Expressão": expressions}
+
+
+@st.fragment(run_every=PROGRESS_INTERVAL)
+def solve_progress(job):
+    """Mostra o andamento de uma resolução em segundo plano, com o botão de cancelar."""
+    if job.done():
+        # Roda o app inteiro para exibir os resultados
+        st.rerun()
+    if job.state == QUEUED:
+        st.info("Aguardando um processo livre para resolver o modelo...")
+    else:
+        elapsed = job.elapsed()
+        st.progress(min(elapsed / job.time_limit, 1.0),
+                    text=f"Resolvendo... {elapsed:.1f} s (limite de {job.time_limit:.0f} s)")
+    if st.button("Cancelar resolução"):
+        job.cancel()
+        st.rerun()
+
+
+def apply_model_diff(optimizer, current_model):
+    """
+    Aplica ao otimizador apenas as diferenças entre o modelo que ele contém
+    (reconstruído do snapshot da sessão) e o estado atual da entrada (mesmo
+    número de variáveis e mesmo sentido). A comparação é feita em bloco com
+    NumPy, então também serve à grade.
+    Retorna:
+        list: As alterações aplicadas, como pares (nome do método, argumentos),
+        que o processo de resolução reaplica ao otimizador da sessão (ver `SolveJob`).
+    """
+    edits = []
+
+    def edit(method, *args):
+        getattr(optimizer, method)(*args)
+        edits.append((method, args))
+
+    n = optimizer.num_variables
+    old_c, new_c = np.asarray(optimizer.coef_fo, dtype=float), np.asarray(current_model["c"], dtype=float)
+    for j in np.flatnonzero(old_c != new_c):
+        edit("update_objective_coeff", int(j), float(new_c[j]))
+
+    old_A = dense_matrix(optimizer.constraints.csr(), n)
+    new_A = np.asarray(current_model["A"], dtype=float).reshape(-1, n)
+    old_b, new_b = optimizer.constraints.rhs.copy(), np.asarray(current_model["b"], dtype=float)
+    old_ops = [SENSE_SYMBOLS[int(code)] for code in optimizer.constraints.senses]
+    common = min(len(old_A), len(new_A))
+    for i, j in np.argwhere(old_A[:common] != new_A[:common]):
+        edit("update_coefficient", int(i), int(j), float(new_A[i, j]))
+    for i in np.flatnonzero(old_b[:common] != new_b[:common]):
+        edit("update_rhs", int(i), float(new_b[i]))
+    for i in range(common):
+        if old_ops[i] != current_model["ops"][i]:
+            edit("update_sense", i, current_model["ops"][i])
+
+    for i in reversed(range(common, len(old_A))):
+        edit("remove_constraint", i)
+    for i in range(common, len(new_A)):
+        edit("add_constraint", new_A[i], float(new_b[i]), f"R{i+1}", current_model["ops"][i])
+
+    old_types = variable_types(optimizer)
+    for j, cat in enumerate(current_model["types"]):
+        if cat != old_types[j]:
+            if old_types[j] == LpBinary:
+                # Volta aos limites padrão, trocados por [0, 1] na binária
+                edit("set_variable_bounds", j)
+            edit("set_variable_type", j, cat)
+    return edits
+
+
+def variable_types(optimizer):
+    """Tipo de cada variável do otimizador; as binárias são as inteiras com limites [0, 1]."""
+    binary = optimizer.integer & (optimizer.lower_bounds == 0) & (optimizer.upper_bounds == 1)
+    return [LpBinary if is_binary else LpInteger if is_integer else LpContinuous
+            for is_integer, is_binary in zip(optimizer.integer.tolist(), binary.tolist())]
+
+
+def session_optimizer():
+    """
+    Reconstrói o otimizador da sessão a partir do seu snapshot.
+    Retorna:
+        Optimizer: O otimizador, ou None se a sessão ainda não resolveu um
+        modelo ou se o snapshot foi descartado pelo limite de memória.
+    """
+    # O cache é compartilhado entre as sessões: modelos repetidos não são resolvidos de novo
+    return session_store.load(st.session_state.get("snapshot_key"), cache=shared_cache)
+
+
+def load_uploaded_model():
+    """Carrega o arquivo enviado nas tabelas da grade (callback do st.file_uploader)."""
+    uploaded = st.session_state.get("model_file")
+    if uploaded is None:
+        return
+    try:
+        objective, constraints = read_table(uploaded)
+    except Exception as error:
+        st.session_state.grid_error = f"Não foi possível ler o arquivo: {error}"
+        return
+    if objective.shape[1] < 2:
+        st.session_state.grid_error = "O modelo deve ter ao menos 2 variáveis."
+        return
+    st.session_state.grid_error = None
+    st.session_state.grid_objective = objective
+    st.session_state.grid_constraints = constraints
+    st.session_state.num_vars = objective.shape[1]
+    reset_grid_editors()
+
+
+def resize_grid():
+    """Mantém o conteúdo editado da grade ao mudar o número de variáveis."""
+    if "grid_objective" not in st.session_state:
+        return
+    objective = st.session_state.get("grid_objective_edited", st.session_state.grid_objective)
+    constraints = st.session_state.get("grid_constraints_edited", st.session_state.grid_constraints)
+    st.session_state.grid_objective, st.session_state.grid_constraints = resize_tables(
+        objective, constraints, st.session_state.num_vars)
+    reset_grid_editors()
+
+
+def reset_grid_editors():
+    """Descarta as edições pendentes dos editores (os dados de base foram trocados)."""
+    for key in ("grid_objective_editor", "grid_constraints_editor"):
+        st.session_state.pop(key, None)
+
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -37,12 +225,26 @@ if 'num_vars' not in st.session_state:
     st.session_state.num_vars = 2
 if 'num_restrs' not in st.session_state:
     st.session_state.num_restrs = 2
+# A opção do painel de desempenho é reatribuída a cada execução para não se perder
+# enquanto o painel não é exibido (durante uma resolução)
+st.session_state.trace_memory = st.session_state.get("trace_memory", False)
+
+st.radio(
+    "Modo de Entrada",
+    ["Formulário", "Grade"],
+    key="input_mode",
+    horizontal=True,
+    help="A grade edita o modelo inteiro em uma única tabela e aceita arquivos CSV ou Parquet, "
+         "o que mantém a página rápida em problemas grandes.",
+)
+grid_mode = st.session_state.input_mode == "Grade"
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    num_vars = st.number_input("Número de Variáveis", min_value=2, key="num_vars")
+    num_vars = st.number_input("Número de Variáveis", min_value=2, key="num_vars", on_change=resize_grid)
 with col2:
-    num_restrs = st.number_input("Número de Restrições", min_value=1, key="num_restrs")
+    num_restrs = st.number_input("Número de Restrições", min_value=1, key="num_restrs", disabled=grid_mode,
+                                 help="Na grade, as restrições são adicionadas diretamente na tabela.")
 with col3:
     st.radio(
         "Tipo de Otimização",
@@ -51,32 +253,108 @@ with col3:
         horizontal=True, # Deixa os botões lado a lado
     )
 
-# Função Objetivo
-st.markdown(f'<div class="section-header green-header"><h4>Função Objetivo ({st.session_state.objective_sense})</h4></div>', unsafe_allow_html=True)
-with st.container(border=True):
-    cols_fo = st.columns(st.session_state.num_vars)
-    variable_names = []
-    for i in range(st.session_state.num_vars):
-        with cols_fo[i]:
-            var_name = st.text_input(f"Nome da Variável", value=f"x{i + 1}", key=f"var_name_{i}")
-            variable_names.append(var_name)
-            st.number_input(f"Coeficiente F.O.", key=f"c_{i}", value=0)
-
-# Restrições
-st.markdown('<div class="section-header purple-header"><h4>Restrições</h4></div>', unsafe_allow_html=True)
-for i in range(st.session_state.num_restrs):
-    with st.expander(f"**Configurar Restrição: R{i + 1}**"):
-        st.write("**Coeficientes das Variáveis:**")
-        cols_vars = st.columns(st.session_state.num_vars)
-        for j, name in enumerate(variable_names):
-            with cols_vars[j]:
-                st.number_input(label=name, key=f"a_{i}_{j}", format="%.2f", value=0.0)
-        st.divider()
-        col1, col2 = st.columns(2)
-        with col1:
-            st.selectbox("Operador", ["<=", ">="], key=f"op_{i}")
-        with col2:
-            st.number_input("Lado Direito (LD)", key=f"b_{i}", format="%.2f", value=0.0)
+if grid_mode:
+    if "grid_objective" not in st.session_state:
+        st.session_state.grid_objective, st.session_state.grid_constraints = empty_tables(num_vars, num_restrs)
+
+    st.file_uploader(
+        "Importar modelo (CSV ou Parquet)",
+        type=["csv", "parquet"],
+        key="model_file",
+        on_change=load_uploaded_model,
+        help="Uma coluna por variável, mais as colunas \"Operador\" e \"LD\". "
+             "A primeira linha é a função objetivo.",
+    )
+    if st.session_state.get("grid_error"):
+        st.error(st.session_state.grid_error)
+
+    st.markdown(f'<div class="section-header green-header"><h4>Função Objetivo ({st.session_state.objective_sense})</h4></div>', unsafe_allow_html=True)
+    objective_table = st.data_editor(st.session_state.grid_objective, key="grid_objective_editor",
+                                     use_container_width=True)
+
+    st.markdown('<div class="section-header purple-header"><h4>Restrições</h4></div>', unsafe_allow_html=True)
+    constraints_table = st.data_editor(
+        st.session_state.grid_constraints,
+        key="grid_constraints_editor",
+        num_rows="dynamic",
+        use_container_width=True,
+        column_config={
+            SENSE_COLUMN: st.column_config.SelectboxColumn(SENSE_COLUMN, options=SENSE_OPTIONS, default="<="),
+            RHS_COLUMN: st.column_config.NumberColumn(RHS_COLUMN, default=0.0),
+        },
+    )
+    # Guardado para preservar as edições quando o número de variáveis muda
+    st.session_state.grid_objective_edited = objective_table
+    st.session_state.grid_constraints_edited = constraints_table
+    variable_names = [str(name) for name in objective_table.columns]
+    num_restrs = len(constraints_table)
+    col1, col2 = st.columns(2)
+    with col1:
+        integer_names = st.multiselect("Variáveis inteiras", variable_names, key="grid_integer")
+    with col2:
+        binary_names = st.multiselect("Variáveis binárias", variable_names, key="grid_binary")
+    variable_cats = [LpBinary if name in binary_names else LpInteger if name in integer_names else LpContinuous
+                     for name in variable_names]
+else:
+    # Função Objetivo
+    st.markdown(f'<div class="section-header green-header"><h4>Função Objetivo ({st.session_state.objective_sense})</h4></div>', unsafe_allow_html=True)
+    with st.container(border=True):
+        cols_fo = st.columns(st.session_state.num_vars)
+        variable_names = []
+        for i in range(st.session_state.num_vars):
+            with cols_fo[i]:
+                var_name = st.text_input(f"Nome da Variável", value=f"x{i + 1}", key=f"var_name_{i}")
+                variable_names.append(var_name)
+                st.number_input(f"Coeficiente F.O.", key=f"c_{i}", value=0)
+                st.selectbox("Tipo", list(VARIABLE_TYPES), key=f"type_{i}")
+        variable_cats = [VARIABLE_TYPES[st.session_state[f"type_{i}"]] for i in range(st.session_state.num_vars)]
+
+    # Objetivos seguintes da otimização lexicográfica, em ordem de prioridade
+    num_objectives = st.number_input("Número de Objetivos", min_value=1, value=1, key="num_objectives",
+                                     help="Com mais de um, cada objetivo é otimizado mantendo os anteriores "
+                                          "no ótimo, a menos da tolerância de cada um.")
+    if num_objectives > 1:
+        st.number_input("Tolerância do Objetivo 1 (%)", min_value=0.0, max_value=100.0, value=0.0, step=0.5,
+                        key="obj_tol_0", help="Quanto o objetivo pode piorar para melhorar os seguintes.")
+    for k in range(1, num_objectives):
+        with st.container(border=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.radio(f"Objetivo {k + 1}", ["Maximizar", "Minimizar"], key=f"obj_sense_{k}", horizontal=True)
+            with col2:
+                st.number_input("Tolerância (%)", min_value=0.0, max_value=100.0, value=0.0, step=0.5,
+                                key=f"obj_tol_{k}")
+            cols_obj = st.columns(st.session_state.num_vars)
+            for i, name in enumerate(variable_names):
+                with cols_obj[i]:
+                    st.number_input(name, key=f"obj_{k}_{i}", value=0)
+
+    # Restrições
+    st.markdown('<div class="section-header purple-header"><h4>Restrições</h4></div>', unsafe_allow_html=True)
+    for i in range(st.session_state.num_restrs):
+        with st.expander(f"**Configurar Restrição: R{i + 1}**"):
+            st.write("**Coeficientes das Variáveis:**")
+            cols_vars = st.columns(st.session_state.num_vars)
+            for j, name in enumerate(variable_names):
+                with cols_vars[j]:
+                    st.number_input(label=name, key=f"a_{i}_{j}", format="%.2f", value=0.0)
+            st.divider()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.selectbox("Operador", ["<=", ">="], key=f"op_{i}")
+            with col2:
+                st.number_input("Lado Direito (LD)", key=f"b_{i}", format="%.2f", value=0.0)
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.number_input("Limite de Tempo (s)", min_value=1.0, value=60.0, step=10.0, key="time_limit",
+                    help="Ao atingir o limite, o solver para e devolve a melhor solução viável encontrada.")
+with col2:
+    st.number_input("Gap Relativo (%)", min_value=0.0, max_value=100.0, value=0.0, step=0.5, key="mip_gap",
+                    help="Com variáveis inteiras, o solver para quando a solução está a menos disto do limite dual.")
+with col3:
+    st.number_input("Threads", min_value=0, value=0, step=1, key="threads",
+                    help="Threads do solver com variáveis inteiras (0: o padrão do solver).")
 
 # Botão Calcular
 if st.button("Calcular Otimização", type="primary", use_container_width=True):
@@ -86,21 +364,96 @@ if st.button("Calcular Otimização", type="primary", use_container_width=True):
     }
     selected_sense = sense_map[st.session_state.objective_sense]
 
-    optimizer = Optimizer(num_vars, sense=selected_sense)
+    # Estado atual da entrada, comparado com o último modelo resolvido
+    if grid_mode:
+        try:
+            c, A, b, ops = model_arrays(objective_table, constraints_table)
+        except ValueError as error:
+            st.error(str(error))
+            st.stop()
+        current_model = {"sense": selected_sense, "c": c, "A": A, "b": b, "ops": ops, "types": variable_cats}
+    else:
+        current_model = {
+            "sense": selected_sense,
+            "c": [st.session_state[f"c_{i}"] for i in range(num_vars)],
+            "A": [[st.session_state[f"a_{i}_{j}"] for j in range(num_vars)] for i in range(num_restrs)],
+            "b": [st.session_state[f"b_{i}"] for i in range(num_restrs)],
+            "ops": [st.session_state[f"op_{i}"] for i in range(num_restrs)],
+            "types": variable_cats,
+        }
+    optimizer = session_optimizer()
 
-    coef_fo = [st.session_state[f"c_{i}"] for i in range(num_vars)]
-    optimizer.set_objective_function(coef_fo)
+    # Alterações desde a última resolução, enviadas no lugar do modelo (ver `SolveJob`)
+    edits = None
+    if optimizer is None or optimizer.sense != selected_sense or optimizer.num_variables != num_vars:
+        optimizer = Optimizer.from_arrays(current_model["c"],
+                                          np.asarray(current_model["A"], dtype=float).reshape(-1, num_vars),
+                                          current_model["b"], current_model["ops"],
+                                          sense=selected_sense, cache=shared_cache)
+        for j, cat in enumerate(current_model["types"]):
+            if cat != LpContinuous:
+                optimizer.set_variable_type(j, cat)
+    else:
+        # Envia ao otimizador apenas o que mudou desde a última resolução. O processo que
+        # resolveu a sessão guarda o seu otimizador: recebe só essas alterações e parte da
+        # base anterior (nos modelos inteiros, da solução anterior)
+        edits = apply_model_diff(optimizer, current_model)
+    # Os objetivos da otimização lexicográfica, resolvida depois do modelo principal
+    st.session_state.objectives = None
+    if not grid_mode and st.session_state.num_objectives > 1:
+        st.session_state.objectives = [{"coeficientes": current_model["c"], "sentido": selected_sense,
+                                        "tolerancia": st.session_state.obj_tol_0 / 100}]
+        for k in range(1, st.session_state.num_objectives):
+            st.session_state.objectives.append({
+                "coeficientes": [st.session_state[f"obj_{k}_{i}"] for i in range(num_vars)],
+                "sentido": sense_map[st.session_state[f"obj_sense_{k}"]],
+                "tolerancia": st.session_state[f"obj_tol_{k}"] / 100,
+            })
+    optimizer.mip_gap = st.session_state.mip_gap / 100
+    optimizer.threads = st.session_state.threads or None
 
-    for i in range(num_restrs):
-        coef_rest = [st.session_state[f"a_{i}_{j}"] for j in range(num_vars)]
-        rhs = st.session_state[f"b_{i}"]
-        sense = st.session_state[f"op_{i}"]
-        optimizer.add_constraint(coef_rest, rhs, f"R{i+1}", sense)
+    # A resolução roda em um dos processos de `background.py` (os modelos pequenos, na hora);
+    # um novo envio cancela o anterior da sessão
+    previous_job = st.session_state.get("solve_job")
+    if previous_job is not None:
+        previous_job.cancel()
+    # Sem as faixas dos custos, que pedem a base ótima: ver "Custos Reduzidos" nos resultados
+    if st.session_state.get("snapshot_key") is None:
+        st.session_state.snapshot_key = session_store.new_session_key()
+    solve_job = SolveJob(optimizer, time_limit=st.session_state.time_limit, session=st.session_state.snapshot_key,
+                         edits=edits, trace_memory=st.session_state.trace_memory)
+    st.session_state.solve_job = solve_job
+    st.session_state.show_results = False
+    solve_job.wait(SOLVE_WAIT)
 
-    resultados = optimizer.solve()
-    st.session_state.resultados = resultados
-    st.session_state.optimizer = optimizer  # <-- ESSENCIAL
-    st.session_state.show_results = True
+# Resolução em segundo plano
+solve_job = st.session_state.get("solve_job")
+if solve_job is not None and solve_job.done():
+    st.session_state.solve_job = None
+    if solve_job.state == DONE:
+        optimizer = solve_job.optimizer
+        resultados = st.session_state.resultados = solve_job.result()
+        # As restrições em conflito são calculadas agora: depois, a sessão só tem o snapshot
+        st.session_state.conflict = None
+        st.session_state.pop("cost_ranges", None)
+        if resultados["viavel"] == LpStatusInfeasible:
+            conflict = optimizer.infeasible_subset()
+            conflict["tabela"] = conflict_table(optimizer, variable_names, conflict["linhas"])
+            st.session_state.conflict = conflict
+        # Os estágios partem de uma cópia do modelo resolvido, que não é alterado
+        st.session_state.lexicographic = None
+        objectives = st.session_state.get("objectives")
+        if objectives and resultados["viavel"] in (LpStatusOptimal, STATUS_TIME_LIMIT):
+            st.session_state.lexicographic = optimizer.solve_lexicographic(objectives)
+        # A sessão guarda só o snapshot do modelo resolvido, no lugar do otimizador
+        st.session_state.snapshot_bytes = session_store.save(st.session_state.snapshot_key, optimizer)
+        st.session_state.show_results = True
+    elif solve_job.state == FAILED:
+        st.error(f"Erro na resolução: {solve_job.error}")
+    else:
+        st.info("Resolução cancelada.")
+elif solve_job is not None:
+    solve_progress(solve_job)
 
 # Resultados
 if st.session_state.get('show_results', False):
@@ -112,10 +465,16 @@ if st.session_state.get('show_results', False):
     with col1:
         with st.container(border=True):
             st.subheader("Valores Ótimos")
-            for i in range(num_vars):
-                var_name = variable_names[i]
-                val = st.session_state.resultados["valores_otimos"][i]
-                st.metric(label=f"{var_name}*", value=f"{val:.2f}")
+            if grid_mode:
+                # Uma tabela só em vez de um st.metric por variável
+                st.dataframe({"Variável": [f"{name}*" for name in variable_names],
+                              "Valor": st.session_state.resultados["valores_otimos"]},
+                             hide_index=True, use_container_width=True)
+            else:
+                for i in range(num_vars):
+                    var_name = variable_names[i]
+                    val = st.session_state.resultados["valores_otimos"][i]
+                    st.metric(label=f"{var_name}*", value=f"{val:.2f}")
 
     with col2:
         resultados = st.session_state.get("resultados", None)
@@ -123,12 +482,17 @@ if st.session_state.get('show_results', False):
         if resultados:
             status = resultados["viavel"]
 
-            # Exibe o Valor Ótimo (Z*) apenas se a solução for ótima
-            if status == LpStatusOptimal:
+            # Exibe o Valor Ótimo (Z*) apenas se houver solução (ótima ou a melhor no limite de tempo)
+            if status in (LpStatusOptimal, STATUS_TIME_LIMIT):
                 with st.container(border=True):
                     st.subheader("Valor Ótimo (Z*)")
                     z = resultados["valor_objetivo"]
                     st.metric(label="Z*", value=f"{z:.2f}")
+                    if "limite_dual" in resultados:
+                        # Modelo inteiro: o limite dual diz quanto a solução ainda pode estar do ótimo
+                        bound, gap = resultados["limite_dual"], resultados["gap"]
+                        st.metric(label="Limite Dual", value=f"{bound:.2f}" if bound is not None else "-")
+                        st.metric(label="Gap", value=f"{gap * 100:.2f}%" if gap is not None else "-")
 
             # Exibe a mensagem de STATUS correspondente
             with st.container(border=True):
@@ -139,6 +503,16 @@ if st.session_state.get('show_results', False):
 
                 elif status == LpStatusInfeasible:
                     st.error("Solução Inviável")
+                    # As restrições em conflito: nenhuma delas pode sair sem que as demais fiquem viáveis
+                    conflict = st.session_state.get("conflict")
+                    if conflict and conflict["linhas"]:
+                        st.markdown("**Restrições em conflito:** "
+                                    + ", ".join(f":red[**{name}**]" for name in conflict["nomes"]))
+                        st.dataframe(conflict["tabela"], hide_index=True, use_container_width=True)
+                        st.caption(f"Subconjunto irredutível inviável calculado em "
+                                   f"{conflict['segundos'] * 1000:.0f} ms ({conflict['candidatas']} candidatas).")
+                    else:
+                        st.caption("Não foi possível isolar as restrições em conflito.")
 
                 elif status == LpStatusUnbounded:
                     st.warning("Solução Ilimitada")
@@ -146,12 +520,79 @@ if st.session_state.get('show_results', False):
                 elif status == LpStatusUndefined:
                     st.error("Solução Indefinida")
 
+                elif status == STATUS_TIME_LIMIT:
+                    st.warning("Limite de tempo atingido: melhor solução viável encontrada, sem prova de otimalidade")
+
+                elif status == LpStatusNotSolved:
+                    st.error("Limite de tempo atingido sem solução viável")
+
+                cache_stats = shared_cache.stats()
+                st.caption(f"Cache de soluções: {cache_stats['acertos']} acertos, "
+                           f"{cache_stats['faltas']} faltas")
+
     with col3:
+        # Nos modelos inteiros os preços sombra e os custos reduzidos vêm da relaxação linear
+        relaxation = st.session_state.resultados.get("precos_sombra_origem") == "relaxacao_linear"
         with st.container(border=True):
-            st.subheader("Preços Sombra")
-            for i in range(num_restrs):
-                ps = st.session_state.resultados["precos_sombra"][i]
-                st.metric(label=f"PS (R{i+1})", value=f"{ps:.2f}")
+            st.subheader("Preços Sombra (relaxação LP)" if relaxation else "Preços Sombra")
+            if grid_mode:
+                st.dataframe({"Restrição": [f"PS (R{i+1})" for i in range(num_restrs)],
+                              "Preço Sombra": st.session_state.resultados["precos_sombra"]},
+                             hide_index=True, use_container_width=True)
+            else:
+                for i in range(num_restrs):
+                    ps = st.session_state.resultados["precos_sombra"][i]
+                    st.metric(label=f"PS (R{i+1})", value=f"{ps:.2f}")
+        if st.session_state.resultados["viavel"] == LpStatusOptimal and relaxation:
+            with st.container(border=True):
+                st.subheader("Custos Reduzidos (relaxação LP)")
+                st.dataframe({"Variável": variable_names,
+                              "Custo Reduzido": st.session_state.resultados.dj},
+                             hide_index=True, use_container_width=True)
+        elif st.session_state.resultados["viavel"] == LpStatusOptimal:
+            with st.container(border=True):
+                st.subheader("Custos Reduzidos")
+                custos = {"Variável": variable_names, "Custo Reduzido": st.session_state.resultados.dj}
+                # Faixas em que cada coeficiente da FO pode variar sem mudar a solução ótima: pedem
+                # a base ótima e só são calculadas quando pedidas, uma vez por resolução
+                if st.toggle("Mostrar faixas dos coeficientes da FO", key="show_cost_ranges"):
+                    if "cost_ranges" not in st.session_state:
+                        optimizer = session_optimizer()
+                        if optimizer is None:
+                            st.warning(SNAPSHOT_EVICTED)
+                        else:
+                            st.session_state.cost_ranges = optimizer.cost_ranges()
+                    ranges = st.session_state.get("cost_ranges")
+                    if ranges is not None:
+                        custos["Pode Diminuir"] = ranges["diminuicao"]
+                        custos["Pode Aumentar"] = ranges["aumento"]
+                    elif "cost_ranges" in st.session_state:
+                        st.info("A base ótima deste modelo não está disponível: "
+                                "as faixas não podem ser calculadas.")
+                st.dataframe(custos, hide_index=True, use_container_width=True)
+    lexicographic = st.session_state.get("lexicographic")
+    if lexicographic is not None:
+        st.markdown("---")
+        st.markdown('<div class="section-header green-header"><h4>Otimização Lexicográfica</h4></div>',
+                    unsafe_allow_html=True)
+        stages = lexicographic["estagios"]
+        st.dataframe({"Objetivo": [stage["nome"] for stage in stages],
+                      "Sentido": ["Maximizar" if stage["sentido"] == LpMaximize else "Minimizar" for stage in stages],
+                      "Valor": [stage["valor"] for stage in stages],
+                      "Travado em": [stage["trava"] for stage in stages],
+                      "Tempo (ms)": [stage["segundos"] * 1000 for stage in stages],
+                      "Iterações": [stage["iteracoes"] for stage in stages]},
+                     hide_index=True, use_container_width=True)
+        if lexicographic["valores_otimos"] is not None:
+            st.dataframe({"Variável": [f"{name}*" for name in variable_names],
+                          "Valor": lexicographic["valores_otimos"]},
+                         hide_index=True, use_container_width=True)
+        if lexicographic["status"] not in (LpStatusOptimal, STATUS_TIME_LIMIT):
+            st.warning(f"O estágio \"{stages[-1]['nome']}\" não tem solução: "
+                       "a solução acima é a do estágio anterior.")
+        st.caption(f"{len(stages)} estágios em {lexicographic['segundos'] * 1000:.1f} ms, "
+                   "cada um partindo da solução do anterior.")
+
     st.markdown("---")
     st.markdown('<div class="section-header red-header"><h4>Análise de Aumento de Recurso (Delta)</h4></div>',
                 unsafe_allow_html=True)
@@ -162,11 +603,91 @@ if st.session_state.get('show_results', False):
 
     if st.button("Simular aumento de recurso"):
         constr_index = int(constr_to_increase[1:]) - 1
-        optimizer = st.session_state.optimizer
-        delta_result = optimizer.analyze_delta(constr_index, delta_val)
-        st.metric("Novo Valor Objetivo Estimado", f"{delta_result['novo_valor_objetivo']:.2f}")
-        st.metric("Melhora no Lucro", f"{delta_result['melhora']:.2f}")
-        if delta_result["pode_aumentar"]:
-            st.success("Aumento viável e traz melhora.")
+        optimizer = session_optimizer()
+        if optimizer is None:
+            st.warning(SNAPSHOT_EVICTED)
         else:
-            st.warning("Aumento pode não ser viável ou não traz melhora.")
\ No newline at end of file
+            delta_result = optimizer.analyze_delta(constr_index, delta_val)
+            st.metric("Novo Valor Objetivo Estimado", f"{delta_result['novo_valor_objetivo']:.2f}")
+            st.metric("Melhora no Lucro", f"{delta_result['melhora']:.2f}")
+            if delta_result["metodo"] == "preco_sombra":
+                st.caption("Calculado pelo preço sombra (o delta está dentro da faixa da base ótima).")
+            elif delta_result["metodo"] == "resolucao" and optimizer.is_mip:
+                st.caption("Calculado resolvendo o modelo inteiro novamente, a partir da solução anterior.")
+            elif delta_result["metodo"] == "resolucao":
+                st.caption("Calculado resolvendo o modelo novamente (o delta sai da faixa da base ótima).")
+            if delta_result["pode_aumentar"]:
+                st.success("Aumento viável e traz melhora.")
+            else:
+                st.warning("Aumento pode não ser viável ou não traz melhora.")
+
+    st.markdown("---")
+    st.markdown('<div class="section-header red-header"><h4>Análise Paramétrica</h4></div>',
+                unsafe_allow_html=True)
+
+    sweep_options = ([f"FO: {name}" for name in variable_names]
+                     + [f"RHS: R{i + 1}" for i in range(num_restrs)])
+    sweep_label = st.selectbox("Parâmetro a variar", options=sweep_options, key="sweep_parameter")
+    col1, col2 = st.columns(2)
+    with col1:
+        sweep_start = st.number_input("De", value=0.0, format="%.2f", key="sweep_start")
+    with col2:
+        sweep_stop = st.number_input("Até", value=100.0, format="%.2f", key="sweep_stop")
+
+    if st.button("Traçar curva do valor ótimo"):
+        optimizer = session_optimizer()
+        if optimizer is None:
+            st.warning(SNAPSHOT_EVICTED)
+        elif optimizer.is_mip:
+            st.warning("A análise paramétrica está disponível apenas para modelos sem variáveis inteiras.")
+        else:
+            position = sweep_options.index(sweep_label)
+            if position < num_vars:
+                parameter = ("objective", position)
+            else:
+                parameter = ("rhs", position - num_vars)
+            sweep_result = optimizer.sweep(parameter, sweep_start, sweep_stop)
+            st.altair_chart(sweep_chart(sweep_result, sweep_label), use_container_width=True)
+            st.dataframe({"Início": [segment["inicio"] for segment in sweep_result["segmentos"]],
+                          "Fim": [segment["fim"] for segment in sweep_result["segmentos"]],
+                          "Inclinação": [segment["inclinacao"] for segment in sweep_result["segmentos"]],
+                          "Solução no Início": [", ".join(f"{value:.2f}" for value in segment["valores_otimos_inicio"])
+                                      if segment["valores_otimos_inicio"] is not None else "Sem solução ótima"
+                                      for segment in sweep_result["segmentos"]]},
+                         hide_index=True, use_container_width=True)
+            st.caption(f"{len(sweep_result['pontos_de_quebra'])} pontos de quebra, "
+                       f"{sweep_result['resolucoes']} resoluções.")
+
+    # Métricas da última resolução (ver `Optimizer.solve`)
+    metrics = st.session_state.resultados["metrics"]
+    with st.expander("Desempenho"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Tempo Total (ms)", f"{metrics['segundos'] * 1000:.1f}")
+        col2.metric("Iterações", metrics["iteracoes"] if metrics["iteracoes"] is not None else "-")
+        # Pico de memória residente do processo que resolveu (e do CBC); o tracemalloc, só se pedido
+        col3.metric("Pico de Memória (MB)",
+                    f"{metrics['pico_rss_mb']:.1f}" if metrics["pico_rss_mb"] is not None else "-")
+        st.dataframe({"Fase": [PHASE_LABELS.get(phase, phase) for phase in metrics["fases"]],
+                      "Tempo (ms)": [measure["segundos"] * 1000 for measure in metrics["fases"].values()],
+                      "CPU (ms)": [measure["cpu_segundos"] * 1000 for measure in metrics["fases"].values()]},
+                     hide_index=True, use_container_width=True)
+        st.markdown(f"Backend `{metrics['backend']}`: {metrics['linhas']} linhas, {metrics['colunas']} colunas, "
+                    f"{metrics['nao_zeros']} coeficientes não nulos.")
+
+        # Memória da sessão no servidor: o snapshot do modelo e os arrays dos resultados
+        snapshot_kb = st.session_state.get("snapshot_bytes", 0) / 1024
+        results_kb = getattr(st.session_state.resultados, "nbytes", 0) / 1024
+        usage = session_store.usage()
+        st.markdown(f"Memória da sessão: {snapshot_kb + results_kb:.1f} KB (snapshot do modelo {snapshot_kb:.1f} KB, "
+                    f"resultados {results_kb:.1f} KB). Snapshots no servidor: {usage['sessoes']} sessões, "
+                    f"{usage['bytes'] / 2 ** 20:.1f} de {usage['orcamento'] / 2 ** 20:.0f} MB.")
+        if metrics["pico_rss_mb"] is not None:
+            memory = (f"Pico de memória: memória residente do processo que resolveu o modelo, desde o seu "
+                      f"início; processos filhos (CBC): {metrics['pico_rss_filhos_mb']:.1f} MB.")
+            if metrics["pico_memoria_mb"] is not None:
+                memory += f" Alocações do Python (tracemalloc): {metrics['pico_memoria_mb']:.2f} MB."
+            st.markdown(memory)
+        if metrics.get("partida_quente"):
+            st.markdown("Resolvido a partir da base da resolução anterior, com só as alterações enviadas.")
+        st.checkbox("Medir as alocações do Python com o tracemalloc nas próximas resoluções "
+                    "(deixa a resolução mais lenta)", key="trace_memory")
@@ -0,0 +1,417 @@
+"""
+Resoluções em segundo plano para o app.
+
+Cada `SolveJob` resolve uma cópia do modelo (ver `Optimizer.to_bytes`) em um
+dos processos de `WorkerPool`: a sessão do Streamlit continua respondendo, a
+resolução pode ser cancelada (o processo é encerrado junto com o CBC, e outro
+é iniciado no lugar) e o número de resoluções simultâneas no servidor fica
+limitado a `MAX_WORKERS`. Os processos ficam vivos entre os jobs: o custo de
+iniciar o Python e importar o NumPy, o SciPy e o PuLP é pago uma vez por
+processo, e não a cada resolução. Modelos contínuos pequenos e modelos que já
+estão no cache são resolvidos na hora, no próprio processo do app.
+
+Os processos são interpretadores novos (`python -m background`), e não um
+`multiprocessing.Pool`: o Streamlit troca o módulo `__main__` pelo script do
+app, que o spawn e o forkserver executariam de novo no filho, e o fork não é
+seguro com as threads do servidor. Os pedidos vão pela entrada padrão e os
+resultados voltam pela saída padrão, serializados com pickle.
+
+Cada processo mantém, por sessão, o otimizador da última resolução com um
+backend que guarda o modelo carregado (o HiGHS ou, sem o highspy, o simplex
+em NumPy). Na resolução seguinte da sessão o job envia só as alterações feitas
+desde então (as chamadas de `update_rhs`, `update_coefficient`, ...), que o
+processo reaplica a esse otimizador: o solver parte da base anterior, sem
+receber o modelo de novo. Se o processo não tiver o otimizador da sessão, ou
+se o modelo resultante não for o do job, o modelo inteiro é enviado.
+"""
+import collections
+import os
+import pickle
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from linear_optimization import Optimizer
+
+# Processos de resolução em todo o servidor (todas as sessões); os demais jobs esperam na fila
+MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Intervalo entre as verificações de cancelamento enquanto o job espera um processo livre
+POLL_INTERVAL = 0.1
+# Modelos contínuos com até este número de coeficientes não nulos são resolvidos
+# no próprio processo do app: a ida e a volta ao processo custaria mais que a resolução
+INLINE_LIMIT = 1000
+# Otimizadores de sessões mantidos por processo; os usados há mais tempo são descartados
+MAX_ENGINES = 32
+
+# Estados de um SolveJob
+QUEUED = "na_fila"
+RUNNING = "executando"
+DONE = "concluido"
+CANCELLED = "cancelado"
+FAILED = "erro"
+# Resposta do processo que não tem o otimizador da sessão (o job envia então o modelo inteiro)
+_STALE = "desatualizado"
+
+
+def _engine_backend():
+    """O backend dos otimizadores das sessões: o HiGHS, ou o simplex em NumPy sem o highspy."""
+    try:
+        import highspy  # noqa: F401
+    except ImportError:
+        return "simplex"
+    return "inprocess"
+
+
+def _solve_request(request, engines):
+    """
+    Resolve um pedido no processo de resolução e monta a resposta.
+    Args:
+        request (tuple): (sessão, alterações, chave canônica esperada, modelo
+            serializado, limite de tempo, opções de `solve`). Sem o modelo, as
+            alterações são reaplicadas ao otimizador da sessão.
+        engines (OrderedDict): Os otimizadores das sessões neste processo.
+    Retorna:
+        tuple: (estado, resultados ou mensagem de erro, solução serializada).
+    """
+    session, edits, expected, payload, time_limit, options = request
+    # Sai do dicionário até a resolução terminar: se ela falhar, o otimizador é descartado
+    engine = engines.pop(session, None)
+    warm = payload is None
+    if warm:
+        if engine is None:
+            return _STALE, None, None
+        try:
+            for method, args in edits:
+                getattr(engine, method)(*args)
+        except Exception:
+            return _STALE, None, None
+        key, order = engine._canonical_key()
+        if key != expected[0] or not np.array_equal(order, expected[1]):
+            return _STALE, None, None
+    try:
+        if not warm:
+            engine = Optimizer.from_bytes(payload, backend=_engine_backend())
+        engine.time_limit = time_limit
+        resultados = engine.solve(**options)
+    except Exception as error:
+        return FAILED, f"{type(error).__name__}: {error}", None
+    resultados["metrics"]["partida_quente"] = warm
+    if session is not None:
+        engines[session] = engine
+        while len(engines) > MAX_ENGINES:
+            engines.popitem(last=False)
+    return DONE, resultados, engine.to_bytes()
+
+
+def _worker_main():
+    """Executado no processo de resolução: atende aos pedidos até a entrada padrão fechar."""
+    # A saída padrão fica só para os resultados; o log do CBC vai para a saída de erro
+    output = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    engines = collections.OrderedDict()
+    while True:
+        try:
+            request = pickle.load(sys.stdin.buffer)
+        except EOFError:
+            # O app terminou
+            break
+        pickle.dump(_solve_request(request, engines), output, protocol=pickle.HIGHEST_PROTOCOL)
+        output.flush()
+
+
+class _Worker:
+    """Um processo de resolução, que atende a um pedido por vez."""
+
+    def __init__(self):
+        # Um grupo de processos próprio: o cancelamento encerra também o CBC
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "background"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, start_new_session=True)
+
+    def request(self, request):
+        """
+        Envia um pedido e espera a resposta.
+        Raises:
+            EOFError, OSError, pickle.UnpicklingError: Se o processo terminar
+            (ou for encerrado) antes de responder.
+        """
+        pickle.dump(request, self.process.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+        self.process.stdin.flush()
+        return pickle.load(self.process.stdout)
+
+    def kill(self):
+        """Encerra o processo e, onde há grupos de processos, o CBC junto."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # Sem grupos de processos (Windows), ou o processo já terminou
+            self.process.kill()
+
+
+class WorkerPool:
+    """
+    Um conjunto fixo de processos de resolução, iniciados conforme a demanda e
+    mantidos vivos entre os jobs. Um processo encerrado (job cancelado ou com
+    falha) é substituído por outro. Cada sessão volta, se ele estiver livre,
+    ao processo que resolveu o seu último job e tem o seu otimizador.
+    """
+
+    def __init__(self, size=MAX_WORKERS):
+        """
+        Args:
+            size (int): Número máximo de processos.
+        """
+        self.size = size
+        self._idle = []
+        self._started = 0
+        self._available = threading.Condition()
+        # Processo do último job de cada sessão, limitado como os otimizadores dos processos
+        self._affinity = collections.OrderedDict()
+
+    def acquire(self, cancelled, session=None):
+        """
+        Espera um processo livre, iniciando um novo se ainda houver vaga.
+        Args:
+            cancelled (threading.Event): Interrompe a espera quando marcado.
+            session (hashable, opcional): A sessão do job: o processo do seu
+                último job é preferido aos demais.
+        Retorna:
+            _Worker: O processo, reservado para quem chamou, ou None se a espera foi cancelada.
+        """
+        with self._available:
+            while True:
+                if cancelled.is_set():
+                    return None
+                preferred = self._affinity.get(session)
+                if preferred in self._idle and preferred.process.poll() is None:
+                    self._idle.remove(preferred)
+                    return preferred
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.process.poll() is None:
+                        return worker
+                    # Terminou sozinho enquanto esperava: a vaga é reaproveitada
+                    self._started -= 1
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                self._available.wait(POLL_INTERVAL)
+        try:
+            return _Worker()
+        except OSError:
+            with self._available:
+                self._started -= 1
+            raise
+
+    def release(self, worker, session=None):
+        """
+        Devolve ao conjunto um processo que terminou o seu pedido.
+        Args:
+            worker (_Worker): O processo.
+            session (hashable, opcional): A sessão cujo otimizador ficou no processo.
+        """
+        with self._available:
+            if session is not None:
+                self._affinity[session] = worker
+                self._affinity.move_to_end(session)
+                while len(self._affinity) > self.size * MAX_ENGINES:
+                    self._affinity.popitem(last=False)
+            self._idle.append(worker)
+            self._available.notify()
+
+    def replace(self, worker):
+        """Encerra um processo (cancelado ou com falha) e inicia outro no lugar."""
+        worker.kill()
+        worker.process.wait()
+        with self._available:
+            for session in [session for session, owner in self._affinity.items() if owner is worker]:
+                del self._affinity[session]
+        try:
+            replacement = _Worker()
+        except OSError:
+            with self._available:
+                self._started -= 1
+                self._available.notify()
+            return
+        self.release(replacement)
+
+    def close(self):
+        """Encerra os processos livres (os que estão resolvendo terminam antes)."""
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+        for worker in idle:
+            worker.kill()
+            worker.process.wait()
+
+
+_pool = WorkerPool()
+
+
+class SolveJob:
+    """
+    Uma chamada de `Optimizer.solve` em segundo plano. O modelo é copiado na
+    criação do job; a solução só é passada ao otimizador em `result()`, na
+    thread de quem chama, e apenas se ele não tiver mudado nesse meio tempo.
+    Se a solução já estiver no cache do otimizador, ou se o modelo for
+    contínuo e pequeno (ver `INLINE_LIMIT`), ele é resolvido na hora, sem
+    processo nem fila.
+    """
+
+    def __init__(self, optimizer, time_limit=None, session=None, edits=None, **options):
+        """
+        Args:
+            optimizer (Optimizer): O modelo a ser resolvido.
+            time_limit (float, opcional): Limite de tempo do solver, em segundos
+                (ver `Optimizer.time_limit`).
+            session (hashable, opcional): A sessão do modelo: o processo guarda o
+                otimizador resolvido para os próximos jobs dela.
+            edits (list, opcional): As alterações feitas desde o último job da
+                sessão, como pares (nome do método do `Optimizer`, argumentos).
+                Com elas o processo parte do otimizador da sessão, sem receber
+                o modelo. None se o modelo não vier do último job da sessão.
+            **options: Argumentos de `Optimizer.solve` (ranging, presolve, ...).
+        """
+        self.optimizer = optimizer
+        self.time_limit = time_limit
+        self.state = QUEUED
+        self.error = None
+        self._revision = optimizer._revision
+        self._session = session
+        self._edits = edits
+        self._payload = None
+        self._options = options
+        self._outcome = None
+        # O processo que atende o job enquanto ele resolve, e se o cancelamento o encerrou
+        self._worker = None
+        self._killed = False
+        self._lock = threading.Lock()
+        self._started = None
+        self._finished = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        cached = (optimizer.cache is not None
+                  and optimizer._solve_cache_key(optimizer._canonical_key()[0]) in optimizer.cache)
+        if cached or (not optimizer.is_mip and optimizer.constraints.nnz <= INLINE_LIMIT):
+            self._started = time.perf_counter()
+            previous_limit, optimizer.time_limit = optimizer.time_limit, time_limit
+            try:
+                self._outcome = (optimizer.solve(**options), None)
+            except Exception as error:
+                self._finish(FAILED, f"{type(error).__name__}: {error}")
+                return
+            finally:
+                optimizer.time_limit = previous_limit
+            self._finish(DONE)
+            return
+        # O modelo inteiro fica guardado para o caso de o processo não ter o otimizador da sessão
+        self._payload = optimizer.to_bytes()
+        self._expected = optimizer._canonical_key()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        """Espera um processo livre, resolve e guarda o resultado (thread do job)."""
+        try:
+            worker = _pool.acquire(self._cancelled, self._session)
+        except OSError as error:
+            self._finish(FAILED, f"Não foi possível iniciar o processo de resolução: {error}")
+            return
+        if worker is None:
+            self._finish(CANCELLED)
+            return
+        with self._lock:
+            if self._cancelled.is_set():
+                # Cancelado entre a espera e o envio: o processo volta ao conjunto sem uso
+                _pool.release(worker)
+                self._finish(CANCELLED)
+                return
+            self._worker = worker
+            self._started = time.perf_counter()
+            self.state = RUNNING
+        broken = False
+        try:
+            state = _STALE
+            if self._session is not None and self._edits is not None:
+                state, value, solution = worker.request((self._session, self._edits, self._expected, None,
+                                                         self.time_limit, self._options))
+            if state == _STALE:
+                state, value, solution = worker.request((self._session, None, None, self._payload,
+                                                         self.time_limit, self._options))
+        except (EOFError, OSError, pickle.UnpicklingError):
+            broken = True
+            state, value, solution = FAILED, "O processo de resolução terminou sem enviar o resultado.", None
+        with self._lock:
+            self._worker = None
+            broken = broken or self._killed
+        if broken:
+            # O processo foi encerrado pelo cancelamento (ou falhou): outro entra no lugar
+            _pool.replace(worker)
+        else:
+            _pool.release(worker, self._session if state == DONE else None)
+        if state == DONE:
+            self._outcome = (value, solution)
+            self._finish(DONE)
+        else:
+            self._finish(FAILED, value)
+
+    def _finish(self, state, error=None):
+        if state == FAILED and self._cancelled.is_set():
+            # O processo encerrado pelo cancelamento não chega a enviar o resultado
+            state, error = CANCELLED, None
+        self.error = error
+        self._finished = time.perf_counter()
+        self.state = state
+        self._done.set()
+
+    def cancel(self):
+        """Cancela o job, esteja ele na fila ou resolvendo."""
+        if self._done.is_set():
+            return
+        with self._lock:
+            self._cancelled.set()
+            if self._worker is not None:
+                self._worker.kill()
+                self._killed = True
+        self._done.wait(1.0)
+
+    def done(self):
+        """Retorna True se o job terminou (concluído, cancelado ou com erro)."""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Espera o job terminar.
+        Retorna:
+            bool: True se ele terminou dentro do tempo.
+        """
+        return self._done.wait(timeout)
+
+    def elapsed(self):
+        """Segundos desde o início da resolução (0 enquanto o job está na fila)."""
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    def result(self):
+        """
+        Retorna os resultados de `solve()` e passa a solução ao otimizador, como
+        se ele mesmo tivesse resolvido o modelo.
+        Retorna:
+            dict: O mesmo formato de `Optimizer.solve`.
+        """
+        if self.state != DONE:
+            raise RuntimeError(f"O job não foi concluído (estado: {self.state}).")
+        resultados, solution = self._outcome
+        if solution is not None:
+            if self.optimizer._revision != self._revision:
+                raise RuntimeError("O modelo foi alterado depois do envio do job.")
+            self.optimizer.adopt_solution(solution)
+        return resultados
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -0,0 +1,160 @@
+"""
+Resolução em lote, sem o Streamlit, de problemas em JSON Lines.
+
+Cada linha da entrada é um problema:
+    {"id": "p1", "c": [3, 2], "A": [[1, 2], [3, 0]], "b": [10, 12],
+     "senses": ["<=", "<="], "sense": "max", "deltas": [["R1", 5], {"R1": 1, "R2": -2}]}
+"id", "sense" ("max" ou "min", padrão "max"), "names", "lower", "upper" e
+"deltas" (cenários no formato de `Optimizer.analyze_deltas`) são opcionais.
+
+Os problemas são resolvidos em paralelo por um pool de processos e cada
+resultado é gravado, assim que fica pronto, como uma linha JSON com o "id",
+o número da linha de entrada, os "resultados" de `solve()` e os "deltas" de
+`analyze_delta` (ou o "erro", se o problema falhar). A entrada é lida aos
+poucos: só há `max_pending` problemas em andamento por vez, de modo que a
+memória fica limitada qualquer que seja o tamanho da entrada. No fim, a
+vazão (problemas por segundo) vai para a saída de erro.
+
+Uso:
+    python batch.py problemas.jsonl --output resultados.jsonl --workers 8
+    gerar_problemas | python batch.py - --time-limit 30 > resultados.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pulp
+
+from linear_optimization import Optimizer
+from solver_backends import get_backend
+
+SENSES = {"max": pulp.LpMaximize, "min": pulp.LpMinimize}
+# Opções que silenciam o log de cada backend: a saída padrão pode ser a dos resultados
+QUIET_OPTIONS = {"cbc_cmd": {"msg": False}}
+
+
+def _json_default(value):
+    """Converte os resultados (`SolveResult`) e os tipos do NumPy para tipos do JSON."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def solve_problem(line, line_number, backend="cbc_cmd", time_limit=None):
+    """
+    Resolve um problema da entrada (executado nos processos do pool).
+    Args:
+        line (str): A linha JSON do problema.
+        line_number (int): O número da linha na entrada (o "id" padrão).
+        backend (str): O backend do solver (ver `solver_backends`).
+        time_limit (float, opcional): Limite de tempo de cada resolução, em segundos.
+    Retorna:
+        tuple: (linha JSON do resultado, True se o problema foi resolvido sem erro).
+    """
+    problem_id = line_number
+    try:
+        problem = json.loads(line)
+        problem_id = problem.get("id", line_number)
+        sense = problem.get("sense", "max")
+        optimizer = Optimizer.from_arrays(
+            problem["c"], problem["A"], problem["b"], problem["senses"],
+            sense=SENSES.get(sense, sense), names=problem.get("names"),
+            lower=problem.get("lower"), upper=problem.get("upper"),
+            backend=get_backend(backend, **QUIET_OPTIONS.get(backend, {})), time_limit=time_limit)
+        result = {"id": problem_id, "linha": line_number, "resultados": optimizer.solve()}
+        if problem.get("deltas"):
+            result["deltas"] = list(optimizer.analyze_deltas(problem["deltas"], workers=1))
+        ok = True
+    except Exception as error:
+        result = {"id": problem_id, "linha": line_number, "erro": f"{type(error).__name__}: {error}"}
+        ok = False
+    return json.dumps(result, ensure_ascii=False, default=_json_default), ok
+
+
+def run_batch(lines, output, workers=None, max_pending=None, backend="cbc_cmd", time_limit=None):
+    """
+    Resolve os problemas de `lines` e grava um resultado por linha em `output`,
+    na ordem em que ficam prontos.
+    Args:
+        lines (iterable): As linhas da entrada (linhas vazias são ignoradas).
+        output (file): Arquivo de texto que recebe os resultados.
+        workers (int, opcional): Número de processos. Padrão: número de CPUs.
+            Com 1, os problemas são resolvidos no próprio processo.
+        max_pending (int, opcional): Máximo de problemas lidos e ainda não
+            gravados; a leitura da entrada espera abaixo dele. Padrão: 2 por processo.
+        backend (str): O backend do solver.
+        time_limit (float, opcional): Limite de tempo de cada resolução, em segundos.
+    Retorna:
+        dict: Problemas, erros, segundos e problemas por segundo.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max(1, max_pending or 2 * workers)
+    stats = {"problemas": 0, "erros": 0}
+    start = time.perf_counter()
+
+    def write(result):
+        text, ok = result
+        output.write(text + "\n")
+        stats["problemas"] += 1
+        stats["erros"] += not ok
+
+    numbered = ((number, line) for number, line in enumerate(lines, start=1) if line.strip())
+    if workers == 1:
+        for number, line in numbered:
+            write(solve_problem(line, number, backend, time_limit))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for number, line in numbered:
+                if len(pending) >= max_pending:
+                    # Contrapressão: só lê o próximo problema quando um resultado sai
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        write(future.result())
+                pending.add(executor.submit(solve_problem, line, number, backend, time_limit))
+            for future in wait(pending).done:
+                write(future.result())
+    output.flush()
+
+    stats["segundos"] = time.perf_counter() - start
+    stats["problemas_por_segundo"] = stats["problemas"] / stats["segundos"] if stats["segundos"] > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="Arquivo JSONL de problemas ('-': entrada padrão).")
+    parser.add_argument("--output", default="-", help="Arquivo JSONL de resultados ('-': saída padrão).")
+    parser.add_argument("--workers", type=int, help="Número de processos (padrão: número de CPUs).")
+    parser.add_argument("--max-pending", type=int,
+                        help="Máximo de problemas em andamento (padrão: 2 por processo).")
+    parser.add_argument("--backend", default="cbc_cmd", choices=["cbc_cmd", "inprocess", "simplex"])
+    parser.add_argument("--time-limit", type=float, help="Limite de tempo de cada resolução, em segundos.")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run_batch(source, target, workers=args.workers, max_pending=args.max_pending,
+                          backend=args.backend, time_limit=args.time_limit)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"{stats['problemas']} problemas ({stats['erros']} com erro) em {stats['segundos']:.2f}s: "
+          f"{stats['problemas_por_segundo']:.1f} problemas/s", file=sys.stderr)
+    return 1 if stats["erros"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""
+Benchmarks do núcleo de otimização (construção, resolução e análise de delta).
+
+Gera modelos reproduzíveis (aleatórios e estruturados: transporte, dieta e
+planejamento de produção) de 10 a 100 mil variáveis, mede o tempo e o pico
+de memória de cada fase e grava os resultados em JSON. Com um arquivo de
+referência, aponta as fases que ficaram mais lentas ou gastaram mais memória
+que o limite configurado.
+
+Uso (sem acesso à rede):
+    python benchmark.py --output resultados.json
+    python benchmark.py --sizes 10 1000 100000 --baseline referencia.json --max-time-ratio 1.3
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pulp
+
+import model_io
+from linear_optimization import Optimizer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SIZES = (10, 100, 1000)
+# Acima deste limite a fase é pulada: a API por linha recebe linhas densas
+ROW_BY_ROW_LIMIT = 1000
+DELTA_SCENARIOS = 20
+# Fases mais rápidas que isto não contam como regressão de tempo (ruído)
+MIN_SECONDS = 0.05
+
+
+def _model(sense, c, rows, cols, values, rhs, senses, lower=None, upper=None):
+    """Monta o dicionário de arrays aceito por `Optimizer._from_model_arrays`."""
+    num_rows, num_variables = len(rhs), len(c)
+    csr = model_io._coo_to_csr(np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32),
+                               np.asarray(values, dtype=float), num_rows)
+    return {
+        "sense": sense,
+        "c": np.asarray(c, dtype=float),
+        "csr": csr,
+        "rhs": np.asarray(rhs, dtype=float),
+        "senses": list(senses),
+        "names": [f"R{i + 1}" for i in range(num_rows)],
+        "variable_names": None,
+        "lower": np.zeros(num_variables) if lower is None else np.asarray(lower, dtype=float),
+        "upper": np.full(num_variables, np.inf) if upper is None else np.asarray(upper, dtype=float),
+    }
+
+
+def random_lp(num_variables, seed=0, row_density=10):
+    """
+    Max cᵀx com Ax <= b, A >= 0 e esparsa (até `row_density` coeficientes por
+    linha, uma linha para cada quatro variáveis): sempre viável e limitado.
+    """
+    rng = np.random.default_rng(seed)
+    num_rows = max(1, num_variables // 4)
+    per_row = min(num_variables, row_density)
+    rows = np.repeat(np.arange(num_rows), per_row)
+    cols = rng.integers(num_variables, size=rows.size)
+    values = rng.uniform(1, 10, rows.size)
+    # Toda variável aparece em alguma linha, para o modelo ser limitado
+    missing = np.setdiff1d(np.arange(num_variables), cols)
+    rows = np.concatenate([rows, rng.integers(num_rows, size=missing.size)])
+    cols = np.concatenate([cols, missing])
+    values = np.concatenate([values, rng.uniform(1, 10, missing.size)])
+    rhs = rng.uniform(50, 100, num_rows) * per_row
+    return _model(pulp.LpMaximize, rng.uniform(1, 20, num_variables), rows, cols, values,
+                  rhs, ["<="] * num_rows)
+
+
+def transportation(num_variables, seed=0):
+    """
+    Min custo de transporte de s fornecedores para d clientes (s·d ≈ variáveis):
+    oferta (<=) em cada fornecedor e demanda (>=) em cada cliente.
+    """
+    rng = np.random.default_rng(seed)
+    suppliers = max(1, int(np.sqrt(num_variables / 2)))
+    customers = max(1, num_variables // suppliers)
+    arcs = np.arange(suppliers * customers)
+    supplier, customer = np.divmod(arcs, customers)
+    demand = rng.uniform(10, 100, customers)
+    supply = rng.dirichlet(np.ones(suppliers)) * demand.sum() * 1.2 + demand.max()
+    rows = np.concatenate([supplier, suppliers + customer])
+    cols = np.concatenate([arcs, arcs])
+    return _model(pulp.LpMinimize, rng.uniform(1, 50, arcs.size), rows, cols, np.ones(cols.size),
+                  np.concatenate([supply, demand]), ["<="] * suppliers + [">="] * customers)
+
+
+def diet(num_variables, seed=0, density=0.2):
+    """
+    Min custo de `num_variables` alimentos (até 10 porções cada) atendendo ao
+    mínimo (>=) e ao máximo (<=) de cada nutriente.
+    """
+    rng = np.random.default_rng(seed)
+    nutrients = int(np.clip(num_variables // 10, 2, 50))
+    content = rng.uniform(0, 10, (nutrients, num_variables)) * (rng.random((nutrients, num_variables)) < density)
+    rows, cols = np.nonzero(content)
+    # O mínimo é atendido com uma porção de cada alimento; o máximo folga bastante
+    full = content.sum(axis=1)
+    minimum = full * rng.uniform(0.5, 0.9, nutrients)
+    maximum = full * rng.uniform(3, 5, nutrients)
+    return _model(pulp.LpMinimize, rng.uniform(1, 10, num_variables),
+                  np.concatenate([rows, rows + nutrients]), np.concatenate([cols, cols]),
+                  np.concatenate([content[rows, cols]] * 2), np.concatenate([minimum, maximum]),
+                  [">="] * nutrients + ["<="] * nutrients, upper=np.full(num_variables, 10.0))
+
+
+def production_planning(num_variables, seed=0, periods=12):
+    """
+    Min custo de produção e estoque de P produtos em T períodos (2·P·T
+    variáveis): balanço de estoque (==) por produto e período e capacidade
+    (<=) por período.
+    """
+    rng = np.random.default_rng(seed)
+    products = max(1, num_variables // (2 * periods))
+    demand = rng.uniform(5, 50, (products, periods))
+    usage = rng.uniform(1, 3, products)
+    capacity = (usage[:, None] * demand).sum(axis=0).max() * 1.3 * np.ones(periods)
+
+    # Variáveis: produção x[p, t] e depois estoque s[p, t]
+    production = np.arange(products * periods).reshape(products, periods)
+    stock = production + products * periods
+    balance = production.copy()  # linha do balanço de (p, t)
+    rows = [balance.ravel(), balance.ravel(), balance[:, 1:].ravel(),
+            products * periods + np.tile(np.arange(periods), products)]
+    cols = [production.ravel(), stock.ravel(), stock[:, :-1].ravel(), production.ravel()]
+    values = [np.ones(production.size), -np.ones(stock.size), np.ones(stock[:, :-1].size),
+              np.repeat(usage, periods)]
+    # Balanço: s[p, t-1] + x[p, t] - s[p, t] == demanda[p, t]
+    costs = np.concatenate([np.repeat(rng.uniform(5, 20, products), periods),
+                            np.repeat(rng.uniform(0.5, 2, products), periods)])
+    return _model(pulp.LpMinimize, costs, np.concatenate(rows), np.concatenate(cols),
+                  np.concatenate(values), np.concatenate([demand.ravel(), capacity]),
+                  ["=="] * production.size + ["<="] * periods)
+
+
+GENERATORS = {
+    "aleatorio": random_lp,
+    "transporte": transportation,
+    "dieta": diet,
+    "producao": production_planning,
+}
+
+
+def _measure(function, memory):
+    """Executa `function` medindo o tempo e, se pedido, o pico de memória do Python."""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = function()
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+    measure = {"segundos": seconds}
+    if memory:
+        measure["pico_memoria_mb"] = peak / 2 ** 20
+    return value, measure
+
+
+def _build_per_row(arrays):
+    """Constrói o modelo pela API por linha (`add_constraint`), como o app fazia."""
+    optimizer = Optimizer(arrays["c"].size, sense=arrays["sense"])
+    optimizer.set_objective_function(arrays["c"].tolist())
+    optimizer.lower_bounds, optimizer.upper_bounds = arrays["lower"], arrays["upper"]
+    indptr, indices, data = arrays["csr"]
+    for i in range(len(arrays["rhs"])):
+        row = np.zeros(arrays["c"].size)
+        row[indices[indptr[i]:indptr[i + 1]]] = data[indptr[i]:indptr[i + 1]]
+        optimizer.add_constraint(row.tolist(), arrays["rhs"][i], arrays["names"][i], arrays["senses"][i])
+    return optimizer
+
+
+def run_case(generator, num_variables, seed=0, backend="cbc_cmd", memory=True):
+    """
+    Mede as fases de um modelo gerado: construção em lote e por linha, montagem
+    do modelo do PuLP, resolução (com e sem presolve), faixas de RHS e análise
+    de delta (um cenário e um lote). Fases acima dos limites de tamanho ficam
+    com {"pulado": motivo}.
+
+    Retorna:
+        dict: Descrição do modelo e as medidas de cada fase em "fases".
+    """
+    arrays = GENERATORS[generator](num_variables, seed=seed)
+    num_rows, nnz = len(arrays["rhs"]), arrays["csr"][2].size
+    phases = {}
+
+    optimizer, phases["construcao_em_lote"] = _measure(
+        lambda: Optimizer._from_model_arrays(arrays, backend=backend), memory)
+    if arrays["c"].size <= ROW_BY_ROW_LIMIT:
+        _, phases["construcao_por_linha"] = _measure(lambda: _build_per_row(arrays), memory)
+    else:
+        phases["construcao_por_linha"] = {"pulado": f"mais de {ROW_BY_ROW_LIMIT} variáveis"}
+    if backend == "cbc_cmd":
+        _, phases["modelo_pulp"] = _measure(lambda: optimizer.model, memory)
+
+    resultados, phases["resolucao"] = _measure(optimizer.solve, memory)
+    presolved = Optimizer._from_model_arrays(arrays, backend=backend)
+    _, phases["resolucao_com_presolve"] = _measure(lambda: presolved.solve(presolve=True), memory)
+
+    optimal = resultados["viavel"] == pulp.LpStatusOptimal
+    if optimal:
+        _, phases["faixas_rhs"] = _measure(optimizer.rhs_ranges, memory)
+        _, phases["analise_delta"] = _measure(lambda: optimizer.analyze_delta(0, 1.0), memory)
+        rng = np.random.default_rng(seed)
+        scenarios = [(int(i), float(delta)) for i, delta in
+                     zip(rng.integers(num_rows, size=DELTA_SCENARIOS), rng.uniform(-5, 5, DELTA_SCENARIOS))]
+        _, phases["analise_deltas_lote"] = _measure(
+            lambda: list(optimizer.analyze_deltas(scenarios, workers=1)), memory)
+    else:
+        for phase in ("faixas_rhs", "analise_delta", "analise_deltas_lote"):
+            phases[phase] = {"pulado": f"status {pulp.LpStatus[resultados['viavel']]}"}
+
+    case = {
+        "gerador": generator,
+        "variaveis": int(arrays["c"].size),
+        "restricoes": num_rows,
+        "nnz": int(nnz),
+        "seed": seed,
+        "status": pulp.LpStatus[resultados["viavel"]],
+        "valor_objetivo": resultados["valor_objetivo"],
+        "fases": phases,
+    }
+    if resource is not None:
+        # Pico de memória dos processos filhos (o CBC) até aqui, em MB
+        scale = 2 ** 20 if sys.platform == "darwin" else 2 ** 10
+        case["pico_rss_filhos_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return case
+
+
+def run_benchmarks(sizes=SIZES, generators=tuple(GENERATORS), seed=0, backend="cbc_cmd", memory=True,
+                   progress=None):
+    """
+    Executa `run_case` para cada gerador e tamanho.
+    Args:
+        progress (callable, opcional): Recebe cada caso assim que ele termina.
+    Retorna:
+        dict: O ambiente de execução e a lista de casos, no formato do JSON gravado.
+    """
+    cases = []
+    for generator in generators:
+        for size in sizes:
+            case = run_case(generator, size, seed=seed, backend=backend, memory=memory)
+            cases.append(case)
+            if progress is not None:
+                progress(case)
+    return {
+        "ambiente": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pulp": pulp.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "backend": backend,
+            "memoria": memory,
+        },
+        "casos": cases,
+    }
+
+
+def compare(results, baseline, max_time_ratio=1.5, max_memory_ratio=1.5, min_seconds=MIN_SECONDS):
+    """
+    Compara os resultados com uma execução de referência (mesmo gerador,
+    tamanho e seed).
+
+    Retorna:
+        list: Uma entrada por regressão, com o caso, a fase, a medida, os
+        valores e a razão entre eles.
+    """
+    reference = {(case["gerador"], case["variaveis"], case["seed"]): case for case in baseline["casos"]}
+    regressions = []
+    for case in results["casos"]:
+        previous = reference.get((case["gerador"], case["variaveis"], case["seed"]))
+        if previous is None:
+            continue
+        for phase, measure in case["fases"].items():
+            old = previous["fases"].get(phase, {})
+            checks = [("segundos", max_time_ratio), ("pico_memoria_mb", max_memory_ratio)]
+            for metric, limit in checks:
+                if metric not in measure or not old.get(metric):
+                    continue
+                if metric == "segundos" and measure[metric] < min_seconds:
+                    continue
+                ratio = measure[metric] / old[metric]
+                if ratio > limit:
+                    regressions.append({
+                        "gerador": case["gerador"],
+                        "variaveis": case["variaveis"],
+                        "fase": phase,
+                        "medida": metric,
+                        "referencia": old[metric],
+                        "atual": measure[metric],
+                        "razao": ratio,
+                    })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="Números de variáveis (padrão: %(default)s; até 100000).")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default="cbc_cmd", choices=["cbc_cmd", "inprocess", "simplex"])
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Não mede o pico de memória (o tracemalloc deixa o Python mais lento).")
+    parser.add_argument("--output", default="benchmark.json", help="Arquivo JSON de saída.")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar.")
+    parser.add_argument("--max-time-ratio", type=float, default=1.5,
+                        help="Razão máxima de tempo em relação à referência.")
+    parser.add_argument("--max-memory-ratio", type=float, default=1.5,
+                        help="Razão máxima de pico de memória em relação à referência.")
+    parser.add_argument("--min-seconds", type=float, default=MIN_SECONDS,
+                        help="Fases mais rápidas que isto não contam como regressão de tempo.")
+    args = parser.parse_args(argv)
+
+    def progress(case):
+        timings = ", ".join(f"{phase} {measure['segundos']:.3f}s" for phase, measure in case["fases"].items()
+                            if "segundos" in measure)
+        print(f"{case['gerador']:>10} {case['variaveis']:>7} var.: {timings}", flush=True)
+
+    results = run_benchmarks(args.sizes, args.generators, seed=args.seed, backend=args.backend,
+                             memory=not args.no_memory, progress=progress)
+    results["limites"] = {"max_time_ratio": args.max_time_ratio, "max_memory_ratio": args.max_memory_ratio,
+                          "min_seconds": args.min_seconds}
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        results["regressoes"] = compare(results, baseline, args.max_time_ratio, args.max_memory_ratio,
+                                           args.min_seconds)
+        for regression in results["regressoes"]:
+            print(f"REGRESSÃO {regression['gerador']} {regression['variaveis']} {regression['fase']} "
+                  f"{regression['medida']}: {regression['referencia']:.3f} -> {regression['atual']:.3f} "
+                  f"({regression['razao']:.2f}x)")
+        status = 1 if results["regressoes"] else 0
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, ensure_ascii=False, default=float)
+    print(f"Resultados gravados em {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+import sys
+
+import numpy as np
+import pulp
+
+# Códigos int8 dos operadores (os mesmos valores das constantes do PuLP)
+SENSE_CODES = {
+    '<=': pulp.LpConstraintLE,
+    '>=': pulp.LpConstraintGE,
+    '==': pulp.LpConstraintEQ,
+}
+SENSE_SYMBOLS = {code: symbol for symbol, code in SENSE_CODES.items()}
+
+
+def _grow(array, size):
+    """Retorna `array` com capacidade para pelo menos `size` elementos (dobrando)."""
+    if size <= array.size:
+        return array
+    grown = np.empty(max(size, 2 * array.size), dtype=array.dtype)
+    grown[:array.size] = array
+    return grown
+
+
+class ConstraintStore:
+    """
+    Armazena as restrições do modelo em arrays compactos:
+    coeficientes no formato CSR (apenas não nulos), RHS em float64,
+    operadores como códigos int8 e um índice de nomes internados.
+    """
+
+    def __init__(self, num_variables):
+        """
+        Inicializa o armazenamento vazio.
+        Args:
+            num_variables (int): O número de variáveis (colunas) do modelo.
+        """
+        self.num_variables = num_variables
+        self._num_rows = 0
+        self._nnz = 0
+        self._indptr = np.zeros(8, dtype=np.int64)
+        self._indices = np.empty(16, dtype=np.int32)
+        self._data = np.empty(16, dtype=float)
+        self._rhs = np.empty(8, dtype=float)
+        self._senses = np.empty(8, dtype=np.int8)
+        self._names = []
+        self._name_index = {}
+
+    def __len__(self):
+        return self._num_rows
+
+    @property
+    def nnz(self):
+        """Número de coeficientes não nulos armazenados."""
+        return self._nnz
+
+    @property
+    def names(self):
+        """Nomes das restrições, na ordem de inserção."""
+        return self._names
+
+    @property
+    def rhs(self):
+        """Lados direitos das restrições (visão do array interno)."""
+        return self._rhs[:self._num_rows]
+
+    @property
+    def senses(self):
+        """Códigos de operador das restrições (visão do array interno)."""
+        return self._senses[:self._num_rows]
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos arrays numéricos, em bytes."""
+        return (self._indptr.nbytes + self._indices.nbytes + self._data.nbytes
+                + self._rhs.nbytes + self._senses.nbytes)
+
+    def csr(self):
+        """
+        Retorna a matriz de coeficientes no formato CSR.
+        Retorna:
+            tuple: (indptr, indices, data), visões dos arrays internos.
+        """
+        return (self._indptr[:self._num_rows + 1],
+                self._indices[:self._nnz],
+                self._data[:self._nnz])
+
+    def append(self, coefficients, rhs, sense, name):
+        """
+        Adiciona uma restrição a partir de uma lista densa de coeficientes.
+        Args:
+            coefficients (list): Coeficientes das variáveis (zeros são descartados).
+            rhs (float): Valor do lado direito (RHS).
+            sense (str): Operador da restrição ('<=', '>=', '==').
+            name (str): Nome da restrição.
+        Retorna:
+            int: O índice da nova restrição.
+        """
+        row = np.asarray(coefficients, dtype=float)
+        if row.size != self.num_variables:
+            raise ValueError("A restrição deve ter um coeficiente por variável.")
+        indices = np.flatnonzero(row)
+        indptr = np.array([0, indices.size], dtype=np.int64)
+        self.extend(indptr, indices, row[indices], [rhs], [sense], [name])
+        return self._num_rows - 1
+
+    def extend(self, indptr, indices, data, rhs, senses, names):
+        """
+        Adiciona várias restrições de uma vez a partir de arrays CSR.
+        Args:
+            indptr, indices, data (array): As linhas no formato CSR.
+            rhs (array): Lados direitos das novas linhas.
+            senses (list): Operadores das novas linhas ('<=', '>=', '==').
+            names (list): Nomes das novas linhas.
+        """
+        num_new = len(indptr) - 1
+        for name in names:
+            if name in self._name_index:
+                raise ValueError(f"Restrição duplicada: {name}")
+        try:
+            codes = np.fromiter((SENSE_CODES[s] for s in senses), dtype=np.int8, count=num_new)
+        except KeyError as error:
+            raise ValueError(f"Operador inválido: {error.args[0]}") from None
+
+        rows_end = self._num_rows + num_new
+        nnz_end = self._nnz + int(indptr[-1])
+        self._indptr = _grow(self._indptr, rows_end + 1)
+        self._rhs = _grow(self._rhs, rows_end)
+        self._senses = _grow(self._senses, rows_end)
+        self._indices = _grow(self._indices, nnz_end)
+        self._data = _grow(self._data, nnz_end)
+
+        self._indptr[self._num_rows + 1:rows_end + 1] = self._nnz + np.asarray(indptr[1:])
+        self._indices[self._nnz:nnz_end] = indices
+        self._data[self._nnz:nnz_end] = data
+        self._rhs[self._num_rows:rows_end] = rhs
+        self._senses[self._num_rows:rows_end] = codes
+
+        for offset, name in enumerate(names):
+            name = sys.intern(name)
+            self._names.append(name)
+            self._name_index[name] = self._num_rows + offset
+        self._num_rows = rows_end
+        self._nnz = nnz_end
+
+    def index(self, key):
+        """
+        Localiza uma restrição em O(1).
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+        Retorna:
+            int: O índice da restrição.
+        """
+        if isinstance(key, str):
+            try:
+                return self._name_index[key]
+            except KeyError:
+                raise KeyError(f"Restrição inexistente: {key}") from None
+        index = int(key)
+        if not -self._num_rows <= index < self._num_rows:
+            raise IndexError(f"Índice de restrição fora do intervalo: {key}")
+        return index % self._num_rows
+
+    def row(self, key):
+        """
+        Retorna os coeficientes não nulos de uma restrição.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+        Retorna:
+            tuple: (indices, values), visões dos arrays internos.
+        """
+        i = self.index(key)
+        start, end = self._indptr[i], self._indptr[i + 1]
+        return self._indices[start:end], self._data[start:end]
+
+    def dense_row(self, key):
+        """Retorna os coeficientes de uma restrição como array denso."""
+        indices, values = self.row(key)
+        row = np.zeros(self.num_variables)
+        row[indices] = values
+        return row
+
+    def sense(self, key):
+        """Retorna o operador ('<=', '>=', '==') de uma restrição."""
+        return SENSE_SYMBOLS[int(self._senses[self.index(key)])]
+
+    def set_rhs(self, key, value):
+        """Altera o lado direito de uma restrição."""
+        self._rhs[self.index(key)] = value
+
+    def set_sense(self, key, sense):
+        """Altera o operador ('<=', '>=', '==') de uma restrição."""
+        i = self.index(key)
+        if sense not in SENSE_CODES:
+            raise ValueError(f"Operador inválido: {sense}")
+        self._senses[i] = SENSE_CODES[sense]
+
+    def set_coefficient(self, key, column, value):
+        """
+        Altera um coeficiente da matriz, inserindo ou removendo a entrada
+        não nula correspondente quando necessário.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+            column (int): O índice da variável.
+            value (float): O novo coeficiente.
+        """
+        i = self.index(key)
+        if not 0 <= column < self.num_variables:
+            raise IndexError(f"Índice de variável fora do intervalo: {column}")
+        start, end = self._indptr[i], self._indptr[i + 1]
+        found = np.flatnonzero(self._indices[start:end] == column)
+        if found.size:
+            position = start + found[0]
+            if value != 0:
+                self._data[position] = value
+                return
+            self._delete_entries(position, position + 1)
+            self._indptr[i + 1:self._num_rows + 1] -= 1
+        elif value != 0:
+            self._indices = np.insert(self._indices[:self._nnz], end, column)
+            self._data = np.insert(self._data[:self._nnz], end, value)
+            self._nnz += 1
+            self._indptr[i + 1:self._num_rows + 1] += 1
+
+    def remove(self, key):
+        """
+        Remove uma restrição. As restrições seguintes têm o índice reduzido em 1.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+        """
+        i = self.index(key)
+        start, end = self._indptr[i], self._indptr[i + 1]
+        self._delete_entries(start, end)
+        rows = self._num_rows
+        self._indptr[i + 1:rows] = self._indptr[i + 2:rows + 1] - (end - start)
+        self._rhs[i:rows - 1] = self._rhs[i + 1:rows]
+        self._senses[i:rows - 1] = self._senses[i + 1:rows]
+        self._num_rows -= 1
+
+        del self._name_index[self._names.pop(i)]
+        for offset, name in enumerate(self._names[i:]):
+            self._name_index[name] = i + offset
+
+    def _delete_entries(self, start, end):
+        """Remove as entradas não nulas nas posições [start, end)."""
+        count = end - start
+        self._indices[start:self._nnz - count] = self._indices[end:self._nnz]
+        self._data[start:self._nnz - count] = self._data[end:self._nnz]
+        self._nnz -= count
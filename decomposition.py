@@ -0,0 +1,425 @@
+"""
+Decomposição de modelos com estrutura em blocos.
+
+Muitos modelos (fábricas, períodos) são conjuntos de blocos independentes,
+ou ligados apenas por algumas restrições. `find_blocks` encontra essa
+estrutura com union-find nas colunas: duas colunas ficam no mesmo bloco se
+aparecem juntas em alguma linha. As linhas de ligação são as mais densas,
+retiradas (no máximo `max_linking`) até que as demais formem mais de um bloco.
+
+- Blocos independentes (`solve_blocks`): cada bloco é resolvido em um
+  processo e as soluções (valores, preços sombra e custos reduzidos) são
+  juntadas. O modelo é a soma dos blocos, então o resultado é o da
+  resolução do modelo inteiro.
+- Dantzig–Wolfe (`dantzig_wolfe`): com linhas de ligação, o problema mestre
+  (as linhas de ligação e uma linha de convexidade por bloco) combina os
+  pontos extremos de cada bloco, gerados a cada rodada pelos subproblemas
+  (em paralelo) com os preços sombra do mestre. Uma primeira fase, com folgas
+  nas linhas de ligação, encontra um mestre viável. No fim, os preços sombra
+  das linhas de ligação vêm do mestre e os das linhas de cada bloco, da
+  última resolução do seu subproblema.
+
+Tudo é feito na forma de minimização; os resultados voltam no sentido do modelo.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pulp
+
+from constraint_store import SENSE_SYMBOLS
+from sensitivity import dense_matrix
+from solver_backends import STATUS_TIME_LIMIT
+
+METHODS = ("blocos", "dantzig_wolfe")
+# Fração das linhas que podem ser tratadas como linhas de ligação
+LINKING_FRACTION = 0.1
+MAX_ROUNDS = 200
+# Custo reduzido (relativo) abaixo do qual um ponto extremo entra no mestre
+TOLERANCE = 1e-7
+
+LE, GE, EQ = pulp.LpConstraintLE, pulp.LpConstraintGE, pulp.LpConstraintEQ
+
+# Ordem de prioridade dos status ao juntar os blocos: o primeiro que aparecer vale para o modelo
+_STATUS_PRIORITY = (pulp.LpStatusInfeasible, pulp.LpStatusUnbounded, pulp.LpStatusNotSolved,
+                    STATUS_TIME_LIMIT, pulp.LpStatusUndefined)
+
+
+def _find(parent, i):
+    """Raiz de `i` no union-find, com compressão de caminho pela metade."""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+class _Components:
+    """Componentes conexas das colunas, com as linhas adicionadas uma a uma."""
+
+    def __init__(self, csr, num_columns):
+        self.indptr, self.indices = csr[0], csr[1]
+        self.parent = list(range(num_columns))
+        self.active = np.zeros(num_columns, dtype=bool)
+        # Número de componentes entre as colunas que aparecem em alguma linha adicionada
+        self.count = 0
+
+    def add_row(self, i):
+        columns = self.indices[self.indptr[i]:self.indptr[i + 1]].tolist()
+        if not columns:
+            return
+        for j in columns:
+            if not self.active[j]:
+                self.active[j] = True
+                self.count += 1
+        root = _find(self.parent, columns[0])
+        for j in columns[1:]:
+            other = _find(self.parent, j)
+            if other != root:
+                self.parent[other] = root
+                self.count -= 1
+
+    def labels(self):
+        """Bloco de cada coluna (-1 para as que não aparecem em nenhuma linha)."""
+        roots = np.array([_find(self.parent, j) for j in range(len(self.parent))], dtype=np.int64)
+        labels = np.full(roots.size, -1, dtype=np.int64)
+        if self.active.any():
+            labels[self.active] = np.unique(roots[self.active], return_inverse=True)[1]
+        return labels
+
+
+def find_blocks(optimizer, max_linking=None):
+    """
+    Detecta os blocos da matriz de coeficientes.
+    Args:
+        optimizer (Optimizer): O modelo.
+        max_linking (int, opcional): Máximo de linhas de ligação. Com 0, só as
+            componentes conexas são procuradas. Padrão: `LINKING_FRACTION` das linhas.
+    Retorna:
+        dict: "blocos" (lista de dicts com as "linhas" e as "colunas" de cada
+        bloco, em ordem crescente), "linhas_ligacao", "colunas_livres" (que não
+        aparecem em nenhum bloco) e "linhas_vazias".
+    """
+    csr = optimizer.constraints.csr()
+    indptr, indices = csr[0], csr[1]
+    m, n = len(optimizer.constraints), optimizer.num_variables
+    lengths = np.diff(indptr)
+    if max_linking is None:
+        max_linking = int(np.ceil(LINKING_FRACTION * m))
+    max_linking = max(0, min(max_linking, m - 1))
+    # Candidatas a linhas de ligação: as mais densas primeiro
+    candidates = np.argsort(-lengths, kind="stable")[:max_linking]
+    linking = np.zeros(m, dtype=bool)
+    linking[candidates] = True
+
+    # Todas as linhas menos as candidatas; as candidatas voltam da menos densa para a
+    # mais densa, e fica o menor número de linhas de ligação que separa mais de um bloco
+    components = _Components(csr, n)
+    for i in np.flatnonzero(~linking).tolist():
+        components.add_row(i)
+    num_linking = max_linking if components.count >= 2 else None
+    for k in reversed(range(max_linking)):
+        components.add_row(int(candidates[k]))
+        if components.count >= 2:
+            num_linking = k
+    num_linking = num_linking or 0
+    linking[:] = False
+    linking[candidates[:num_linking]] = True
+    if num_linking > 0:
+        # Refaz as componentes com as linhas de ligação escolhidas
+        components = _Components(csr, n)
+        for i in np.flatnonzero(~linking).tolist():
+            components.add_row(i)
+
+    labels = components.labels()
+    empty = lengths == 0
+    row_labels = np.full(m, -1, dtype=np.int64)
+    block_rows = np.flatnonzero(~linking & ~empty)
+    row_labels[block_rows] = labels[indices[indptr[block_rows]]]
+    num_blocks = int(labels.max(initial=-1)) + 1
+    return {
+        "blocos": [{"linhas": np.flatnonzero(row_labels == k), "colunas": np.flatnonzero(labels == k)}
+                   for k in range(num_blocks)],
+        "linhas_ligacao": np.sort(candidates[:num_linking]),
+        "colunas_livres": np.flatnonzero(labels == -1),
+        "linhas_vazias": np.flatnonzero(empty),
+    }
+
+
+def _row_submatrix(csr, rows):
+    """Linhas `rows` de uma matriz CSR, com as colunas originais."""
+    indptr, indices, data = csr
+    lengths = np.diff(indptr)[rows]
+    sub_indptr = np.zeros(rows.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=sub_indptr[1:])
+    entries = np.repeat(indptr[rows] - sub_indptr[:-1], lengths) + np.arange(sub_indptr[-1])
+    return sub_indptr, indices[entries], data[entries]
+
+
+def block_model(optimizer, rows, columns, c=None, sense=None):
+    """
+    Monta o modelo de um bloco: as linhas `rows` restritas às colunas `columns`.
+    Args:
+        optimizer (Optimizer): O modelo.
+        rows, columns (array): Índices das linhas e das colunas do bloco.
+        c (array, opcional): Custos das colunas. Padrão: os da função objetivo.
+        sense (opcional): Sentido da otimização. Padrão: o do modelo.
+    Retorna:
+        dict: Os arrays do modelo, no formato de `Optimizer._from_model_arrays`.
+    """
+    sub_indptr, sub_indices, sub_data = _row_submatrix(optimizer.constraints.csr(), rows)
+    local = np.full(optimizer.num_variables, -1, dtype=np.int64)
+    local[columns] = np.arange(columns.size)
+    names = optimizer.constraints.names
+    return {
+        "sense": optimizer.sense if sense is None else sense,
+        "c": np.asarray(optimizer.coef_fo, dtype=float)[columns] if c is None else c,
+        "csr": (sub_indptr, local[sub_indices], sub_data.copy()),
+        "rhs": optimizer.constraints.rhs[rows].copy(),
+        "senses": [SENSE_SYMBOLS[int(code)] for code in optimizer.constraints.senses[rows]],
+        "names": [names[i] for i in rows.tolist()],
+        "variable_names": None,
+        "lower": optimizer.lower_bounds[columns].copy(),
+        "upper": optimizer.upper_bounds[columns].copy(),
+        "inteiras": optimizer.integer[columns].copy(),
+    }
+
+
+# Blocos de cada processo de `_Subproblems`, reconstruídos uma vez por processo
+_worker_blocks = None
+
+
+def _init_worker(cls, payloads, options):
+    global _worker_blocks
+    _worker_blocks = [cls.from_bytes(payload, **options) for payload in payloads]
+
+
+def _solve_block(block, objective):
+    """Resolve um bloco, com a função objetivo `objective` se dada."""
+    if objective is not None:
+        block.set_objective_function(objective)
+    resultados = block.solve()
+    return {"status": resultados["viavel"], "x": resultados.x, "pi": resultados.pi, "dj": resultados.dj,
+            "objetivo": resultados["valor_objetivo"], "limite": resultados.get("limite_dual")}
+
+
+def _solve_in_worker(k, objective):
+    return _solve_block(_worker_blocks[k], objective)
+
+
+class _Subproblems:
+    """
+    Os blocos de um modelo, resolvidos em paralelo por um pool de processos
+    (cada um recebe as cópias compactas dos blocos uma única vez) ou, com um
+    processo só, no próprio processo.
+    """
+
+    def __init__(self, optimizer, models, workers):
+        cls = type(optimizer)
+        # Cada bloco tem o seu backend (o estado de warm start é por modelo)
+        options = {"singleton_bounds": optimizer.singleton_bounds, "time_limit": optimizer.time_limit,
+                   "mip_gap": optimizer.mip_gap, "threads": optimizer.threads}
+        blocks = [cls._from_model_arrays(model, backend=optimizer.backend.name, **options) for model in models]
+        self.size = len(blocks)
+        self.workers = min(workers or os.cpu_count() or 1, len(blocks))
+        self._executor = None
+        if self.workers > 1:
+            self._blocks = None
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(cls, [block.to_bytes() for block in blocks], options))
+        else:
+            self._blocks = blocks
+
+    def solve(self, objectives=None):
+        """Resolve todos os blocos; retorna um resultado por bloco, na ordem."""
+        if objectives is None:
+            objectives = [None] * self.size
+        if self._executor is None:
+            return [_solve_block(block, objective) for block, objective in zip(self._blocks, objectives)]
+        return list(self._executor.map(_solve_in_worker, range(len(objectives)), objectives))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _merged_status(statuses):
+    """Status do modelo a partir dos status dos blocos."""
+    for status in _STATUS_PRIORITY:
+        if status in statuses:
+            return status
+    return pulp.LpStatusOptimal
+
+
+def _failed_outcome(optimizer, status):
+    return {"status": status, "x": np.zeros(optimizer.num_variables), "dj": np.zeros(optimizer.num_variables),
+            "pi": np.zeros(len(optimizer.constraints)), "objetivo": 0}
+
+
+def solve_blocks(optimizer, structure, workers=None):
+    """
+    Resolve os blocos independentes do modelo e junta as soluções. As colunas
+    livres e as linhas vazias vão para o primeiro bloco.
+    Args:
+        optimizer (Optimizer): O modelo.
+        structure (dict): Os blocos, sem linhas de ligação (ver `find_blocks`).
+        workers (int, opcional): Número de processos. Padrão: número de CPUs.
+    Retorna:
+        tuple: (resultado no formato dos backends, dict com o número de "processos").
+    """
+    parts = [(block["linhas"], block["colunas"]) for block in structure["blocos"]]
+    rows, columns = parts[0]
+    parts[0] = (np.union1d(rows, structure["linhas_vazias"]), np.union1d(columns, structure["colunas_livres"]))
+    subproblems = _Subproblems(optimizer, [block_model(optimizer, rows, columns) for rows, columns in parts],
+                               workers)
+    try:
+        outcomes = subproblems.solve()
+    finally:
+        subproblems.close()
+
+    outcome = _failed_outcome(optimizer, _merged_status([result["status"] for result in outcomes]))
+    if outcome["status"] in (pulp.LpStatusOptimal, STATUS_TIME_LIMIT):
+        for (rows, columns), result in zip(parts, outcomes):
+            outcome["x"][columns] = result["x"]
+            outcome["dj"][columns] = result["dj"]
+            outcome["pi"][rows] = result["pi"]
+        outcome["objetivo"] = sum(result["objetivo"] for result in outcomes)
+        if optimizer.is_mip:
+            bounds = [result["limite"] for result in outcomes]
+            outcome["limite"] = None if None in bounds else sum(bounds)
+    return outcome, {"processos": subproblems.workers}
+
+
+def dantzig_wolfe(optimizer, structure, workers=None, max_rounds=MAX_ROUNDS, tol=TOLERANCE):
+    """
+    Resolve o modelo por Dantzig–Wolfe, com os blocos como subproblemas e as
+    linhas de ligação no mestre. As colunas livres ficam no mestre como
+    variáveis comuns e as linhas vazias, como linhas de ligação.
+    Args:
+        optimizer (Optimizer): O modelo.
+        structure (dict): Os blocos e as linhas de ligação (ver `find_blocks`).
+        workers (int, opcional): Número de processos. Padrão: número de CPUs.
+        max_rounds (int): Máximo de rodadas de geração de colunas.
+    Retorna:
+        tuple: (resultado no formato dos backends, ou None se a decomposição
+        não chegou ao ótimo e o modelo deve ser resolvido inteiro; dict com
+        "processos", "rodadas", "rodadas_fase1", "colunas_geradas" e "motivo").
+    """
+    cls = type(optimizer)
+    n = optimizer.num_variables
+    sign = -1.0 if optimizer.sense == pulp.LpMaximize else 1.0
+    costs = sign * np.asarray(optimizer.coef_fo, dtype=float)
+    blocks = structure["blocos"]
+    num_blocks = len(blocks)
+    linking = np.union1d(structure["linhas_ligacao"], structure["linhas_vazias"])
+    num_linking = linking.size
+    linking_matrix = dense_matrix(_row_submatrix(optimizer.constraints.csr(), linking), n)
+    linking_senses = optimizer.constraints.senses[linking]
+    direct = structure["colunas_livres"]
+    info = {"processos": 1, "rodadas": 0, "rodadas_fase1": 0, "colunas_geradas": 0, "motivo": None}
+
+    # Folgas da primeira fase, como no modelo elástico de `iis.py`
+    elastic_rows = np.concatenate([np.arange(num_linking), np.flatnonzero(linking_senses == EQ)])
+    elastic_values = np.where(linking_senses[elastic_rows] == LE, -1.0, 1.0)
+    elastic_values[num_linking:] = -1.0
+    num_elastic = elastic_rows.size
+    fixed = direct.size + num_elastic
+    master_senses = ([SENSE_SYMBOLS[int(code)] for code in linking_senses] + ["=="] * num_blocks)
+    master_rhs = np.concatenate([optimizer.constraints.rhs[linking], np.ones(num_blocks)])
+
+    # Pontos extremos gerados: (bloco, valores das colunas do bloco)
+    points = []
+
+    def solve_master(phase):
+        matrix = np.zeros((num_linking + num_blocks, fixed + len(points)))
+        matrix[:num_linking, :direct.size] = linking_matrix[:, direct]
+        matrix[elastic_rows, direct.size + np.arange(num_elastic)] = elastic_values
+        point_costs = np.zeros(len(points))
+        for p, (k, x) in enumerate(points):
+            columns = blocks[k]["colunas"]
+            matrix[:num_linking, fixed + p] = linking_matrix[:, columns] @ x
+            matrix[num_linking + k, fixed + p] = 1.0
+            point_costs[p] = costs[columns] @ x
+        if phase == 1:
+            master_costs = np.concatenate([np.zeros(direct.size), np.ones(num_elastic), np.zeros(len(points))])
+            elastic_upper = np.full(num_elastic, np.inf)
+        else:
+            master_costs = np.concatenate([costs[direct], np.zeros(num_elastic), point_costs])
+            elastic_upper = np.zeros(num_elastic)
+        lower = np.concatenate([optimizer.lower_bounds[direct], np.zeros(num_elastic + len(points))])
+        upper = np.concatenate([optimizer.upper_bounds[direct], elastic_upper, np.full(len(points), np.inf)])
+        master = cls.from_arrays(master_costs, matrix, master_rhs, master_senses, sense=pulp.LpMinimize,
+                                 lower=lower, upper=upper, backend=optimizer.backend.name,
+                                 singleton_bounds=False, time_limit=optimizer.time_limit)
+        return master.solve()
+
+    models = [block_model(optimizer, block["linhas"], block["colunas"], c=costs[block["colunas"]],
+                          sense=pulp.LpMinimize) for block in blocks]
+    subproblems = _Subproblems(optimizer, models, workers)
+    info["processos"] = subproblems.workers
+    try:
+        # Pontos iniciais: o ótimo de cada bloco com os custos originais
+        outcomes = subproblems.solve()
+        phase = 1
+        while True:
+            statuses = [result["status"] for result in outcomes]
+            if pulp.LpStatusInfeasible in statuses:
+                # Um bloco sozinho já é inviável
+                return _failed_outcome(optimizer, pulp.LpStatusInfeasible), info
+            if any(status != pulp.LpStatusOptimal for status in statuses):
+                info["motivo"] = "subproblema sem solução ótima (ilimitado ou interrompido)"
+                return None, info
+            duals = outcomes
+            improving = [k for k, result in enumerate(outcomes) if info["rodadas"] == 0
+                         or result["objetivo"] - convexity[k] < -tol * (1 + abs(convexity[k]))]
+            for k in improving:
+                points.append((k, outcomes[k]["x"]))
+            info["colunas_geradas"] = len(points)
+            if not improving:
+                if phase == 2:
+                    break
+                # Fim da primeira fase sem um mestre viável
+                return _failed_outcome(optimizer, pulp.LpStatusInfeasible), info
+            if info["rodadas"] >= max_rounds:
+                info["motivo"] = f"limite de {max_rounds} rodadas"
+                return None, info
+
+            info["rodadas"] += 1
+            resultados = solve_master(phase)
+            if phase == 1:
+                info["rodadas_fase1"] += 1
+                if resultados["valor_objetivo"] <= tol * (1 + np.abs(master_rhs).max()):
+                    phase = 2
+                    resultados = solve_master(phase)
+            if resultados["viavel"] != pulp.LpStatusOptimal:
+                if resultados["viavel"] == pulp.LpStatusUnbounded:
+                    return _failed_outcome(optimizer, pulp.LpStatusUnbounded), info
+                info["motivo"] = f"mestre com status {pulp.LpStatus.get(resultados['viavel'], resultados['viavel'])}"
+                return None, info
+            prices, convexity = resultados.pi[:num_linking], resultados.pi[num_linking:]
+            phase_costs = costs if phase == 2 else np.zeros(n)
+            outcomes = subproblems.solve([phase_costs[block["colunas"]]
+                                          - linking_matrix[:, block["colunas"]].T @ prices for block in blocks])
+    finally:
+        subproblems.close()
+
+    # Solução: as colunas livres vêm do mestre e as dos blocos, das combinações dos pontos
+    x = np.zeros(n)
+    x[direct] = resultados.x[:direct.size]
+    for weight, (k, point) in zip(resultados.x[fixed:], points):
+        x[blocks[k]["colunas"]] += weight * point
+    pi = np.zeros(len(optimizer.constraints))
+    pi[linking] = prices
+    for block, result in zip(blocks, duals):
+        pi[block["linhas"]] = result["pi"]
+    pi *= sign
+    dj = np.asarray(optimizer.coef_fo, dtype=float) - _transpose_product(optimizer.constraints.csr(), pi, n)
+    return {"status": pulp.LpStatusOptimal, "x": x, "pi": pi, "dj": dj,
+            "objetivo": float(np.asarray(optimizer.coef_fo, dtype=float) @ x)}, info
+
+
+def _transpose_product(csr, y, num_columns):
+    """Calcula A^T y para uma matriz CSR."""
+    indptr, indices, data = csr
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    return np.bincount(indices, weights=data * y[rows], minlength=num_columns)
@@ -0,0 +1,152 @@
+"""
+Diagnóstico de inviabilidade: um subconjunto irredutível inviável (IIS) das
+restrições, isto é, um conjunto inviável de linhas do qual nenhuma pode sair
+sem que o restante (junto com os limites das variáveis) fique viável.
+
+1. Filtro elástico: uma única resolução, no backend do otimizador, do modelo
+   elástico (cada linha ganha folgas que a deixam sempre viável e o objetivo
+   minimiza a soma delas). As linhas com preço sombra não nulo bastam para a
+   inviabilidade: o mesmo vetor dual, restrito a elas, continua viável no
+   dual e prova que a soma das folgas segue positiva sem as demais linhas.
+2. Filtro de remoção: cada candidata é retirada (sua folga fica livre) e o
+   subsistema é testado pelo simplex em NumPy. Se ele continua inviável, a
+   linha sai de vez; senão, ela volta e faz parte do IIS. As dimensões não
+   mudam entre os testes, então cada um parte da base do anterior.
+
+Os limites das variáveis não são relaxados: quando eles participam da
+inviabilidade, o IIS traz apenas as linhas envolvidas.
+"""
+import time
+
+import numpy as np
+import pulp
+
+import simplex
+from constraint_store import SENSE_SYMBOLS
+from sensitivity import dense_matrix, slack_bounds
+
+TOLERANCE = 1e-9
+
+LE, GE, EQ = pulp.LpConstraintLE, pulp.LpConstraintGE, pulp.LpConstraintEQ
+
+
+def elastic_model(optimizer):
+    """
+    Monta o modelo elástico: a · x - e ≤ b, a · x + e ≥ b e a · x + e⁺ - e⁻ = b,
+    com e ≥ 0, minimizando a soma das folgas e. As variáveis originais mantêm
+    os limites e vêm primeiro; as folgas ocupam as colunas seguintes.
+
+    Retorna:
+        dict: Os arrays do modelo, no formato de `Optimizer._from_model_arrays`.
+    """
+    n, m = optimizer.num_variables, len(optimizer.constraints)
+    indptr, indices, data = optimizer.constraints.csr()
+    senses = optimizer.constraints.senses
+
+    # Uma folga por linha de desigualdade e duas por igualdade
+    elastic_rows = np.concatenate([np.arange(m), np.flatnonzero(senses == EQ)])
+    elastic_values = np.where(senses[elastic_rows] == LE, -1.0, 1.0)
+    elastic_values[m:] = -1.0
+    num_elastic = elastic_rows.size
+
+    rows = np.concatenate([np.repeat(np.arange(m), np.diff(indptr)), elastic_rows])
+    order = np.argsort(rows, kind="stable")
+    elastic_indptr = np.zeros(m + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=m), out=elastic_indptr[1:])
+    columns = np.concatenate([indices, n + np.arange(num_elastic)])[order]
+    values = np.concatenate([data, elastic_values])[order]
+
+    return {
+        "sense": pulp.LpMinimize,
+        "c": np.concatenate([np.zeros(n), np.ones(num_elastic)]),
+        "csr": (elastic_indptr, columns, values),
+        "rhs": optimizer.constraints.rhs.copy(),
+        "senses": [SENSE_SYMBOLS[int(code)] for code in senses],
+        "names": list(optimizer.constraints.names),
+        "variable_names": None,
+        "lower": np.concatenate([optimizer.lower_bounds, np.zeros(num_elastic)]),
+        "upper": np.concatenate([optimizer.upper_bounds, np.full(num_elastic, np.inf)]),
+    }
+
+
+def elastic_filter(optimizer, tol=TOLERANCE):
+    """
+    Resolve o modelo elástico e retorna as linhas candidatas ao IIS.
+    Retorna:
+        tuple: (índices das linhas candidatas, soma mínima das violações).
+        Sem candidatas, o modelo é viável.
+    """
+    elastic = type(optimizer)._from_model_arrays(elastic_model(optimizer), backend=optimizer.backend.name,
+                                                 singleton_bounds=False)
+    resultados = elastic.solve()
+    if resultados["viavel"] != pulp.LpStatusOptimal:
+        raise pulp.PulpSolverError(
+            f"O modelo elástico não foi resolvido (status {pulp.LpStatus[resultados['viavel']]}).")
+    violation = resultados["valor_objetivo"]
+    if violation <= tol * (1 + np.abs(optimizer.constraints.rhs).max(initial=0.0)):
+        return np.array([], dtype=np.int64), 0.0
+    return np.flatnonzero(np.abs(resultados.pi) > tol), violation
+
+
+def deletion_filter(optimizer, rows):
+    """
+    Reduz as linhas candidatas (inviáveis em conjunto) a um IIS.
+    Args:
+        optimizer (Optimizer): O modelo.
+        rows (array): Índices das linhas candidatas.
+    Retorna:
+        tuple: (índices das linhas do IIS, número de testes de viabilidade).
+    """
+    indptr, indices, data = optimizer.constraints.csr()
+    lengths = np.diff(indptr)[rows]
+    sub_indptr = np.zeros(rows.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=sub_indptr[1:])
+    entries = np.repeat(indptr[rows] - sub_indptr[:-1], lengths) + np.arange(sub_indptr[-1])
+    columns, sub_indices = np.unique(indices[entries], return_inverse=True)
+    matrix = dense_matrix((sub_indptr, sub_indices, data[entries]), columns.size)
+
+    # Cada linha ganha uma folga explícita: retirá-la é só deixar a folga livre
+    k = rows.size
+    slack_lower, slack_upper = slack_bounds(optimizer.constraints.senses[rows])
+    lower = np.concatenate([optimizer.lower_bounds[columns], slack_lower])
+    upper = np.concatenate([optimizer.upper_bounds[columns], slack_upper])
+    system = np.hstack([matrix, np.eye(k)])
+    costs = np.zeros(columns.size + k)
+    equalities = np.full(k, EQ)
+    rhs = optimizer.constraints.rhs[rows]
+
+    keep = np.ones(k, dtype=bool)
+    basis = at_upper = None
+    for i in range(k):
+        slack = columns.size + i
+        lower[slack], upper[slack] = -np.inf, np.inf
+        result = simplex.solve(costs, system, rhs, equalities, lower, upper, basis=basis, at_upper=at_upper)
+        if result["status"] == pulp.LpStatusInfeasible:
+            keep[i] = False
+        else:
+            lower[slack], upper[slack] = slack_lower[i], slack_upper[i]
+        basis, at_upper = result["basis"], result["at_upper"]
+    return rows[keep], k
+
+
+def find_iis(optimizer, tol=TOLERANCE):
+    """
+    Calcula um IIS das restrições do modelo.
+    Retorna:
+        dict: "linhas" (índices) e "nomes" das restrições do IIS (vazios se o
+        modelo é viável), "candidatas" (linhas após o filtro elástico),
+        "violacao_minima" (soma mínima das violações), "testes" (resoluções
+        do filtro de remoção) e "segundos".
+    """
+    start = time.perf_counter()
+    candidates, violation = elastic_filter(optimizer, tol)
+    rows, tests = deletion_filter(optimizer, candidates) if candidates.size else (candidates, 0)
+    names = optimizer.constraints.names
+    return {
+        "linhas": rows.tolist(),
+        "nomes": [names[i] for i in rows.tolist()],
+        "candidatas": int(candidates.size),
+        "violacao_minima": violation,
+        "testes": tests,
+        "segundos": time.perf_counter() - start,
+    }
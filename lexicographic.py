@@ -0,0 +1,126 @@
+"""
+Otimização lexicográfica: vários objetivos em ordem de prioridade.
+
+Cada estágio otimiza um objetivo sobre as soluções ótimas dos anteriores: ao
+fim do estágio, o valor obtido é travado como uma restrição (com a piora
+relativa admitida pelo objetivo, a sua "tolerancia") e o estágio seguinte
+troca apenas a função objetivo. Todos os estágios rodam na mesma cópia do
+modelo, alterada de forma incremental, de modo que os backends partem da base
+do estágio anterior (HiGHS e simplex) e, nos modelos com variáveis inteiras,
+da solução anterior como incumbente, que continua viável com a nova trava.
+
+Os objetivos no sentido oposto ao do modelo entram com os coeficientes
+trocados de sinal: o sentido do modelo não muda entre os estágios.
+"""
+import time
+
+import numpy as np
+import pulp
+
+from solver_backends import STATUS_TIME_LIMIT
+
+# Folga relativa mínima de uma trava, para que erros de arredondamento do
+# solver não tornem o estágio seguinte inviável
+LOCK_TOLERANCE = 1e-7
+
+
+def normalize_objectives(objectives, num_variables, sense):
+    """
+    Normaliza a lista de objetivos de `solve_lexicographic`.
+    Args:
+        objectives (list): Vetores de coeficientes ou dicts com "coeficientes"
+            e, opcionalmente, "sentido", "tolerancia" e "nome".
+        num_variables (int): O número de variáveis do modelo.
+        sense: O sentido do modelo, padrão dos objetivos.
+    Retorna:
+        list: Um dict por objetivo, com todas as chaves.
+    """
+    if len(objectives) == 0:
+        raise ValueError("Informe ao menos um objetivo.")
+    normalized = []
+    for k, objective in enumerate(objectives):
+        if not isinstance(objective, dict):
+            objective = {"coeficientes": objective}
+        coefficients = np.asarray(objective["coeficientes"], dtype=float).ravel()
+        if coefficients.size != num_variables:
+            raise ValueError(f"O objetivo {k + 1} deve ter um coeficiente por variável.")
+        objective_sense = objective.get("sentido", sense)
+        if objective_sense not in (pulp.LpMaximize, pulp.LpMinimize):
+            raise ValueError(f"Sentido desconhecido no objetivo {k + 1}: {objective_sense}")
+        tolerance = float(objective.get("tolerancia", 0.0))
+        if tolerance < 0:
+            raise ValueError(f"A tolerância do objetivo {k + 1} não pode ser negativa.")
+        normalized.append({
+            "nome": objective.get("nome") or f"Objetivo {k + 1}",
+            "coeficientes": coefficients,
+            "sentido": objective_sense,
+            "tolerancia": tolerance,
+        })
+    return normalized
+
+
+def solve_lexicographic(optimizer, objectives):
+    """
+    Resolve os objetivos em ordem de prioridade (ver o início do módulo).
+    A função objetivo e as restrições de `optimizer` não são alteradas.
+    Args:
+        optimizer (Optimizer): O modelo.
+        objectives (list): Os objetivos, do mais ao menos prioritário (ver
+            `normalize_objectives`).
+    Retorna:
+        dict: "estagios" (um por objetivo resolvido, com "nome", "sentido",
+        "status", "valor", "trava", "segundos" e "iteracoes"), "status" (o do
+        último estágio resolvido: os estágios param no primeiro sem solução),
+        "valores_otimos" (a solução do último estágio com solução, ou None),
+        "valores_objetivos" (o valor de cada objetivo nessa solução) e
+        "segundos" (o total, incluindo a cópia do modelo).
+    """
+    objectives = normalize_objectives(objectives, optimizer.num_variables, optimizer.sense)
+    start = time.perf_counter()
+    chain = type(optimizer).from_bytes(optimizer.to_bytes(), cache=optimizer.cache,
+                                       time_limit=optimizer.time_limit)
+    # As linhas de uma variável virariam um modelo reduzido novo a cada estágio, sem warm start
+    chain.singleton_bounds = False
+
+    stages = []
+    x = None
+    for k, objective in enumerate(objectives):
+        coefficients = objective["coeficientes"]
+        sign = 1.0 if objective["sentido"] == chain.sense else -1.0
+        chain.set_objective_function(sign * coefficients)
+        resultados = chain.solve()
+        status = resultados["viavel"]
+        stage = {
+            "nome": objective["nome"],
+            "sentido": objective["sentido"],
+            "status": status,
+            "valor": None,
+            "trava": None,
+            "segundos": resultados["metrics"]["segundos"],
+            "iteracoes": resultados["metrics"]["iteracoes"],
+        }
+        stages.append(stage)
+        if status not in (pulp.LpStatusOptimal, STATUS_TIME_LIMIT):
+            break
+        x = resultados.x.copy()
+        value = float(coefficients @ x)
+        stage["valor"] = value
+        if k == len(objectives) - 1:
+            break
+        # Trava o valor do objetivo: as soluções dos estágios seguintes não podem piorá-lo além da tolerância
+        slack = max(objective["tolerancia"] * abs(value), LOCK_TOLERANCE * (1 + abs(value)))
+        if objective["sentido"] == pulp.LpMaximize:
+            stage["trava"] = value - slack
+            chain.add_constraint(coefficients, stage["trava"], f"lexicografico_{k + 1}", ">=")
+        else:
+            stage["trava"] = value + slack
+            chain.add_constraint(coefficients, stage["trava"], f"lexicografico_{k + 1}", "<=")
+
+    return {
+        "estagios": stages,
+        "status": stages[-1]["status"],
+        "valores_otimos": x.tolist() if x is not None else None,
+        "valores_objetivos": ([float(objective["coeficientes"] @ x) for objective in objectives]
+                              if x is not None else None),
+        "segundos": time.perf_counter() - start,
+    }
@@ -1,25 +1,420 @@
+import itertools
+import os
+import pickle
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pulp
 
+import decomposition as decomposition_module
+import lexicographic
+import model_io
+import iis
+import presolve as presolve_module
+import scaling as scaling_module
+import sensitivity
+from constraint_store import SENSE_SYMBOLS, ConstraintStore
+from metrics import PhaseTimer, peak_rss_mb
+from solution_cache import canonical_key
+from solve_result import SolveResult
+from solver_backends import BACKENDS, STATUS_TIME_LIMIT, get_backend
+
+# Números de revisão únicos no processo: mudam a cada alteração de um modelo
+_REVISIONS = itertools.count(1)
+# Alterações pontuais guardadas para que os backends atualizem o modelo carregado
+MAX_JOURNAL = 256
+# Passo relativo usado por `sweep` para passar de um ponto de quebra ao trecho
+# seguinte, e quantas vezes ele é reduzido se o trecho for mais curto
+SWEEP_STEP = 1e-4
+SWEEP_RETRIES = 3
+
+
+def _to_csr(A, num_variables):
+    """
+    Converte a matriz de coeficientes para o formato CSR, descartando os zeros.
+    Aceita um array denso (ou lista de listas) ou uma matriz esparsa do SciPy
+    (CSR, COO, ...), detectada pelo método `tocsr()` para não exigir o SciPy.
+
+    Retorna:
+        tuple: (indptr, indices, data) no formato CSR.
+    """
+    if hasattr(A, "tocsr"):
+        csr = A.tocsr(copy=True)
+        csr.sum_duplicates()
+        csr.eliminate_zeros()
+        if csr.shape[1] != num_variables:
+            raise ValueError("A matriz A deve ter uma coluna por variável.")
+        return (np.asarray(csr.indptr, dtype=np.int64),
+                np.asarray(csr.indices, dtype=np.int64),
+                np.asarray(csr.data, dtype=float))
+
+    dense = np.asarray(A, dtype=float)
+    if dense.ndim != 2 or dense.shape[1] != num_variables:
+        raise ValueError("A matriz A deve ter uma coluna por variável.")
+    rows, cols = np.nonzero(dense)
+    indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+    return indptr, cols.astype(np.int64), dense[rows, cols]
+
 
 class Optimizer:
     """
     Classe para encapsular a lógica de otimização linear usando a biblioteca PuLP.
     """
 
-    def __init__(self, num_variables, sense=pulp.LpMaximize):
+    def __init__(self, num_variables, sense=pulp.LpMaximize, backend="cbc_cmd", cache=None,
+                 singleton_bounds=True, profiler=None, time_limit=None, mip_gap=None, threads=None):
         """
         Inicializa o otimizador.
         Args:
             num_variables (int): O número de variáveis de decisão.
             sense (pulp.LpMaximize ou pulp.LpMinimize): O sentido da otimização.
+            backend (str ou SolverBackend): O solver usado em `solve()`:
+                "cbc_cmd" (CBC por linha de comando, padrão), "inprocess"
+                (HiGHS em memória), "simplex" (simplex revisado em NumPy) ou
+                uma instância de `SolverBackend`.
+            cache (SolutionCache, opcional): Cache de resultados de `solve()` e
+                `analyze_delta` (ex: `solution_cache.shared_cache`).
+            singleton_bounds (bool): Se True, restrições com uma só variável são
+                tratadas como limites da variável em `solve()`; o preço sombra
+                delas vem do custo reduzido da variável.
+            profiler (callable, opcional): Chamado ao fim de cada `solve()` com
+                o dict de métricas da resolução (o mesmo de `resultados["metrics"]`).
+            time_limit (float, opcional): Limite de tempo do solver, em segundos,
+                em cada resolução. Se ele se esgota, `solve()` devolve a melhor
+                solução viável encontrada com o status `STATUS_TIME_LIMIT`.
+            mip_gap (float, opcional): Gap relativo em que o solver para a busca
+                nos modelos com variáveis inteiras (ex: 0.01 para 1%). Padrão:
+                o do solver.
+            threads (int, opcional): Threads do solver nos modelos com variáveis
+                inteiras. Padrão: o do solver.
         """
         self.num_variables = num_variables
-        self.model = pulp.LpProblem("Problema_Otimizacao", sense)
-        self.variables = [pulp.LpVariable(f'x{i + 1}', lowBound=0, cat='Continuous')
-                          for i in range(num_variables)]
-        self.coef_fo = None
-        # Armazena os dados das restrições para uso posterior
-        self.constraints_data = []
+        self.sense = sense
+        self.backend = get_backend(backend)
+        self.cache = cache
+        self.singleton_bounds = singleton_bounds
+        self.profiler = profiler
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        self.threads = threads
+        self.coef_fo = np.zeros(num_variables)
+        # Armazena as restrições em arrays compactos; o modelo do PuLP é
+        # montado a partir delas apenas quando necessário (ver `model`)
+        self.constraints = ConstraintStore(num_variables)
+        self.variables = None
+        # Nomes externos das variáveis (ex: lidos de um arquivo MPS/LP); padrão x1, x2, ...
+        self.variable_names = None
+        self.lower_bounds = np.zeros(num_variables)
+        self.upper_bounds = np.full(num_variables, np.inf)
+        # Máscara das variáveis inteiras (ver `set_variable_type`)
+        self.integer = np.zeros(num_variables, dtype=bool)
+        # Melhor solução inteira conhecida, ponto de partida das resoluções seguintes
+        self.incumbent = None
+        self.status = pulp.LpStatusNotSolved
+        self._model = None
+        self._revision = next(_REVISIONS)
+        # Registro das alterações pontuais a partir da revisão `_journal_base`
+        self._journal = []
+        self._journal_base = self._revision
+        self._canonical = None
+        # Solução da última resolução, sua base ótima e as faixas calculadas a partir dela
+        self._solution = None
+        self._basis = None
+        self._rhs_ranges = None
+        self._cost_ranges = None
+        # Relatório da última resolução com presolve e tempo da última sem ele
+        self.presolve_report = None
+        self._plain_solve_time = None
+        # Relatório da última resolução com escala e iterações da última sem ela
+        self.scaling_report = None
+        self._plain_iterations = None
+        # IIS calculado por `infeasible_subset()`, com a revisão do modelo
+        self._iis = None
+        # Relatório da última resolução decomposta e blocos de `block_structure()`
+        self.decomposition_report = None
+        self._blocks = None
+        # Resultado da relaxação linear dos modelos inteiros, com a revisão
+        self._relaxation = None
+        # Backend dos modelos derivados (relaxação linear, modelo reduzido e escalado), separado
+        # para que eles não ocupem o backend principal nem desfaçam o seu warm start
+        self._side_backend = None
+
+    @classmethod
+    def from_arrays(cls, c, A, b, senses, sense=pulp.LpMaximize, names=None, lower=None, upper=None,
+                    integer=None, **options):
+        """
+        Constrói o otimizador de uma só vez a partir de arrays (caminho em lote).
+        As linhas são copiadas em bloco da matriz no formato CSR, de modo que
+        apenas os coeficientes não nulos são armazenados.
+
+        Args:
+            c (array): Coeficientes da função objetivo.
+            A (array ou matriz esparsa): Matriz de coeficientes (m x n), densa
+                ou esparsa do SciPy (CSR, COO, ...).
+            b (array): Lados direitos (RHS) das restrições.
+            senses (list): Operador de cada restrição ('<=', '>=', '==').
+            sense (pulp.LpMaximize ou pulp.LpMinimize): O sentido da otimização.
+            names (list, opcional): Nomes das restrições. Padrão: R1, R2, ...
+            lower, upper (array, opcional): Limites das variáveis (podem ser
+                infinitos). Padrão: 0 <= x < +infinito.
+            integer (array, opcional): Máscara das variáveis inteiras. Padrão: todas contínuas.
+            **options: Demais argumentos do construtor (backend, cache, ...).
+
+        Retorna:
+            Optimizer: O otimizador com a função objetivo e as restrições definidas.
+        """
+        c = np.asarray(c, dtype=float).ravel()
+        b = np.asarray(b, dtype=float).ravel()
+        indptr, indices, data = _to_csr(A, c.size)
+        num_rows = indptr.size - 1
+        if b.size != num_rows or len(senses) != num_rows:
+            raise ValueError("b e senses devem ter uma entrada por linha de A.")
+        if names is None:
+            names = [f"R{i + 1}" for i in range(num_rows)]
+
+        optimizer = cls(c.size, sense=sense, **options)
+        optimizer.coef_fo = c
+        if lower is not None:
+            optimizer.lower_bounds = np.broadcast_to(np.asarray(lower, dtype=float), c.shape).copy()
+        if upper is not None:
+            optimizer.upper_bounds = np.broadcast_to(np.asarray(upper, dtype=float), c.shape).copy()
+        if np.any(optimizer.lower_bounds > optimizer.upper_bounds):
+            raise ValueError("Limite inferior maior que o superior.")
+        if integer is not None:
+            optimizer.integer = np.broadcast_to(np.asarray(integer, dtype=bool), c.shape).copy()
+        optimizer.constraints.extend(indptr, indices, data, b, senses, names)
+        optimizer._touch()
+
+        return optimizer
+
+    @classmethod
+    def read_mps(cls, path, **options):
+        """
+        Lê um modelo de um arquivo MPS em uma única passada (ver `model_io`).
+        Args:
+            path (str): Caminho do arquivo.
+            **options: Demais argumentos do construtor (backend, cache).
+        Retorna:
+            Optimizer: O otimizador, com as estatísticas da leitura em `read_stats`.
+        """
+        parsed = model_io.read_mps(path)
+        optimizer = cls._from_model_arrays(parsed, **options)
+        optimizer.read_stats = parsed["estatisticas"]
+        return optimizer
+
+    @classmethod
+    def read_lp(cls, path, **options):
+        """
+        Lê um modelo de um arquivo no formato LP do CPLEX (ver `model_io`).
+        Args:
+            path (str): Caminho do arquivo.
+            **options: Demais argumentos do construtor (backend, cache).
+        Retorna:
+            Optimizer: O otimizador, com as estatísticas da leitura em `read_stats`.
+        """
+        parsed = model_io.read_lp(path)
+        optimizer = cls._from_model_arrays(parsed, **options)
+        optimizer.read_stats = parsed["estatisticas"]
+        return optimizer
+
+    @classmethod
+    def _from_model_arrays(cls, arrays, **options):
+        """
+        Constrói o otimizador a partir de um dicionário de arrays ("sense", "c",
+        "csr", "rhs", "senses", "names", "variable_names", "lower", "upper" e,
+        opcionalmente, "inteiras"), como os de `model_io` e `presolve`.
+        """
+        optimizer = cls(arrays["c"].size, sense=arrays["sense"], **options)
+        optimizer.coef_fo = arrays["c"]
+        optimizer.lower_bounds = arrays["lower"]
+        optimizer.upper_bounds = arrays["upper"]
+        optimizer.variable_names = arrays["variable_names"]
+        if arrays.get("inteiras") is not None:
+            optimizer.integer = np.asarray(arrays["inteiras"], dtype=bool).copy()
+        optimizer.constraints.extend(*arrays["csr"], arrays["rhs"], arrays["senses"], arrays["names"])
+        optimizer._touch()
+        return optimizer
+
+    def write_mps(self, path):
+        """
+        Grava o modelo em um arquivo MPS (formato livre).
+        Args:
+            path (str): Caminho do arquivo.
+        """
+        model_io.write_mps(self, path)
+
+    def to_bytes(self):
+        """
+        Serializa o modelo de forma compacta (apenas arrays, sem objetos do PuLP),
+        incluindo a solução ótima da última resolução e a sua base, se houver.
+        Retorna:
+            bytes: O modelo serializado.
+        """
+        indptr, indices, data = self.constraints.csr()
+        solution = self._solution
+        if solution is not None and solution.get("basis") is None and self._basis is not None:
+            # A base reconstruída vai junto: a cópia não precisa recuperá-la de novo
+            solution = dict(solution, basis=self._basis["colunas"])
+        payload = {
+            "num_variables": self.num_variables,
+            "sense": self.sense,
+            "coef_fo": self.coef_fo,
+            "lower_bounds": self.lower_bounds,
+            "upper_bounds": self.upper_bounds,
+            "indptr": indptr,
+            "indices": indices,
+            "data": data,
+            "rhs": self.constraints.rhs,
+            "senses": self.constraints.senses,
+            "names": self.constraints.names,
+            "variable_names": self.variable_names,
+            "status": self.status,
+            "solution": solution,
+            "backend": self.backend.name,
+            "integer": self.integer,
+            "incumbent": self.incumbent,
+            "mip_gap": self.mip_gap,
+            "threads": self.threads,
+        }
+        return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, payload, **options):
+        """
+        Reconstrói um otimizador serializado com `to_bytes()`. O registro de
+        alterações começa vazio e nenhum backend tem o modelo carregado: a
+        primeira resolução da cópia carrega o modelo inteiro, sem warm start.
+        Args:
+            payload (bytes): O modelo serializado.
+            **options: Demais argumentos do construtor (cache, time_limit, ...).
+                O `backend` substitui o do otimizador serializado.
+        Retorna:
+            Optimizer: O otimizador, com a solução salva (se houver).
+        """
+        state = pickle.loads(payload)
+        backend = options.pop("backend", None) or (state["backend"] if state["backend"] in BACKENDS
+                                                   else "cbc_cmd")
+        for option in ("mip_gap", "threads"):
+            options.setdefault(option, state.get(option))
+        optimizer = cls(state["num_variables"], sense=state["sense"], backend=backend, **options)
+        optimizer.coef_fo = state["coef_fo"]
+        if state.get("integer") is not None:
+            optimizer.integer = state["integer"]
+        optimizer.incumbent = state.get("incumbent")
+        optimizer.lower_bounds = state["lower_bounds"]
+        optimizer.upper_bounds = state["upper_bounds"]
+        optimizer.variable_names = state["variable_names"]
+        senses = [SENSE_SYMBOLS[int(code)] for code in state["senses"]]
+        optimizer.constraints.extend(state["indptr"], state["indices"], state["data"],
+                                     state["rhs"], senses, state["names"])
+        optimizer._touch()
+        optimizer.status = state["status"]
+        optimizer._solution = state["solution"]
+        return optimizer
+
+    def adopt_solution(self, payload):
+        """
+        Adota a solução de uma cópia deste modelo resolvida em outro processo
+        (ver `background.SolveJob`), como se `solve()` tivesse rodado aqui. A
+        solução também vai para o cache, se houver, salvo quando a resolução
+        foi interrompida pelo limite de tempo.
+        Args:
+            payload (bytes): O retorno de `to_bytes()` da cópia resolvida.
+        """
+        state = pickle.loads(payload)
+        self.status = state["status"]
+        self._solution = state["solution"]
+        self._basis = None
+        self._rhs_ranges = None
+        self._cost_ranges = None
+        if self.is_mip and self.status in (pulp.LpStatusOptimal, STATUS_TIME_LIMIT):
+            self.incumbent = self._solution["x"]
+        if (self.cache is not None and self._solution is not None
+                and self.status not in (STATUS_TIME_LIMIT, pulp.LpStatusNotSolved)):
+            key, order = self._canonical_key()
+            self.cache.put(self._solve_cache_key(key), {
+                "status": self.status,
+                "x": self._solution["x"],
+                "dj": self._solution["dj"],
+                "pi": self._solution["pi"][order],
+                "objetivo": self._solution["objetivo"],
+                "limite": self._solution.get("limite"),
+            })
+
+    def _touch(self, edit=None):
+        """
+        Registra uma alteração no modelo (invalida o modelo carregado nos backends).
+        Args:
+            edit (tuple, opcional): Descrição da alteração pontual, por exemplo
+                ("coefficient", linha, coluna, valor). Sem ela, o registro é
+                reiniciado e os backends recarregam o modelo inteiro.
+        """
+        self._revision = next(_REVISIONS)
+        if edit is None:
+            self._journal = []
+            self._journal_base = self._revision
+            return
+        self._journal.append((self._revision, edit))
+        if len(self._journal) > MAX_JOURNAL:
+            self._journal_base = self._journal.pop(0)[0]
+
+    def edits_since(self, revision):
+        """
+        Lista as alterações pontuais feitas depois de uma revisão.
+        Args:
+            revision (int): A revisão carregada pelo backend.
+        Retorna:
+            list: As alterações em ordem, ou None se o registro não cobrir a
+            revisão (o modelo deve então ser recarregado por inteiro).
+        """
+        if revision is None or revision < self._journal_base:
+            return None
+        return [edit for edit_revision, edit in self._journal if edit_revision > revision]
+
+    @property
+    def model(self):
+        """
+        O modelo do PuLP, montado sob demanda a partir das restrições armazenadas.
+        """
+        if self._model is None:
+            self._model = self._build_model()
+        return self._model
+
+    def _build_model(self):
+        """
+        Monta o `pulp.LpProblem` com as variáveis, a F.O. e as restrições,
+        usando apenas os coeficientes não nulos.
+        """
+        model = pulp.LpProblem("Problema_Otimizacao", self.sense)
+        self.variables = [pulp.LpVariable(f'x{i + 1}', lowBound=self._bound(self.lower_bounds[i]),
+                                          upBound=self._bound(self.upper_bounds[i]),
+                                          cat=pulp.LpInteger if self.integer[i] else pulp.LpContinuous)
+                          for i in range(self.num_variables)]
+        nonzero = np.flatnonzero(self.coef_fo)
+        model += self._expression(nonzero, self.coef_fo[nonzero]), "Objective_Function"
+        for i, name in enumerate(self.constraints.names):
+            model.addConstraint(self._pulp_constraint(i), name)
+        return model
+
+    @staticmethod
+    def _bound(value):
+        """Converte um limite infinito para `None`, como o PuLP espera."""
+        return None if np.isinf(value) else float(value)
+
+    def _expression(self, indices, values):
+        """Cria uma expressão afim do PuLP a partir de índices e coeficientes."""
+        variables = self.variables
+        return pulp.LpAffineExpression([(variables[j], a) for j, a in zip(indices.tolist(), values.tolist())])
+
+    def _pulp_constraint(self, key):
+        """Cria a `pulp.LpConstraint` correspondente a uma restrição armazenada."""
+        i = self.constraints.index(key)
+        indices, values = self.constraints.row(i)
+        return pulp.LpConstraint(self._expression(indices, values), int(self.constraints.senses[i]),
+                                 self.constraints.names[i], float(self.constraints.rhs[i]))
 
     def set_objective_function(self, coefficients):
         """
@@ -27,9 +422,12 @@ class Optimizer:
         Args:
             coefficients (list): Lista de coeficientes para cada variável na F.O.
         """
-        self.coef_fo = coefficients
-        expression = pulp.lpSum([coefficients[i] * self.variables[i] for i in range(self.num_variables)])
-        self.model += expression, "Objective_Function"
+        self.coef_fo = np.asarray(coefficients, dtype=float)
+        # Os backends leem os coeficientes do próprio otimizador ao aplicar a alteração
+        self._touch(("objective_function",))
+        if self._model is not None:
+            nonzero = np.flatnonzero(self.coef_fo)
+            self._model.setObjective(self._expression(nonzero, self.coef_fo[nonzero]))
 
     def add_constraint(self, coefficients, rhs, name, sense):
         """
@@ -38,91 +436,931 @@ class Optimizer:
             coefficients (list): Coeficientes das variáveis no lado esquerdo (LHS).
             rhs (float): Valor do lado direito (RHS).
             name (str): Nome da restrição.
-            sense (str): Operador da restrição ('<=', '>=').
+            sense (str): Operador da restrição ('<=', '>=', '==').
         """
-        self.constraints_data.append((coefficients, rhs, sense, name))
+        index = self.constraints.append(coefficients, rhs, sense, name)
+        indices, values = self.constraints.row(index)
+        self._touch(("add_row", indices.copy(), values.copy()))
+        if self._model is not None:
+            self._model.addConstraint(self._pulp_constraint(name), name)
 
-        lhs = pulp.lpSum([coefficients[i] * self.variables[i] for i in range(self.num_variables)])
+    def update_objective_coeff(self, index, value):
+        """
+        Altera um coeficiente da função objetivo.
+        Args:
+            index (int): O índice da variável.
+            value (float): O novo coeficiente.
+        """
+        self.coef_fo = np.array(self.coef_fo, dtype=float)
+        self.coef_fo[index] = value
+        self._touch(("objective", index, float(value)))
+        if self._model is not None:
+            variable = self.variables[index]
+            if value != 0:
+                self._model.objective[variable] = float(value)
+            else:
+                self._model.objective.pop(variable, None)
 
-        if sense == '<=':
-            self.model += lhs <= rhs, name
-        elif sense == '>=':
-            self.model += lhs >= rhs, name
+    def set_variable_bounds(self, var_index, lower=0.0, upper=None):
+        """
+        Define os limites de uma variável (o padrão é x >= 0).
+        Args:
+            var_index (int): O índice da variável.
+            lower (float, opcional): Limite inferior; None para -infinito.
+            upper (float, opcional): Limite superior; None para +infinito.
+                Com lower=None e upper=None a variável é livre.
+        """
+        lower = -np.inf if lower is None else float(lower)
+        upper = np.inf if upper is None else float(upper)
+        if lower > upper:
+            raise ValueError(f"Limite inferior maior que o superior: {lower} > {upper}")
+        self.lower_bounds = np.array(self.lower_bounds, dtype=float)
+        self.upper_bounds = np.array(self.upper_bounds, dtype=float)
+        self.lower_bounds[var_index] = lower
+        self.upper_bounds[var_index] = upper
+        self._touch(("bounds", var_index, lower, upper))
+        if self._model is not None:
+            self.variables[var_index].lowBound = self._bound(lower)
+            self.variables[var_index].upBound = self._bound(upper)
 
-    def solve(self):
+    def set_variable_type(self, var_index, cat):
+        """
+        Define o tipo de uma variável. Uma variável binária é inteira com
+        limites [0, 1] (os limites anteriores são substituídos).
+        Args:
+            var_index (int): O índice da variável.
+            cat (str): pulp.LpContinuous, pulp.LpInteger ou pulp.LpBinary.
+        """
+        if cat not in (pulp.LpContinuous, pulp.LpInteger, pulp.LpBinary):
+            raise ValueError(f"Tipo de variável desconhecido: {cat}")
+        if cat == pulp.LpBinary:
+            self.set_variable_bounds(var_index, 0.0, 1.0)
+        integer = cat != pulp.LpContinuous
+        self.integer = np.array(self.integer, dtype=bool)
+        self.integer[var_index] = integer
+        self._touch(("type", var_index, integer))
+        if self._model is not None:
+            self.variables[var_index].cat = pulp.LpInteger if integer else pulp.LpContinuous
+
+    @property
+    def is_mip(self):
+        """True se o modelo tem alguma variável inteira."""
+        return bool(self.integer.any())
+
+    def set_incumbent(self, values):
+        """
+        Define a solução inicial (incumbente) dos modelos com variáveis inteiras.
+        Os backends partem dela se ela for viável; depois de cada resolução a
+        incumbente passa a ser a melhor solução encontrada.
+        Args:
+            values (array): Um valor por variável, ou None para descartá-la.
+        """
+        if values is None:
+            self.incumbent = None
+            return
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size != self.num_variables:
+            raise ValueError("A incumbente deve ter um valor por variável.")
+        self.incumbent = values.copy()
+
+    def update_rhs(self, key, value):
+        """
+        Altera o lado direito de uma restrição.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+            value (float): O novo RHS.
+        """
+        index = self.constraints.index(key)
+        self.constraints.set_rhs(index, value)
+        self._touch(("rhs", index))
+        self._patch_constraint(index)
+
+    def update_sense(self, key, sense):
+        """
+        Altera o operador de uma restrição.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+            sense (str): O novo operador ('<=', '>=', '==').
+        """
+        index = self.constraints.index(key)
+        self.constraints.set_sense(index, sense)
+        self._touch(("sense", index))
+        self._patch_constraint(index)
+
+    def update_coefficient(self, key, var_index, value):
+        """
+        Altera um coeficiente de uma restrição.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+            var_index (int): O índice da variável.
+            value (float): O novo coeficiente.
+        """
+        index = self.constraints.index(key)
+        self.constraints.set_coefficient(index, var_index, value)
+        self._touch(("coefficient", index, var_index, float(value)))
+        self._patch_constraint(index)
+
+    def remove_constraint(self, key):
+        """
+        Remove uma restrição. As restrições seguintes têm o índice reduzido em 1.
+        Args:
+            key (int ou str): O índice ou o nome da restrição.
+        """
+        index = self.constraints.index(key)
+        name = self.constraints.names[index]
+        self.constraints.remove(index)
+        self._touch(("remove_row", index))
+        if self._model is not None:
+            del self._model.constraints[name]
+
+    def _patch_constraint(self, index):
+        """Recria apenas a restrição alterada no modelo do PuLP, se ele já existir."""
+        if self._model is not None:
+            name = self.constraints.names[index]
+            self._model.constraints[name] = self._pulp_constraint(index)
+
+    def solve(self, presolve=False, ranging=False, trace_memory=False, scaling=None, decomposition=None,
+              workers=None):
         """
         Resolve o problema de otimização.
+        Args:
+            presolve (bool): Se True, reduz o modelo antes de resolvê-lo (ver
+                `presolve.py`) e restaura a solução completa depois. O que foi
+                removido e os tempos ficam em `presolve_report` (com
+                "tempo_economizado" se o mesmo modelo já tiver sido resolvido
+                sem presolve).
+            ranging (bool): Se True, inclui os custos reduzidos e as faixas dos
+                coeficientes da função objetivo (ver `cost_ranges()`), calculados
+                a partir da base ótima, sem novas resoluções.
+            trace_memory (bool): Se True, mede com o tracemalloc o pico de memória
+                do Python durante a resolução (o que a deixa mais lenta).
+            scaling (str, opcional): Escala as linhas e as colunas antes de
+                resolver ("media_geometrica" ou "equilibrio", ver `scaling.py`) e
+                desescala a solução. As faixas dos coeficientes, o condicionamento
+                estimado da base e as iterações ficam em `scaling_report`.
+            decomposition (str, opcional): Resolve o modelo por blocos (ver
+                `decomposition.py` e `block_structure()`). "blocos" resolve as
+                componentes independentes da matriz em paralelo e junta as
+                soluções; "dantzig_wolfe" também separa as linhas de ligação e
+                as trata no problema mestre. Sem blocos, ou se a decomposição
+                não chegar ao ótimo, o modelo é resolvido inteiro. Não se
+                combina com presolve nem com escala; o relatório fica em
+                `decomposition_report`.
+            workers (int, opcional): Processos da decomposição. Padrão: número de CPUs.
+        Retorna:
+            SolveResult: Os resultados da otimização, acessíveis como um dicionário
+            ("valores_otimos", "precos_sombra", ...) e como arrays (`x`, `pi`,
+            `slack`, `dj`). Em "metrics" ficam os tempos de relógio e de CPU por
+            fase, o tamanho do modelo, as iterações do solver e os picos de
+            memória (ver `_metrics`). Nos modelos com variáveis inteiras entram
+            também "limite_dual" e "gap", e os preços sombra e custos reduzidos
+            são os da relaxação linear ("precos_sombra_origem"). Esses modelos
+            não se combinam com presolve, escala nem Dantzig–Wolfe.
+        """
+        timer = PhaseTimer()
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            resultados, iterations = self._solve(presolve, ranging, timer, scaling, decomposition, workers)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if tracing else None
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        resultados["metrics"] = self._metrics(timer, iterations, peak)
+        if self.profiler is not None:
+            self.profiler(resultados["metrics"])
+        return resultados
+
+    def _solve(self, presolve, ranging, timer, scaling=None, decomposition=None, workers=None):
+        """
+        Resolve o modelo e monta os resultados de `solve()`, marcando as fases em `timer`.
         Retorna:
-            dict: Um dicionário contendo os resultados da otimização.
+            tuple: (resultados, iterações do solver ou None).
         """
-        self.model.solve()
+        if self.is_mip and (presolve or scaling is not None or decomposition == "dantzig_wolfe"):
+            raise ValueError("Modelos com variáveis inteiras não se combinam com presolve, escala "
+                             "nem Dantzig-Wolfe.")
+        if scaling is not None:
+            self.scaling_report = None
+        if decomposition is not None:
+            if presolve or scaling is not None:
+                raise ValueError("A decomposição não se combina com presolve nem com escala.")
+            outcome, self.decomposition_report = self._decomposed_outcome(decomposition, workers, timer)
+        elif presolve:
+            outcome, self.presolve_report = self._presolved_outcome(presolve_module.REDUCTIONS, timer, scaling)
+            self._compare_with_plain_solve(self.presolve_report)
+        else:
+            start = time.perf_counter()
+            if self.singleton_bounds and not self.is_mip and presolve_module.has_singleton_rows(self):
+                # Restrições de uma só variável são resolvidas como limites. As linhas e
+                # colunas que ficam vazias saem junto (o CBC falha em modelos sem coeficientes)
+                outcome, _ = self._presolved_outcome(("linhas_singleton", "colunas_vazias", "linhas_vazias"),
+                                                     timer, scaling)
+            else:
+                outcome = self._backend_outcome(timer, scaling)
+            if scaling is None:
+                self._plain_solve_time = (self._revision, time.perf_counter() - start)
+                self._plain_iterations = (self._revision, outcome.get("metricas", {}).get("iteracoes"))
+        if self.scaling_report is not None and scaling is not None:
+            self._compare_with_unscaled_solve(self.scaling_report)
+        self.status = outcome["status"]
+        if self.status == STATUS_TIME_LIMIT and not self._is_feasible(outcome["x"]):
+            # O solver parou no limite de tempo sem uma solução viável
+            self.status = pulp.LpStatusNotSolved
+        self._basis = None
+        self._rhs_ranges = None
+        self._cost_ranges = None
 
-        is_optimal = self.model.status == pulp.LpStatusOptimal
+        is_optimal = self.status == pulp.LpStatusOptimal
 
-        valores_otimos = [v.varValue if v.varValue is not None else 0 for v in self.variables]
-        valor_objetivo = pulp.value(self.model.objective) if is_optimal else 0
+        x = np.ascontiguousarray(outcome["x"], dtype=float)
+        valor_objetivo = outcome["objetivo"] if is_optimal else 0
+        if self.status == STATUS_TIME_LIMIT:
+            valor_objetivo = float(np.asarray(self.coef_fo, dtype=float) @ x)
+        bound = None
+        if self.is_mip and self.status in (pulp.LpStatusOptimal, STATUS_TIME_LIMIT):
+            self.incumbent = x.copy()
+            bound = outcome.get("limite")
+            if bound is None and is_optimal:
+                bound = valor_objetivo
 
-        precos_sombra = []
         if is_optimal:
-            precos_sombra = [c.pi if c.pi is not None else 0 for c in self.model.constraints.values()]
+            pi, dj = outcome["pi"], outcome["dj"]
+            if self.is_mip:
+                pi, dj = self._relaxation_duals()
+                timer.lap("relaxacao")
+            self._solution = {
+                "x": outcome["x"],
+                "dj": dj,
+                "pi": pi,
+                "objetivo": valor_objetivo,
+                # Base ótima, quando o backend a informa (ver `rhs_ranges()`)
+                "basis": None if self.is_mip else outcome.get("basis"),
+                "limite": bound,
+            }
+            pi = np.ascontiguousarray(pi, dtype=float)
+            dj = np.ascontiguousarray(dj, dtype=float)
         else:
-            precos_sombra = [0] * len(self.model.constraints)
+            pi = np.zeros(len(self.constraints))
+            dj = np.zeros(self.num_variables)
+            self._solution = None
+
+        resultados = SolveResult(x, pi, dj, self.constraints.rhs - self._row_activity(x), valor_objetivo,
+                                 self.status, self.variable_names, list(self.constraints.names))
+        if self.is_mip:
+            gap = None if bound is None else abs(valor_objetivo - bound) / max(abs(valor_objetivo), 1e-10)
+            resultados.add_mip_bound(bound, gap)
+        timer.lap("resultados")
+        if ranging:
+            ranges = self.cost_ranges()
+            if ranges is not None:
+                resultados.add_cost_ranges(ranges["diminuicao"], ranges["aumento"])
+            else:
+                resultados.add_cost_ranges(np.zeros(self.num_variables), np.zeros(self.num_variables))
+            timer.lap("faixas")
+        return resultados, outcome.get("metricas", {}).get("iteracoes")
+
+    def solve_lexicographic(self, objectives):
+        """
+        Otimiza vários objetivos em ordem de prioridade (ver `lexicographic.py`):
+        cada um é otimizado mantendo os anteriores em seus valores ótimos, a
+        menos da tolerância. Os estágios rodam em uma cópia do modelo, alterada
+        de forma incremental (warm start); este modelo não muda.
+        Args:
+            objectives (list): Os objetivos, do mais ao menos prioritário. Cada
+                um é um vetor de coeficientes (no sentido do modelo) ou um dict
+                com "coeficientes" e, opcionalmente, "sentido" (pulp.LpMaximize
+                ou pulp.LpMinimize), "tolerancia" (piora relativa admitida no
+                valor ótimo, ex: 0.05 para 5%) e "nome".
+        Retorna:
+            dict: "estagios" (valor, trava, status, tempo e iterações de cada
+            objetivo), "status", "valores_otimos", "valores_objetivos" e "segundos".
+        """
+        return lexicographic.solve_lexicographic(self, objectives)
+
+    def _metrics(self, timer, iterations, peak):
+        """
+        Monta as métricas de uma resolução.
+        Args:
+            timer (PhaseTimer): Os tempos das fases.
+            iterations (int): As iterações do solver, ou None se ele não as informar.
+            peak (float): O pico de memória do Python em MB, ou None se não medido.
+        Retorna:
+            dict: Tempos por fase e totais, tamanho do modelo, iterações e
+            memória. Os picos de RSS são os do processo e dos filhos (o CBC)
+            desde o início, não só os desta resolução.
+        """
+        wall, cpu = timer.total()
+        rss, children_rss = peak_rss_mb()
+        return {
+            "backend": self.backend.name,
+            "fases": timer.phases,
+            "segundos": wall,
+            "cpu_segundos": cpu,
+            "linhas": len(self.constraints),
+            "colunas": self.num_variables,
+            "nao_zeros": self.constraints.nnz,
+            "iteracoes": iterations,
+            "pico_memoria_mb": peak,
+            "pico_rss_mb": rss,
+            "pico_rss_filhos_mb": children_rss,
+        }
+
+    def _row_activity(self, x):
+        """Retorna a atividade (lado esquerdo) de cada restrição no ponto `x`."""
+        indptr, indices, data = self.constraints.csr()
+        rows = np.repeat(np.arange(len(self.constraints)), np.diff(indptr))
+        return np.bincount(rows, weights=data * x[indices], minlength=len(self.constraints))
+
+    def _is_feasible(self, x, tol=1e-6):
+        """
+        Verifica se `x` respeita as restrições, os limites e a integralidade
+        das variáveis, com tolerância relativa `tol` (os solvers interrompidos
+        podem parar fora da região viável).
+        """
+        slack = self.constraints.rhs - self._row_activity(x)
+        slack_lower, slack_upper = sensitivity.slack_bounds(self.constraints.senses)
+        row_tol = tol * (1 + np.abs(self.constraints.rhs))
+        column_tol = tol * (1 + np.abs(x))
+        integral = np.abs(x - np.round(x))[self.integer] <= column_tol[self.integer]
+        return bool(np.all(slack >= slack_lower - row_tol) and np.all(slack <= slack_upper + row_tol)
+                    and np.all(x >= self.lower_bounds - column_tol) and np.all(x <= self.upper_bounds + column_tol)
+                    and np.all(integral))
+
+    def _canonical_key(self):
+        """Chave canônica do modelo no cache, recalculada apenas quando ele muda."""
+        if self._canonical is None or self._canonical[0] != self._revision:
+            self._canonical = (self._revision, *canonical_key(self))
+        return self._canonical[1], self._canonical[2]
+
+    def _solve_outcome(self, timer):
+        """
+        Resolve com o backend ou recupera o resultado do cache. No cache os
+        preços sombra ficam na ordem canônica das linhas e são reordenados aqui.
+        Args:
+            timer (PhaseTimer): Recebe as fases da consulta ao cache e do backend.
+        """
+        if self.cache is None:
+            outcome = self.backend.solve(self)
+            timer.lap("solver", outcome.get("metricas", {}).get("fases"))
+            return outcome
+
+        key, order = self._canonical_key()
+        cached = self.cache.get(self._solve_cache_key(key))
+        timer.lap("cache")
+        if cached is not None:
+            pi = np.empty_like(cached["pi"])
+            pi[order] = cached["pi"]
+            return dict(cached, pi=pi)
 
+        outcome = self.backend.solve(self)
+        timer.lap("solver", outcome.get("metricas", {}).get("fases"))
+        if outcome["status"] in (STATUS_TIME_LIMIT, pulp.LpStatusNotSolved):
+            # Resolução interrompida: outra, com mais tempo, pode ir além
+            return outcome
+        self.cache.put(self._solve_cache_key(key), {
+            "status": outcome["status"],
+            "x": outcome["x"],
+            "dj": outcome["dj"],
+            "pi": outcome["pi"][order],
+            "objetivo": outcome["objetivo"],
+            "limite": outcome.get("limite"),
+        })
+        return outcome
+
+    def _solve_cache_key(self, key):
+        """Chave de uma resolução no cache; nos modelos inteiros a solução depende também do gap."""
+        return ("solve", key, self.mip_gap) if self.is_mip else ("solve", key)
+
+    def _model_arrays(self):
+        """Cópia do modelo contínuo no formato de `_from_model_arrays` (sem a integralidade)."""
+        indptr, indices, data = self.constraints.csr()
         return {
-            "valores_otimos": valores_otimos,
-            "valor_objetivo": valor_objetivo,
-            "precos_sombra": precos_sombra,
-            "viavel": self.model.status
+            "sense": self.sense,
+            "c": np.array(self.coef_fo, dtype=float),
+            "csr": (indptr.copy(), indices.copy(), data.copy()),
+            "rhs": self.constraints.rhs.copy(),
+            "senses": [SENSE_SYMBOLS[int(code)] for code in self.constraints.senses],
+            "names": list(self.constraints.names),
+            "variable_names": self.variable_names,
+            "lower": self.lower_bounds.copy(),
+            "upper": self.upper_bounds.copy(),
+        }
+
+    def _relaxation_duals(self):
+        """
+        Preços sombra e custos reduzidos da relaxação linear de um modelo
+        inteiro (zeros se ela não tiver solução ótima), calculados uma vez por
+        revisão, com o mesmo tipo de backend e o mesmo cache.
+        """
+        if self._relaxation is None or self._relaxation[0] != self._revision:
+            relaxed = Optimizer._from_model_arrays(self._model_arrays(), backend=self._derived_backend(),
+                                                   cache=self.cache, time_limit=self.time_limit)
+            outcome = relaxed._solve_outcome(PhaseTimer())
+            if outcome["status"] == pulp.LpStatusOptimal:
+                duals = (outcome["pi"], outcome["dj"])
+            else:
+                duals = (np.zeros(len(self.constraints)), np.zeros(self.num_variables))
+            self._relaxation = (self._revision, *duals)
+        return self._relaxation[1], self._relaxation[2]
+
+    def _derived_backend(self):
+        """
+        O backend dos modelos derivados deste (ver `_side_backend`): do mesmo
+        tipo do principal, criado uma vez. O CBC não guarda estado entre as
+        resoluções e é o próprio backend principal.
+        """
+        if self._side_backend is None:
+            stateful = self.backend.name in BACKENDS and self.backend.name != "cbc_cmd"
+            self._side_backend = get_backend(self.backend.name) if stateful else self.backend
+        return self._side_backend
+
+    def _presolved_outcome(self, reductions, timer, scaling=None):
+        """
+        Resolve o modelo reduzido pelo presolve com o mesmo tipo de backend
+        (ver `_derived_backend`) e o mesmo cache e restaura a solução do modelo original.
+        Args:
+            reductions (tuple): As reduções aplicadas (ver `presolve.REDUCTIONS`).
+            timer (PhaseTimer): Recebe as fases do presolve, da resolução e do postsolve.
+            scaling (str, opcional): O método de escala do modelo reduzido.
+        Retorna:
+            tuple: (resultado no formato dos backends, relatório do presolve).
+        """
+        reduction = presolve_module.presolve(self, reductions)
+        report = reduction["relatorio"]
+        report["status"] = reduction["status"]
+        timer.lap("presolve")
+        start = time.perf_counter()
+        if reduction["status"] == "interrompido":
+            # Possivelmente ilimitado: o solver decide com o modelo completo
+            outcome = self._backend_outcome(timer, scaling)
+        elif reduction["status"] == pulp.LpStatusInfeasible:
+            outcome = {"status": pulp.LpStatusInfeasible, "x": np.zeros(self.num_variables),
+                       "dj": np.zeros(self.num_variables), "pi": np.zeros(len(self.constraints)),
+                       "objetivo": 0}
+        else:
+            if reduction["colunas"].size == 0:
+                # Tudo foi resolvido no presolve
+                outcome = {"status": pulp.LpStatusOptimal, "x": np.zeros(0), "pi": np.zeros(0)}
+            else:
+                reduced = Optimizer._from_model_arrays(reduction["modelo"], backend=self._derived_backend(),
+                                                       cache=self.cache, time_limit=self.time_limit)
+                outcome = reduced._backend_outcome(timer, scaling)
+                if scaling is not None:
+                    self.scaling_report = reduced.scaling_report
+            report["tempo_resolucao"] = time.perf_counter() - start
+            start = time.perf_counter()
+            # O postsolve monta um novo resultado: as métricas do backend são mantidas
+            solver_metrics = outcome.get("metricas")
+            outcome = presolve_module.postsolve(self, reduction, outcome)
+            if solver_metrics is not None:
+                outcome["metricas"] = solver_metrics
+            report["tempo_postsolve"] = time.perf_counter() - start
+            timer.lap("postsolve")
+        report.setdefault("tempo_resolucao", time.perf_counter() - start)
+        report.setdefault("tempo_postsolve", 0.0)
+        report["tempo_total"] = report["tempo_presolve"] + report["tempo_resolucao"] + report["tempo_postsolve"]
+        return outcome, report
+
+    def _backend_outcome(self, timer, scaling=None):
+        """Resolve com o backend (ver `_solve_outcome`), escalando o modelo antes se pedido."""
+        if scaling is None:
+            return self._solve_outcome(timer)
+        outcome, self.scaling_report = self._scaled_outcome(scaling, timer)
+        return outcome
+
+    def _scaled_outcome(self, method, timer):
+        """
+        Resolve o modelo escalado com o mesmo tipo de backend (ver `_derived_backend`)
+        e o mesmo cache e desescala a solução.
+        Args:
+            method (str): O método de escala (ver `scaling.METHODS`).
+            timer (PhaseTimer): Recebe as fases da escala, da resolução e da desescala.
+        Retorna:
+            tuple: (resultado no formato dos backends, relatório da escala).
+        """
+        row_scale, col_scale = scaling_module.scale_factors(self, method)
+        model = scaling_module.scaled_model(self, row_scale, col_scale)
+        report = {
+            "metodo": method,
+            "faixa_coeficientes": scaling_module.coefficient_range(self.constraints.csr()[2]),
+            "faixa_coeficientes_escalada": scaling_module.coefficient_range(model["csr"][2]),
+            "fatores_linhas": row_scale,
+            "fatores_colunas": col_scale,
+            "condicionamento_base": None,
+        }
+        timer.lap("escala")
+        scaled = Optimizer._from_model_arrays(model, backend=self._derived_backend(), cache=self.cache,
+                                              time_limit=self.time_limit)
+        outcome = scaled._solve_outcome(timer)
+        report["iteracoes_com_escala"] = outcome.get("metricas", {}).get("iteracoes")
+        if outcome["status"] == pulp.LpStatusOptimal and len(self.constraints) <= scaling_module.CONDITION_LIMIT:
+            # A base ótima do modelo escalado dá o condicionamento dos dois modelos
+            scaled._solution = {"x": outcome["x"], "dj": outcome["dj"], "pi": outcome["pi"],
+                                "basis": outcome.get("basis")}
+            basis = scaled._optimal_basis()
+            if basis is not None:
+                report["condicionamento_base"] = scaling_module.basis_conditioning(basis, row_scale, col_scale)
+            timer.lap("condicionamento")
+        outcome = scaling_module.unscale(outcome, row_scale, col_scale)
+        timer.lap("desescala")
+        return outcome, report
+
+    def _decomposed_outcome(self, method, workers, timer):
+        """
+        Resolve o modelo por blocos (ver `decomposition.py`) ou, sem blocos,
+        inteiro com o backend.
+        Args:
+            method (str): O método (ver `decomposition.METHODS`).
+            workers (int, opcional): Número de processos.
+            timer (PhaseTimer): Recebe as fases da detecção e da resolução dos blocos.
+        Retorna:
+            tuple: (resultado no formato dos backends, relatório da decomposição).
+        """
+        if method not in decomposition_module.METHODS:
+            raise ValueError(f"Decomposição desconhecida: {method}. "
+                             f"Opções: {', '.join(decomposition_module.METHODS)}")
+        structure = self.block_structure(max_linking=0 if method == "blocos" else None)
+        timer.lap("estrutura")
+        report = {
+            "metodo": method,
+            "blocos": len(structure["blocos"]),
+            "linhas_ligacao": int(structure["linhas_ligacao"].size),
+            "tamanhos": [(int(block["linhas"].size), int(block["colunas"].size)) for block in structure["blocos"]],
+            "processos": 1,
+            "rodadas": None,
+            "colunas_geradas": None,
+            "motivo": None,
+        }
+        outcome = None
+        if len(structure["blocos"]) < 2:
+            report["motivo"] = "sem estrutura em blocos"
+        elif structure["linhas_ligacao"].size == 0:
+            outcome, info = decomposition_module.solve_blocks(self, structure, workers)
+            report.update(info)
+        else:
+            outcome, info = decomposition_module.dantzig_wolfe(self, structure, workers)
+            report.update(info)
+        timer.lap("blocos")
+        report["decomposto"] = outcome is not None
+        if outcome is None:
+            outcome = self._solve_outcome(timer)
+        return outcome, report
+
+    def _compare_with_unscaled_solve(self, report):
+        """Inclui as iterações da última resolução sem escala deste mesmo modelo, se houver."""
+        report["iteracoes_sem_escala"] = None
+        if self._plain_iterations is not None and self._plain_iterations[0] == self._revision:
+            report["iteracoes_sem_escala"] = self._plain_iterations[1]
+
+    def _compare_with_plain_solve(self, report):
+        """
+        Compara o tempo com a última resolução sem presolve deste mesmo modelo.
+        Sem ela não há com o que comparar e "tempo_economizado" fica de fora do relatório.
+        """
+        if self._plain_solve_time is not None and self._plain_solve_time[0] == self._revision:
+            report["tempo_economizado"] = self._plain_solve_time[1] - report["tempo_total"]
+
+    def _delta_cache_key(self, changes):
+        """Chave de um cenário de `analyze_delta` no cache (linhas na ordem canônica)."""
+        key, order = self._canonical_key()
+        position = np.empty(order.size, dtype=np.int64)
+        position[order] = np.arange(order.size)
+        return "delta", key, tuple(sorted((int(position[i]), float(delta)) for i, delta in changes.items()))
+
+    def rhs_ranges(self):
+        """
+        Calcula, a partir da base ótima da última resolução, quanto o RHS de cada
+        restrição pode diminuir ou aumentar mantendo a mesma base. Dentro dessas
+        faixas o preço sombra da base é exato. O cálculo é feito uma única vez
+        por resolução.
+
+        Retorna:
+            dict: Arrays "diminuicao", "aumento" e "precos_sombra" (da base),
+            com uma entrada por restrição, ou None se não houver solução ótima,
+            se o modelo tiver variáveis inteiras (não há base ótima) ou se a
+            base não estiver disponível (ver `_optimal_basis`).
+        """
+        if self._solution is None or self.is_mip:
+            return None
+        if self._rhs_ranges is not None:
+            return self._rhs_ranges
+
+        basis = self._optimal_basis()
+        if basis is None:
+            return None
+        m = len(self.constraints)
+        decrease, increase = np.empty(m), np.empty(m)
+        # A inversa da base sai da fatoração em blocos de colunas, sem ser montada inteira
+        for start in range(0, m, sensitivity.RANGING_BLOCK):
+            rows = np.arange(start, min(start + sensitivity.RANGING_BLOCK, m))
+            decrease[rows], increase[rows] = self._ranging_columns(basis, rows)
+        self._rhs_ranges = {
+            "diminuicao": decrease,
+            "aumento": increase,
+            "precos_sombra": basis["precos_sombra"],
+        }
+        return self._rhs_ranges
+
+    def _ranging_columns(self, basis, rows):
+        """Faixas de RHS de algumas restrições (ver `rhs_ranges`), com uma solução por restrição."""
+        columns = sensitivity.inverse_columns(basis["fator"], rows, len(self.constraints))
+        return sensitivity.rhs_ranging(columns, basis["valores_basicos"], basis["inferior_basicas"],
+                                       basis["superior_basicas"])
+
+    def infeasible_subset(self):
+        """
+        Calcula um subconjunto irredutível inviável (IIS) das restrições: um
+        filtro elástico (uma resolução com folgas) reduz as candidatas e um
+        filtro de remoção com warm start as reduz ao IIS (ver `iis.py`). O
+        resultado é guardado até o modelo mudar.
+
+        Retorna:
+            dict: "linhas" e "nomes" das restrições do IIS (vazios se o modelo
+            for viável), "candidatas", "violacao_minima", "testes" e "segundos".
+        """
+        if self._iis is None or self._iis[0] != self._revision:
+            self._iis = (self._revision, iis.find_iis(self))
+        return self._iis[1]
+
+    def block_structure(self, max_linking=None):
+        """
+        Detecta os blocos da matriz de coeficientes (ver `decomposition.find_blocks`):
+        as componentes conexas e, com até `max_linking` linhas de ligação, a
+        estrutura bloco-angular. O resultado é guardado até o modelo mudar.
+        Args:
+            max_linking (int, opcional): Máximo de linhas de ligação (0: só as
+                componentes conexas). Padrão: 10% das linhas.
+        Retorna:
+            dict: "blocos" (as "linhas" e as "colunas" de cada um),
+            "linhas_ligacao", "colunas_livres" e "linhas_vazias".
+        """
+        if self._blocks is None or self._blocks[:2] != (self._revision, max_linking):
+            self._blocks = (self._revision, max_linking, decomposition_module.find_blocks(self, max_linking))
+        return self._blocks[2]
+
+    def cost_ranges(self):
+        """
+        Calcula, a partir da base ótima da última resolução, quanto o coeficiente
+        de cada variável na função objetivo pode diminuir ou aumentar mantendo a
+        mesma solução ótima. O cálculo é feito uma única vez por resolução.
+
+        Retorna:
+            dict: Arrays "diminuicao", "aumento" e "custos_reduzidos" (da base),
+            com uma entrada por variável, ou None se não houver solução ótima,
+            se o modelo tiver variáveis inteiras ou se a base não estiver
+            disponível (ver `_optimal_basis`).
+        """
+        if self._solution is None or self.is_mip:
+            return None
+        if self._cost_ranges is not None:
+            return self._cost_ranges
+
+        n = self.num_variables
+        basis = self._optimal_basis()
+        if basis is None:
+            return None
+        A, columns, factor = basis["A"], basis["colunas"], basis["fator"]
+        m = A.shape[0]
+        prices = basis["precos_sombra"]
+        reduced_costs = np.concatenate([self.coef_fo - A.T @ prices, -prices])
+        reduced_costs[columns] = 0.0
+        states = sensitivity.nonbasic_states(basis["valores"], basis["inferior"], basis["superior"], columns)
+        # O cálculo é feito para maximização; na minimização as direções se invertem
+        maximize = self.sense == pulp.LpMaximize
+        sign = 1.0 if maximize else -1.0
+        # As colunas fora da base não dependem do tableau; as básicas usam as suas
+        # linhas de B⁻¹ [A | I], calculadas em blocos com a fatoração transposta
+        decrease, increase = sensitivity.cost_ranging(np.zeros((0, n + m)), columns[:0], sign * reduced_costs,
+                                                      states)
+        for start in range(0, m, sensitivity.RANGING_BLOCK):
+            positions = np.arange(start, min(start + sensitivity.RANGING_BLOCK, m))
+            inverse_rows = sensitivity.inverse_rows(factor, positions, m)
+            tableau = np.hstack([(A.T @ inverse_rows.T).T, inverse_rows])
+            block = columns[positions]
+            block_decrease, block_increase = sensitivity.cost_ranging(tableau, block, sign * reduced_costs, states)
+            decrease[block], increase[block] = block_decrease[block], block_increase[block]
+        if not maximize:
+            decrease, increase = increase, decrease
+        self._cost_ranges = {
+            "diminuicao": decrease[:n],
+            "aumento": increase[:n],
+            "custos_reduzidos": reduced_costs[:n],
+        }
+        return self._cost_ranges
+
+    def _optimal_basis(self):
+        """
+        Monta a base ótima da última resolução e a sua fatoração LU esparsa,
+        uma vez por resolução. A base vem do backend (HiGHS e simplex) ou é
+        reconstruída a partir da solução, o que só é feito em modelos dentro
+        de `sensitivity.RECOVERY_LIMIT`.
+        Retorna:
+            dict: A base, ou None se ela não estiver disponível (as análises
+            então resolvem o modelo de novo).
+        """
+        if self._basis is not None:
+            return self._basis
+
+        n, m = self.num_variables, len(self.constraints)
+        basis = self._solution.get("basis")
+        if basis is None and m * m * (n + m) > sensitivity.RECOVERY_LIMIT:
+            return None
+        A = sensitivity.sparse_matrix(self.constraints.csr(), n)
+        b = self.constraints.rhs
+        slack_lower, slack_upper = sensitivity.slack_bounds(self.constraints.senses)
+        lower = np.concatenate([self.lower_bounds, slack_lower])
+        upper = np.concatenate([self.upper_bounds, slack_upper])
+        x = self._solution["x"]
+        values = np.concatenate([x, b - A @ x])
+
+        if basis is None:
+            reduced_costs = np.concatenate([self._solution["dj"], -self._solution["pi"]])
+            basis = sensitivity.recover_basis(A.toarray(), values, lower, upper, reduced_costs)
+        factor = sensitivity.factorize_basis(A, basis)
+        if factor is None:
+            return None
+        # Recalcula as básicas a partir da base para manter a consistência numérica
+        nonbasic_values = values.copy()
+        nonbasic_values[basis] = 0.0
+        basic_values = factor.solve(b - A @ nonbasic_values[:n] - nonbasic_values[n:])
+
+        costs = np.concatenate([self.coef_fo, np.zeros(len(b))])
+        self._basis = {
+            "A": A,
+            "colunas": basis,
+            "fator": factor,
+            "valores": values,
+            "inferior": lower,
+            "superior": upper,
+            "valores_basicos": basic_values,
+            "inferior_basicas": lower[basis],
+            "superior_basicas": upper[basis],
+            "precos_sombra": factor.solve(costs[basis], trans="T"),
         }
+        return self._basis
 
     def analyze_delta(self, constr_index, delta_b):
         """
         Analisa o impacto de um aumento (delta) no lado direito de uma restrição.
-        Usa o método `copy()` para clonar o modelo original e aplicar a mudança,
-        que é uma abordagem mais robusta e eficiente.
+        Se o delta estiver dentro da faixa calculada em `rhs_ranges()`, a base
+        ótima não muda e a resposta sai direto do preço sombra; caso contrário,
+        o modelo é resolvido novamente com o RHS alterado. Os modelos com
+        variáveis inteiras são sempre resolvidos de novo, partindo da incumbente.
 
         Args:
-            constr_index (int): O índice da restrição a ser modificada.
+            constr_index (int ou str): O índice ou o nome da restrição a ser modificada.
             delta_b (float): O valor a ser adicionado ao RHS da restrição.
 
         Retorna:
-            dict: Um dicionário com os resultados da simulação.
+            dict: Um dicionário com os resultados da simulação. A chave "metodo"
+            indica o caminho usado: "preco_sombra" ou "resolucao".
+        """
+        return self._analyze_scenario({self.constraints.index(constr_index): delta_b})
+
+    def analyze_deltas(self, scenarios, workers=None):
+        """
+        Avalia vários cenários de alteração de RHS em paralelo.
+        Os cenários em que a base ótima se mantém são respondidos pelo preço
+        sombra no próprio processo; só os que exigem uma nova resolução vão
+        para os processos, que recebem uma única vez uma cópia compacta do
+        modelo com a base (ver `to_bytes()`).
+
+        Args:
+            scenarios (iterable): Cenários no formato `(restrição, delta)`, em que
+                a restrição é um índice ou nome; um cenário com várias restrições
+                é uma lista desses pares ou um dict `{restrição: delta}`.
+            workers (int, opcional): Número de processos. Padrão: número de CPUs.
+                Com 1, os cenários são avaliados no próprio processo.
+
+        Retorna:
+            generator: Um dict no formato de `analyze_delta` por cenário, na
+            ordem de entrada, produzido assim que o cenário fica pronto.
+        """
+        tasks = [self._scenario_changes(scenario) for scenario in scenarios]
+        workers = workers or os.cpu_count() or 1
+        if self.status != pulp.LpStatusOptimal or workers == 1 or len(tasks) <= 1:
+            for changes in tasks:
+                yield self._analyze_scenario(changes)
+            return
+
+        answered = [self._analyze_scenario(changes, resolve=False) for changes in tasks]
+        pending = [changes for changes, result in zip(tasks, answered) if result is None]
+        if not pending:
+            yield from answered
+            return
+
+        chunksize = max(1, len(pending) // (workers * 4))
+        # O snapshot leva a base calculada acima: os processos não a reconstroem
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_worker,
+                                       initargs=(self.to_bytes(),))
+        try:
+            resolved = executor.map(_analyze_in_worker, pending, chunksize=chunksize)
+            for changes, result in zip(tasks, answered):
+                if result is None:
+                    result = next(resolved)
+                    if self.cache is not None:
+                        self.cache.put(self._delta_cache_key(changes), result)
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _scenario_changes(self, scenario):
+        """
+        Normaliza um cenário para um dict {índice da restrição: delta}.
+        """
+        if isinstance(scenario, dict):
+            pairs = scenario.items()
+        elif (len(scenario) == 2 and isinstance(scenario[0], (int, np.integer, str))
+              and not isinstance(scenario[1], (list, tuple))):
+            pairs = [scenario]
+        else:
+            pairs = scenario
+        changes = {}
+        for key, delta_b in pairs:
+            index = self.constraints.index(key)
+            changes[index] = changes.get(index, 0.0) + float(delta_b)
+        return changes
+
+    def _analyze_scenario(self, changes, resolve=True):
+        """
+        Avalia um cenário já normalizado, tratando o caso sem solução ótima.
+        Com `resolve=False`, devolve None se o cenário exigir uma nova resolução.
         """
         # Só realiza a análise se o modelo original tiver uma solução ótima
-        if self.model.status != pulp.LpStatusOptimal:
+        if self.status != pulp.LpStatusOptimal:
             return {
                 "novo_valor_objetivo": 0,
                 "melhora": 0,
-                "pode_aumentar": False
+                "pode_aumentar": False,
+                "metodo": None
             }
+        if self.cache is None:
+            return self._analyze_changes(changes, resolve)
 
-        valor_original = pulp.value(self.model.objective)
+        key = self._delta_cache_key(changes)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        result = self._analyze_changes(changes, resolve)
+        if result is not None:
+            self.cache.put(key, dict(result))
+        return result
 
-        new_model = self.model.copy()
-
-        # Pega o nome da restrição que queremos alterar
-        # O quarto elemento da tupla é o nome que demos em `add_constraint`
-        constr_name = self.constraints_data[constr_index][3]
-
-        # Pega a restrição correspondente no NOVO modelo clonado
-        constraint_to_modify = new_model.constraints[constr_name]
+    def _analyze_changes(self, changes, resolve=True):
+        """
+        Avalia uma alteração simultânea nos RHS de uma ou mais restrições.
+        Args:
+            changes (dict): Mapeia o índice de cada restrição ao delta do RHS.
+            resolve (bool): Se False, não resolve o modelo de novo quando a
+                base deixa de ser ótima.
+        Retorna:
+            dict: O mesmo formato de `analyze_delta`, ou None se a alteração
+            exigir uma nova resolução e `resolve` for False.
+        """
+        valor_original = self._solution["objetivo"]
+        indices = np.fromiter(changes.keys(), dtype=np.int64, count=len(changes))
+        deltas = np.fromiter(changes.values(), dtype=float, count=len(changes))
 
-        # PuLP move o RHS para o lado esquerdo da equação (ex: x <= 10 se torna x - 10 <= 0).
-        # Para aumentar o RHS em `delta_b`, precisamos subtrair `delta_b` da constante.
-        constraint_to_modify.constant += -delta_b
+        # Os preços sombra da relaxação não dão o objetivo do modelo inteiro
+        basis = None if self.is_mip else self._optimal_basis()
+        if basis is None:
+            keeps_basis = False
+        elif len(changes) == 1:
+            index, delta_b = indices[0], deltas[0]
+            if self._rhs_ranges is not None:
+                decrease, increase = self._rhs_ranges["diminuicao"][index], self._rhs_ranges["aumento"][index]
+            else:
+                # Só a faixa desta restrição: uma solução com a fatoração da base
+                (decrease,), (increase,) = self._ranging_columns(basis, [index])
+            keeps_basis = -decrease <= delta_b <= increase
+        else:
+            # Várias restrições: verifica diretamente se a base continua viável
+            basic_lower, basic_upper = basis["inferior_basicas"], basis["superior_basicas"]
+            change = np.zeros(len(self.constraints))
+            change[indices] = deltas
+            new_values = basis["valores_basicos"] + basis["fator"].solve(change)
+            tol = sensitivity.TOLERANCE * (1 + np.abs(new_values))
+            keeps_basis = bool(np.all(new_values >= basic_lower - tol) and np.all(new_values <= basic_upper + tol))
 
-        # Resolve o modelo clonado e modificado
-        new_model.solve()
+        if keeps_basis:
+            # A base continua ótima: o objetivo varia linearmente com os preços sombra
+            metodo = "preco_sombra"
+            novo_valor_objetivo = valor_original + float(basis["precos_sombra"][indices] @ deltas)
+            is_optimal = True
+        elif not resolve:
+            return None
+        else:
+            metodo = "resolucao"
+            novo_valor_objetivo, is_optimal = self._resolve_with_deltas(changes)
+            if not is_optimal:
+                novo_valor_objetivo = valor_original
 
-        novo_valor_objetivo = valor_original
         is_viable_and_better = False
-
-        # Verifica se a simulação resultou em uma solução ótima
-        if new_model.status == pulp.LpStatusOptimal:
-            novo_valor_objetivo = pulp.value(new_model.objective)
-
+        if is_optimal:
             # Lógica de melhora depende do sentido da otimização
-            if self.model.sense == pulp.LpMaximize:
+            if self.sense == pulp.LpMaximize:
                 # Para MAX, melhora é um valor maior ou igual
                 is_viable_and_better = novo_valor_objetivo >= valor_original
             else:  # pulp.LpMinimize
@@ -132,5 +1370,206 @@ class Optimizer:
         return {
             "novo_valor_objetivo": novo_valor_objetivo,
             "melhora": novo_valor_objetivo - valor_original,
-            "pode_aumentar": is_viable_and_better
+            "pode_aumentar": is_viable_and_better,
+            "metodo": metodo
         }
+
+    def _resolve_with_deltas(self, changes):
+        """
+        Resolve o modelo com o RHS de algumas restrições alterado, sem modificar
+        o modelo armazenado.
+
+        Retorna:
+            tuple: (valor objetivo, se a solução é ótima).
+        """
+        rhs = self.constraints.rhs.copy()
+        for index, delta_b in changes.items():
+            rhs[index] += delta_b
+        outcome = self.backend.solve(self, rhs=rhs)
+
+        is_optimal = outcome["status"] == pulp.LpStatusOptimal
+        return (outcome["objetivo"] if is_optimal else 0), is_optimal
+
+    def sweep(self, parameter, start, stop):
+        """
+        Varre um parâmetro do modelo de `start` a `stop` e devolve a função
+        valor ótimo, que é linear por partes, com os pontos de quebra exatos.
+
+        Em cada trecho a base ótima é a mesma: o fim do trecho sai das faixas
+        da base (`rhs_ranges()` ou `cost_ranges()`), sem amostragem. A base do
+        trecho seguinte é obtida resolvendo logo além do ponto de quebra a partir
+        da base anterior (warm start nos backends que o suportam), em uma cópia
+        do modelo; o modelo original não é alterado.
+
+        Args:
+            parameter (tuple): ("rhs", restrição), com o índice ou o nome da
+                restrição, ou ("objective", índice da variável).
+            start, stop (float): Os extremos da varredura (em qualquer ordem).
+
+        Retorna:
+            dict: "segmentos" (lista de trechos, cada um com "inicio", "fim",
+            "valor_inicio", "valor_fim", "inclinacao", "valores_otimos_inicio",
+            "valores_otimos_fim", "precos_sombra" e "status"), "pontos_de_quebra"
+            e o número de "resolucoes". Trechos sem solução ótima ficam com o
+            status correspondente e sem valores: o último, quando o modelo deixa
+            de ter solução ótima, e o primeiro, quando um RHS só fica viável
+            depois de `start` (o ponto em que isso ocorre vem de um modelo auxiliar).
+        """
+        if self.is_mip:
+            raise ValueError("A varredura exige um modelo sem variáveis inteiras.")
+        kind, key = parameter
+        if kind == "rhs":
+            index = self.constraints.index(key)
+        elif kind == "objective":
+            index = int(key)
+            if not 0 <= index < self.num_variables:
+                raise IndexError(f"Variável inexistente: {key}")
+        else:
+            raise ValueError(f"Parâmetro desconhecido: {kind}")
+
+        chain = Optimizer.from_bytes(self.to_bytes())
+        chain.singleton_bounds = self.singleton_bounds
+        set_parameter = chain.update_rhs if kind == "rhs" else chain.update_objective_coeff
+        direction = 1.0 if stop >= start else -1.0
+
+        def solve_at(value):
+            set_parameter(index, value)
+            chain.solve()
+            return chain.status == pulp.LpStatusOptimal
+
+        def solve_past(point, verify=True):
+            """
+            Resolve logo além de `point`, diminuindo o passo se o trecho seguinte
+            for mais curto que ele (`verify`). Retorna (se há solução ótima, ponto
+            resolvido, número de resoluções).
+            """
+            step = SWEEP_STEP * (1 + abs(point))
+            for attempt in range(1, SWEEP_RETRIES + 1):
+                anchor = point + direction * step
+                if not solve_at(anchor):
+                    # Os valores com solução ótima formam um intervalo: a varredura acaba
+                    return False, anchor, attempt
+                if not verify:
+                    return True, anchor, attempt
+                ranges = chain.rhs_ranges() if kind == "rhs" else chain.cost_ranges()
+                back = ranges["diminuicao"][index] if direction > 0 else ranges["aumento"][index]
+                if step <= back + sensitivity.TOLERANCE * (1 + abs(point)):
+                    return True, anchor, attempt
+                step /= 16
+            # Erro numérico na faixa: segue do passo original para garantir o avanço
+            anchor = point + direction * SWEEP_STEP * (1 + abs(point))
+            return solve_at(anchor), anchor, SWEEP_RETRIES + 1
+
+        segments = []
+        solves = 1
+        position = anchor = float(start)
+        optimal = solve_at(anchor)
+        if not optimal and kind == "rhs" and chain.status == pulp.LpStatusInfeasible:
+            # Inviável no início: o modelo pode passar a ser viável mais adiante
+            first = self._first_feasible_rhs(index, start, stop)
+            solves += 1
+            if first is not None:
+                segments.append(self._sweep_gap(position, first, chain.status))
+                position = first
+                optimal, anchor, attempts = solve_past(first, verify=False)
+                solves += attempts
+        while optimal:
+            basis = chain._optimal_basis()
+            if basis is None:
+                raise ValueError("A varredura exige a base ótima, indisponível para um modelo deste tamanho "
+                                 f"com o backend '{self.backend.name}'.")
+            ranges = chain.rhs_ranges() if kind == "rhs" else chain.cost_ranges()
+            room = ranges["aumento"][index] if direction > 0 else ranges["diminuicao"][index]
+            end = anchor + direction * room
+            end = min(end, stop) if direction > 0 else max(end, stop)
+
+            x = chain._solution["x"]
+            if kind == "rhs":
+                # Na mesma base, as básicas variam com a coluna da inversa
+                moves = np.zeros(self.num_variables + len(chain.constraints))
+                moves[basis["colunas"]] = sensitivity.inverse_columns(basis["fator"], [index],
+                                                                      len(chain.constraints))[:, 0]
+                slope, moves = basis["precos_sombra"][index], moves[:self.num_variables]
+            else:
+                slope, moves = x[index], np.zeros(self.num_variables)
+            value = chain._solution["objetivo"]
+            if direction * (end - position) > sensitivity.TOLERANCE * (1 + abs(position)):
+                segments.append({
+                    "inicio": position,
+                    "fim": end,
+                    "valor_inicio": value + slope * (position - anchor),
+                    "valor_fim": value + slope * (end - anchor),
+                    "inclinacao": slope,
+                    "valores_otimos_inicio": (x + moves * (position - anchor)).tolist(),
+                    "valores_otimos_fim": (x + moves * (end - anchor)).tolist(),
+                    "precos_sombra": basis["precos_sombra"].tolist(),
+                    "status": pulp.LpStatusOptimal,
+                })
+            position = end
+            if end == stop:
+                break
+            optimal, anchor, attempts = solve_past(end)
+            solves += attempts
+
+        if position != stop:
+            segments.append(self._sweep_gap(position, stop, chain.status))
+        return {
+            "segmentos": segments,
+            "pontos_de_quebra": [segment["fim"] for segment in segments[:-1]],
+            "resolucoes": solves,
+        }
+
+    @staticmethod
+    def _sweep_gap(start, stop, status):
+        """Trecho de `sweep` sem solução ótima."""
+        return {
+            "inicio": float(start), "fim": float(stop), "valor_inicio": None, "valor_fim": None,
+            "inclinacao": None, "valores_otimos_inicio": None, "valores_otimos_fim": None,
+            "precos_sombra": None, "status": status,
+        }
+
+    def _first_feasible_rhs(self, index, start, stop):
+        """
+        Encontra o primeiro valor do RHS de uma restrição, de `start` para `stop`,
+        com o qual o modelo é viável. O RHS vira uma variável t do modelo
+        (a_i x - t compara com 0) e t é minimizado na direção da varredura.
+
+        Retorna:
+            float: O valor encontrado, ou None se o modelo for inviável em todo o intervalo.
+        """
+        n = self.num_variables
+        indptr, indices, data = self.constraints.csr()
+        end = indptr[index + 1]
+        indptr = indptr.copy()
+        indptr[index + 1:] += 1
+        rhs = self.constraints.rhs.copy()
+        rhs[index] = 0.0
+        direction = 1.0 if stop >= start else -1.0
+        auxiliary = Optimizer._from_model_arrays({
+            "sense": pulp.LpMinimize,
+            "c": np.append(np.zeros(n), direction),
+            "csr": (indptr, np.insert(indices, end, n), np.insert(data, end, -1.0)),
+            "rhs": rhs,
+            "senses": [SENSE_SYMBOLS[int(code)] for code in self.constraints.senses],
+            "names": list(self.constraints.names),
+            "variable_names": None,
+            "lower": np.append(self.lower_bounds, min(start, stop)),
+            "upper": np.append(self.upper_bounds, max(start, stop)),
+        }, backend=self.backend.name if self.backend.name in BACKENDS else "cbc_cmd")
+        auxiliary.solve()
+        if auxiliary.status != pulp.LpStatusOptimal:
+            return None
+        return float(auxiliary._solution["x"][n])
+
+
+# Otimizador de cada processo de `analyze_deltas`, criado uma vez por processo
+_worker_optimizer = None
+
+
+def _init_worker(payload):
+    global _worker_optimizer
+    _worker_optimizer = Optimizer.from_bytes(payload)
+
+
+def _analyze_in_worker(changes):
+    return _worker_optimizer._analyze_scenario(changes)
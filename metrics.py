@@ -0,0 +1,105 @@
+"""
+Instrumentação de `Optimizer.solve`: tempo de relógio e de CPU por fase,
+tamanho do modelo, iterações do solver e pico de memória.
+
+O tempo de CPU soma o do processo e o dos processos filhos já encerrados,
+de modo que a fase em que o CBC roda em um subprocesso também é medida.
+"""
+import os
+import re
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Contagens de iterações no log do CBC: "... - N iterations" ao fim da relaxação
+# linear e "Total iterations: N" ao fim do branch and bound
+_CBC_ITERATIONS = re.compile(r"Total iterations:\s*(\d+)|(\d+) iterations")
+# Melhor limite dual no resumo do CBC: "Upper bound" na maximização, "Lower bound" na minimização
+_CBC_BOUND = re.compile(r"^(?:Lower|Upper) bound:\s*(\S+)", re.MULTILINE)
+
+
+def clock():
+    """Retorna (tempo de relógio, tempo de CPU do processo e dos filhos) neste instante."""
+    # O `os.times` tem resolução de um tique do relógio: só é usado para os filhos
+    times = os.times()
+    return time.perf_counter(), time.process_time() + times.children_user + times.children_system
+
+
+class PhaseTimer:
+    """
+    Acumula o tempo de relógio e de CPU de cada fase. Cada `lap` atribui a uma
+    fase o tempo decorrido desde a marca anterior.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._start = self._mark = clock()
+
+    def lap(self, name, breakdown=None):
+        """
+        Fecha a fase atual.
+        Args:
+            name (str): O nome da fase.
+            breakdown (dict, opcional): Fases já medidas dentro do intervalo
+                (ex: as informadas pelo backend). Elas são somadas como estão e
+                apenas o restante do intervalo fica em `name`.
+        """
+        now = clock()
+        wall, cpu = now[0] - self._mark[0], now[1] - self._mark[1]
+        for phase, measure in (breakdown or {}).items():
+            self._add(phase, measure["segundos"], measure["cpu_segundos"])
+            wall -= measure["segundos"]
+            cpu -= measure["cpu_segundos"]
+        self._add(name, max(wall, 0.0), max(cpu, 0.0))
+        self._mark = now
+
+    def _add(self, name, wall, cpu):
+        phase = self.phases.setdefault(name, {"segundos": 0.0, "cpu_segundos": 0.0})
+        phase["segundos"] += wall
+        phase["cpu_segundos"] += cpu
+
+    def total(self):
+        """Retorna (tempo de relógio, tempo de CPU) desde a criação até a última marca."""
+        return self._mark[0] - self._start[0], self._mark[1] - self._start[1]
+
+
+def peak_rss_mb():
+    """
+    Retorna o pico de memória residente do processo e dos processos filhos
+    (o CBC) até aqui, em MB, ou (None, None) onde o módulo `resource` não existe.
+    """
+    if resource is None:
+        return None, None
+    # O ru_maxrss é dado em KB no Linux e em bytes no macOS
+    scale = 2 ** 20 if sys.platform == "darwin" else 2 ** 10
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale)
+
+
+def cbc_iterations(log):
+    """
+    Extrai do log do CBC o número de iterações do simplex, ou None se ele não
+    aparecer. O total do branch and bound não inclui a relaxação quando ela já
+    termina o problema (ex: inviável), por isso vale a maior das contagens.
+    """
+    counts = [int(total or count) for total, count in _CBC_ITERATIONS.findall(log)]
+    return max(counts) if counts else None
+
+
+def cbc_best_bound(log):
+    """
+    Extrai do log do CBC o melhor limite dual de um modelo inteiro, no sentido
+    original da otimização, ou None se ele não aparecer (o CBC só o informa
+    quando a busca para antes de provar a otimalidade, ex: pelo gap ou pelo tempo).
+    """
+    match = _CBC_BOUND.search(log)
+    if match is None:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
@@ -0,0 +1,605 @@
+"""
+Leitura e escrita de modelos nos formatos MPS e LP (CPLEX).
+
+Os leitores percorrem o arquivo uma única vez, mapeado em memória, e acumulam
+os coeficientes diretamente em arrays compactos (`array.array`), sem criar
+objetos do PuLP. A memória de pico é, portanto, proporcional ao número de
+coeficientes não nulos. O resultado é um dicionário de arrays que o
+`Optimizer` carrega em bloco (ver `Optimizer.read_mps` e `Optimizer.read_lp`).
+
+Limitações: o termo constante da função objetivo é ignorado e variáveis
+semicontínuas não são suportadas. As variáveis inteiras ("inteiras") vêm dos
+marcadores INTORG/INTEND e dos limites UI, LI e BV do MPS e das seções
+General e Binary do LP; `write_mps` as grava entre marcadores.
+"""
+import mmap
+import re
+import time
+from array import array
+
+import numpy as np
+import pulp
+
+from constraint_store import SENSE_SYMBOLS
+
+MPS_SECTIONS = {b"NAME", b"OBJSENSE", b"ROWS", b"COLUMNS", b"RHS", b"RANGES",
+                b"BOUNDS", b"ENDATA"}
+MPS_ROW_TYPES = {b"L": "<=", b"G": ">=", b"E": "=="}
+# Linhas gravadas por vez em `write_mps`
+WRITE_CHUNK = 65536
+
+
+def _open_lines(path):
+    """
+    Itera sobre as linhas do arquivo (em bytes) usando mmap quando possível.
+    Retorna:
+        tuple: (iterador de linhas, tamanho em bytes, função para fechar o arquivo).
+    """
+    file = open(path, "rb")
+    try:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Arquivos vazios não podem ser mapeados
+        file.close()
+        return iter(()), 0, lambda: None
+
+    def close():
+        mapped.close()
+        file.close()
+
+    return iter(mapped.readline, b""), mapped.size(), close
+
+
+def _stats(num_bytes, num_lines, nnz, start):
+    """Estatísticas de vazão da leitura."""
+    seconds = time.perf_counter() - start
+    return {
+        "bytes": num_bytes,
+        "linhas": num_lines,
+        "nnz": nnz,
+        "segundos": seconds,
+        "mb_por_segundo": num_bytes / 1e6 / seconds if seconds > 0 else float("inf"),
+    }
+
+
+def _coo_to_csr(rows, cols, values, num_rows):
+    """Ordena as entradas (linha, coluna, valor) por linha e monta o CSR, somando duplicatas."""
+    rows = np.frombuffer(rows, dtype=np.int32)
+    cols = np.frombuffer(cols, dtype=np.int32)
+    values = np.frombuffer(values, dtype=float)
+    order = np.lexsort((cols, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    if rows.size:
+        first = np.ones(rows.size, dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        if not first.all():
+            starts = np.flatnonzero(first)
+            values = np.add.reduceat(values, starts)
+            rows, cols = rows[starts], cols[starts]
+        keep = values != 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return indptr, cols.astype(np.int64), values
+
+
+def _apply_ranges(model, ranges):
+    """
+    Converte as faixas (seção RANGES) em um segundo limite: a restrição original
+    fica com um dos lados e uma cópia dela, com sufixo "_faixa", recebe o outro.
+    """
+    if not ranges:
+        return
+    indptr, indices, data = model["csr"]
+    rhs, senses, names = model["rhs"], model["senses"], model["names"]
+    new_rows = []
+    for i, value in ranges.items():
+        if senses[i] == "==":
+            low, high = (rhs[i], rhs[i] + value) if value >= 0 else (rhs[i] + value, rhs[i])
+            rhs[i], senses[i] = low, ">="
+            new_rows.append((i, high, "<="))
+        elif senses[i] == "<=":
+            new_rows.append((i, rhs[i] - abs(value), ">="))
+        else:
+            new_rows.append((i, rhs[i] + abs(value), "<="))
+
+    pieces = [indices[indptr[i]:indptr[i + 1]] for i, _, _ in new_rows]
+    lengths = np.array([piece.size for piece in pieces], dtype=np.int64)
+    model["csr"] = (
+        np.concatenate([indptr, indptr[-1] + np.cumsum(lengths)]),
+        np.concatenate([indices] + pieces),
+        np.concatenate([data] + [data[indptr[i]:indptr[i + 1]] for i, _, _ in new_rows]),
+    )
+    model["rhs"] = np.concatenate([rhs, [bound for _, bound, _ in new_rows]])
+    senses.extend(sense for _, _, sense in new_rows)
+    names.extend(f"{names[i]}_faixa" for i, _, _ in new_rows)
+
+
+def _set_bound(kind, value, j, lower, upper, integer, has_lower):
+    """
+    Aplica uma linha da seção BOUNDS do MPS à coluna j. `has_lower` marca as
+    colunas com limite inferior explícito: pela convenção do MPS, um UP
+    negativo sem limite inferior explícito torna o inferior -infinito.
+    """
+    if kind in (b"UP", b"UI"):
+        if value < 0 and not has_lower[j]:
+            lower[j] = -np.inf
+        upper[j] = value
+    elif kind in (b"LO", b"LI"):
+        lower[j] = value
+    elif kind == b"FX":
+        lower[j] = upper[j] = value
+    elif kind == b"FR":
+        lower[j], upper[j] = -np.inf, np.inf
+    elif kind == b"MI":
+        lower[j] = -np.inf
+    elif kind == b"PL":
+        upper[j] = np.inf
+    elif kind == b"BV":
+        lower[j], upper[j] = 0.0, 1.0
+    else:
+        raise ValueError(f"Tipo de limite não suportado: {kind.decode()}")
+    if kind in (b"LO", b"LI", b"FX", b"FR", b"MI", b"BV"):
+        has_lower[j] = True
+    if kind in (b"UI", b"LI", b"BV"):
+        integer[j] = True
+
+
+def read_mps(path):
+    """
+    Lê um arquivo MPS (formato livre ou fixo sem espaços nos nomes).
+    Args:
+        path (str): Caminho do arquivo.
+    Retorna:
+        dict: "sense", "c", "csr" (indptr, indices, data), "rhs", "senses",
+        "names", "variable_names", "lower", "upper", "inteiras" e "estatisticas".
+    """
+    start = time.perf_counter()
+    lines, num_bytes, close = _open_lines(path)
+    sense = pulp.LpMinimize
+    objective_row = None
+    row_index, row_senses, row_names = {}, [], []
+    col_index, col_names = {}, []
+    rows, cols, values = array("i"), array("i"), array("d")
+    objective = {}
+    rhs_entries, ranges, bounds = {}, {}, []
+    integer_columns = set()
+    in_integer_block = False
+    current_column = None
+    section = None
+    num_lines = 0
+    try:
+        for line in lines:
+            num_lines += 1
+            if line[:1] == b"*" or not line.strip():
+                if line.startswith(b"*SENSE:"):
+                    # Convenção do PuLP: o sentido vai em um comentário
+                    sense = pulp.LpMaximize if line[7:].strip().lower().startswith(b"max") else sense
+                continue
+            if line[:1] not in (b" ", b"\t"):
+                tokens = line.split()
+                keyword = tokens[0].upper()
+                if keyword not in MPS_SECTIONS:
+                    raise ValueError(f"Seção MPS desconhecida na linha {num_lines}: {keyword.decode()}")
+                section = keyword
+                if keyword == b"OBJSENSE" and len(tokens) > 1:
+                    sense = pulp.LpMaximize if tokens[1].upper().startswith(b"MAX") else pulp.LpMinimize
+                if keyword == b"ENDATA":
+                    break
+                continue
+
+            tokens = line.split()
+            if section == b"COLUMNS":
+                if len(tokens) >= 3 and tokens[1] == b"'MARKER'":
+                    in_integer_block = tokens[2] == b"'INTORG'"
+                    current_column = None
+                    continue
+                name = tokens[0]
+                if name != current_column:
+                    # As entradas de uma coluna costumam vir juntas: uma busca por coluna
+                    current_column = name
+                    j = col_index.get(name)
+                    if j is None:
+                        j = col_index[name] = len(col_names)
+                        col_names.append(name)
+                    if in_integer_block:
+                        integer_columns.add(j)
+                for k in range(1, len(tokens) - 1, 2):
+                    row, value = tokens[k], float(tokens[k + 1])
+                    if row == objective_row:
+                        objective[j] = objective.get(j, 0.0) + value
+                        continue
+                    i = row_index.get(row)
+                    if i is None:
+                        raise ValueError(f"Linha inexistente na linha {num_lines}: {row.decode()}")
+                    if i < 0:
+                        continue  # Outras linhas N (objetivos livres) são ignoradas
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(value)
+            elif section == b"ROWS":
+                kind, name = tokens[0].upper(), tokens[1]
+                if kind == b"N":
+                    if objective_row is None:
+                        objective_row = name
+                    else:
+                        row_index[name] = -1
+                    continue
+                if kind not in MPS_ROW_TYPES:
+                    raise ValueError(f"Tipo de linha inválido na linha {num_lines}: {kind.decode()}")
+                row_index[name] = len(row_names)
+                row_names.append(name)
+                row_senses.append(MPS_ROW_TYPES[kind])
+            elif section in (b"RHS", b"RANGES"):
+                target = rhs_entries if section == b"RHS" else ranges
+                for k in range(len(tokens) % 2, len(tokens) - 1, 2):
+                    i = row_index.get(tokens[k], -1)
+                    if i >= 0:
+                        target[i] = float(tokens[k + 1])
+            elif section == b"BOUNDS":
+                kind = tokens[0].upper()
+                has_value = kind not in (b"FR", b"MI", b"PL", b"BV") or len(tokens) == 4
+                column = tokens[-2] if has_value else tokens[-1]
+                bounds.append((kind, col_index[column], float(tokens[-1]) if has_value else 0.0))
+            elif section == b"OBJSENSE":
+                sense = pulp.LpMaximize if tokens[0].upper().startswith(b"MAX") else pulp.LpMinimize
+    except KeyError as error:
+        raise ValueError(f"Coluna inexistente na linha {num_lines}: {error.args[0].decode()}") from None
+    finally:
+        close()
+
+    n = len(col_names)
+    lower, upper = np.zeros(n), np.full(n, np.inf)
+    integer = np.zeros(n, dtype=bool)
+    integer[list(integer_columns)] = True
+    has_lower = np.zeros(n, dtype=bool)
+    for kind, j, value in bounds:
+        _set_bound(kind, value, j, lower, upper, integer, has_lower)
+    c = np.zeros(n)
+    c[list(objective)] = list(objective.values())
+    rhs = np.zeros(len(row_names))
+    rhs[list(rhs_entries)] = list(rhs_entries.values())
+
+    model = {
+        "sense": sense,
+        "c": c,
+        "csr": _coo_to_csr(rows, cols, values, len(row_names)),
+        "rhs": rhs,
+        "senses": row_senses,
+        "names": [name.decode() for name in row_names],
+        "variable_names": [name.decode() for name in col_names],
+        "lower": lower,
+        "upper": upper,
+        "inteiras": integer,
+    }
+    del rows, cols, values
+    _apply_ranges(model, ranges)
+    model["estatisticas"] = _stats(num_bytes, num_lines, int(model["csr"][0][-1]), start)
+    return model
+
+
+# Tokens do formato LP: operadores, sinais, números, nomes e ':' (rótulos)
+LP_TOKEN = re.compile(
+    rb"\s*(?:([<>=]=?|=[<>])|([+-])|((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    rb"|([A-Za-z_!\"#$%&()/,;?@`'{}|~][\w!\"#$%&()/,.;?@`'{}|~\[\]^]*)|(:))")
+LP_SECTIONS = {
+    b"maximize": "max", b"maximise": "max", b"maximum": "max", b"max": "max",
+    b"minimize": "min", b"minimise": "min", b"minimum": "min", b"min": "min",
+    b"subject to": "st", b"such that": "st", b"st": "st", b"s.t.": "st", b"st.": "st",
+    b"bounds": "bounds", b"bound": "bounds",
+    b"general": "int", b"generals": "int", b"gen": "int", b"integer": "int", b"integers": "int",
+    b"binary": "bin", b"binaries": "bin", b"bin": "bin",
+    b"end": "end",
+}
+LP_OPERATORS = {b"<": "<=", b"<=": "<=", b"=<": "<=", b">": ">=", b">=": ">=", b"=>": ">=", b"=": "=="}
+LP_INFINITY = {b"inf", b"infinity"}
+
+
+def _lp_tokens(line, line_number):
+    """Divide uma linha do formato LP em tokens (tipo, valor)."""
+    position, end = 0, len(line)
+    while position < end:
+        match = LP_TOKEN.match(line, position)
+        if match is None:
+            if line[position:].strip():
+                raise ValueError(f"Token inválido na linha {line_number}: {line[position:].strip().decode()}")
+            return
+        position = match.end()
+        kind = match.lastindex
+        token = match.group(kind)
+        if kind == 4 and token.lower() in LP_INFINITY:
+            yield 3, np.inf
+        elif kind == 3:
+            yield 3, float(token)
+        else:
+            yield kind, token
+
+
+class _LpStatement:
+    """
+    Acumula os tokens de uma expressão do formato LP (F.O., restrição ou limite).
+    Cada termo e cada número guardam o "lado" em que aparecem, isto é, quantos
+    operadores relacionais vieram antes deles.
+    """
+
+    def __init__(self):
+        self.label = None
+        self.terms = []
+        self.numbers = []
+        self.operators = []
+        self._sign = 1.0
+        self._coefficient = None
+
+    def feed(self, kind, token):
+        if kind == 5:
+            # "nome:" é o rótulo da expressão, não uma variável
+            self.label = self.terms.pop()[0]
+        elif kind == 2:
+            if token == b"-":
+                self._sign = -self._sign
+        elif kind == 3:
+            self._coefficient = token if self._coefficient is None else self._coefficient * token
+        elif kind == 4:
+            value = self._sign * (1.0 if self._coefficient is None else self._coefficient)
+            self.terms.append((token, value, len(self.operators)))
+            self._sign, self._coefficient = 1.0, None
+        else:
+            self.end_number()
+            self.operators.append(LP_OPERATORS[token])
+
+    def end_number(self):
+        """Registra o número pendente (sem variável) como constante."""
+        if self._coefficient is not None:
+            self.numbers.append((self._sign * self._coefficient, len(self.operators)))
+            self._sign, self._coefficient = 1.0, None
+        return self
+
+
+def _lp_flip(operator):
+    return {"<=": ">=", ">=": "<=", "==": "=="}[operator]
+
+
+def _lp_bounds(statement):
+    """
+    Interpreta uma linha da seção Bounds ("x <= 4", "-3 <= x", "0 <= x <= 1", "x = 2").
+    Retorna:
+        tuple: (nome da variável, lista de (operador, valor) aplicados à variável).
+    """
+    if len(statement.terms) != 1:
+        raise ValueError("Cada limite deve envolver exatamente uma variável.")
+    name, coefficient, side = statement.terms[0]
+    limits = []
+    for number, number_side in statement.numbers:
+        if number_side <= side:
+            operator = _lp_flip(statement.operators[number_side])
+        else:
+            operator = statement.operators[number_side - 1]
+        if coefficient < 0:
+            operator = _lp_flip(operator)
+        limits.append((operator, number / coefficient))
+    return name, limits
+
+
+def read_lp(path):
+    """
+    Lê um arquivo no formato LP do CPLEX (o mesmo gravado por `pulp.LpProblem.writeLP`).
+    Cada restrição termina no número do lado direito e pode ocupar várias linhas.
+    Args:
+        path (str): Caminho do arquivo.
+    Retorna:
+        dict: Os mesmos campos de `read_mps`.
+    """
+    start = time.perf_counter()
+    lines, num_bytes, close = _open_lines(path)
+    sense = pulp.LpMinimize
+    col_index, col_names = {}, []
+    indptr, indices, data = array("q", [0]), array("i"), array("d")
+    rhs, senses, names = array("d"), [], []
+    objective = {}
+    bounds, integer_names, binary_names = [], [], []
+    section = None
+    statement = _LpStatement()
+    num_lines = 0
+
+    def column(name):
+        j = col_index.get(name)
+        if j is None:
+            j = col_index[name] = len(col_names)
+            col_names.append(name)
+        return j
+
+    def close_constraint():
+        if len(statement.operators) != 1:
+            raise ValueError(f"Restrição inválida ou com faixa perto da linha {num_lines}")
+        row = {}
+        for name, value, _ in statement.terms:
+            j = column(name)
+            row[j] = row.get(j, 0.0) + value
+        constant = sum(value for value, side in statement.numbers if side == 0)
+        bound = sum(value for value, side in statement.numbers if side == 1)
+        row = sorted((j, value) for j, value in row.items() if value != 0)
+        indices.extend(j for j, _ in row)
+        data.extend(value for _, value in row)
+        indptr.append(len(indices))
+        rhs.append(bound - constant)
+        senses.append(statement.operators[0])
+        names.append(statement.label.decode() if statement.label else f"R{len(names) + 1}")
+
+    def close_section():
+        if section == "obj":
+            for name, value, _ in statement.terms:
+                j = column(name)
+                objective[j] = objective.get(j, 0.0) + value
+        elif section == "st" and (statement.terms or statement.operators):
+            raise ValueError(f"Restrição incompleta perto da linha {num_lines}")
+
+    try:
+        for raw in lines:
+            num_lines += 1
+            line = raw.split(b"\\", 1)[0]
+            stripped = line.strip()
+            if not stripped:
+                continue
+            keyword = LP_SECTIONS.get(b" ".join(stripped.lower().rstrip(b":").split()))
+            if keyword is not None:
+                close_section()
+                statement = _LpStatement()
+                section = keyword
+                if keyword in ("max", "min"):
+                    sense = pulp.LpMaximize if keyword == "max" else pulp.LpMinimize
+                    section = "obj"
+                if keyword == "end":
+                    break
+                continue
+
+            if section in ("int", "bin"):
+                (integer_names if section == "int" else binary_names).extend(stripped.split())
+            elif section == "bounds":
+                words = stripped.split()
+                if len(words) == 2 and words[1].lower() == b"free":
+                    bounds.append((words[0], [(">=", -np.inf), ("<=", np.inf)]))
+                    continue
+                statement = _LpStatement()
+                for kind, token in _lp_tokens(line, num_lines):
+                    statement.feed(kind, token)
+                bounds.append(_lp_bounds(statement.end_number()))
+            elif section in ("obj", "st"):
+                for kind, token in _lp_tokens(line, num_lines):
+                    statement.feed(kind, token)
+                    if section == "st" and kind == 3 and statement.operators:
+                        # O número após o operador é o lado direito: a restrição termina aqui
+                        statement.end_number()
+                        close_constraint()
+                        statement = _LpStatement()
+            else:
+                raise ValueError(f"Conteúdo fora de uma seção na linha {num_lines}")
+        else:
+            close_section()
+    finally:
+        close()
+
+    bound_columns = [(column(name), limits) for name, limits in bounds]
+    integer = [column(name) for name in integer_names]
+    binary = [column(name) for name in binary_names]
+    n = len(col_names)
+    lower, upper = np.zeros(n), np.full(n, np.inf)
+    for j, limits in bound_columns:
+        for operator, value in limits:
+            if operator in ("<=", "=="):
+                upper[j] = value
+            if operator in (">=", "=="):
+                lower[j] = value
+    integer_mask = np.zeros(n, dtype=bool)
+    integer_mask[integer + binary] = True
+    lower[binary] = np.maximum(lower[binary], 0.0)
+    upper[binary] = np.minimum(upper[binary], 1.0)
+
+    c = np.zeros(n)
+    c[list(objective)] = list(objective.values())
+    model = {
+        "sense": sense,
+        "c": c,
+        "csr": (np.frombuffer(indptr, dtype=np.int64),
+                np.frombuffer(indices, dtype=np.int32).astype(np.int64),
+                np.frombuffer(data, dtype=float)),
+        "rhs": np.frombuffer(rhs, dtype=float),
+        "senses": senses,
+        "names": names,
+        "variable_names": [name.decode() for name in col_names],
+        "lower": lower,
+        "upper": upper,
+        "inteiras": integer_mask,
+    }
+    model["estatisticas"] = _stats(num_bytes, num_lines, len(data), start)
+    return model
+
+
+def _format(values):
+    """Formata números com a representação mais curta que preserva o valor."""
+    return [repr(float(value)) for value in values]
+
+
+def write_mps(optimizer, path):
+    """
+    Grava o modelo no formato MPS livre, percorrendo as colunas em blocos.
+    Args:
+        optimizer (Optimizer): O modelo a gravar.
+        path (str): Caminho do arquivo.
+    """
+    n = optimizer.num_variables
+    store = optimizer.constraints
+    indptr, indices, data = store.csr()
+    row_names = list(store.names)
+    col_names = getattr(optimizer, "variable_names", None) or [f"x{j + 1}" for j in range(n)]
+    kinds = {"<=": "L", ">=": "G", "==": "E"}
+    # A linha da função objetivo não pode ter o nome de uma restrição
+    objective_name, suffix, taken = "OBJ", 0, set(row_names)
+    while objective_name in taken:
+        suffix += 1
+        objective_name = f"OBJ_{suffix}"
+
+    # Reordena as entradas por coluna (CSC)
+    rows = np.repeat(np.arange(len(store), dtype=np.int64), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    col_rows, col_values = rows[order], data[order]
+    col_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n), out=col_ptr[1:])
+
+    with open(path, "w", encoding="ascii") as file:
+        file.write("NAME Problema_Otimizacao\n")
+        if optimizer.sense == pulp.LpMaximize:
+            file.write("OBJSENSE\n    MAX\n")
+        file.write(f"ROWS\n N  {objective_name}\n")
+        file.writelines(f" {kinds[SENSE_SYMBOLS[int(code)]]}  {name}\n"
+                        for code, name in zip(store.senses.tolist(), row_names))
+
+        file.write("COLUMNS\n")
+        buffer = []
+        integer = optimizer.integer
+        in_integer_block = False
+        for j in range(n):
+            name = col_names[j]
+            start, end = col_ptr[j], col_ptr[j + 1]
+            if integer[j] != in_integer_block:
+                in_integer_block = bool(integer[j])
+                marker = "INTORG" if in_integer_block else "INTEND"
+                buffer.append(f"    MARKER  'MARKER'  '{marker}'\n")
+            if optimizer.coef_fo[j] != 0 or start == end:
+                # Colunas vazias aparecem com coeficiente zero para não sumirem do modelo
+                buffer.append(f"    {name}  {objective_name}  {float(optimizer.coef_fo[j])!r}\n")
+            buffer.extend(f"    {name}  {row_names[i]}  {value}\n"
+                          for i, value in zip(col_rows[start:end].tolist(), _format(col_values[start:end])))
+            if len(buffer) >= WRITE_CHUNK:
+                file.writelines(buffer)
+                buffer.clear()
+        if in_integer_block:
+            buffer.append("    MARKER  'MARKER'  'INTEND'\n")
+        file.writelines(buffer)
+
+        file.write("RHS\n")
+        file.writelines(f"    RHS  {row_names[i]}  {value}\n"
+                        for i, value in zip(np.flatnonzero(store.rhs).tolist(),
+                                            _format(store.rhs[store.rhs != 0])))
+
+        file.write("BOUNDS\n")
+        lower, upper = optimizer.lower_bounds, optimizer.upper_bounds
+        # As inteiras sempre têm limites explícitos: alguns leitores tratam uma
+        # coluna inteira sem limites como binária
+        for j in np.flatnonzero((lower != 0) | np.isfinite(upper) | integer).tolist():
+            name, low, high = col_names[j], lower[j], upper[j]
+            if low == high:
+                file.write(f" FX BND  {name}  {float(low)!r}\n")
+                continue
+            if np.isinf(low) and np.isinf(high):
+                file.write(f" FR BND  {name}\n")
+                continue
+            if np.isinf(low):
+                file.write(f" MI BND  {name}\n")
+            elif low != 0 or high < 0 or integer[j]:
+                # Sem o LO 0, um UP negativo seria lido com limite inferior -infinito
+                file.write(f" LO BND  {name}  {float(low)!r}\n")
+            if np.isfinite(high):
+                file.write(f" UP BND  {name}  {float(high)!r}\n")
+            elif integer[j]:
+                file.write(f" PL BND  {name}\n")
+        file.write("ENDATA\n")
@@ -0,0 +1,117 @@
+"""
+Representação do modelo como tabelas (modo de grade do app).
+
+O modelo fica em dois DataFrames: a função objetivo (uma linha, uma coluna por
+variável) e as restrições (uma linha por restrição, uma coluna por variável e
+as colunas "Operador" e "LD"). Os arquivos importados usam o mesmo formato,
+com a função objetivo na primeira linha.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+SENSE_COLUMN = "Operador"
+RHS_COLUMN = "LD"
+SENSE_OPTIONS = ["<=", ">=", "=="]
+
+
+def empty_tables(num_variables, num_constraints=0, variable_names=None):
+    """
+    Cria as tabelas da função objetivo e das restrições preenchidas com zeros.
+    Args:
+        num_variables (int): O número de variáveis.
+        num_constraints (int): O número de restrições.
+        variable_names (list, opcional): Nomes das variáveis. Padrão: x1, x2, ...
+    Retorna:
+        tuple: (objetivo, restricoes), dois DataFrames.
+    """
+    if variable_names is None:
+        variable_names = [f"x{j + 1}" for j in range(num_variables)]
+    objective = pd.DataFrame(np.zeros((1, num_variables)), columns=variable_names, index=["FO"])
+    constraints = pd.DataFrame(np.zeros((num_constraints, num_variables)), columns=variable_names)
+    constraints[SENSE_COLUMN] = pd.Series(["<="] * num_constraints, dtype=object)
+    constraints[RHS_COLUMN] = 0.0
+    return objective, constraints
+
+
+def resize_tables(objective, constraints, num_variables):
+    """
+    Ajusta o número de colunas de variáveis, mantendo os valores existentes
+    (as novas variáveis recebem coeficiente zero).
+    Retorna:
+        tuple: (objetivo, restricoes) redimensionados.
+    """
+    names = list(objective.columns[:num_variables])
+    names += [f"x{j + 1}" for j in range(len(names), num_variables)]
+    objective = objective.reindex(columns=names, fill_value=0.0)
+    constraints = constraints.reindex(columns=names + [SENSE_COLUMN, RHS_COLUMN], fill_value=0.0)
+    return objective, constraints
+
+
+def split_table(table):
+    """
+    Separa uma tabela única (função objetivo na primeira linha) nas tabelas
+    da função objetivo e das restrições. Os nomes das colunas "Operador" e "LD"
+    não diferenciam maiúsculas de minúsculas.
+    Retorna:
+        tuple: (objetivo, restricoes).
+    """
+    renames = {}
+    for column in table.columns:
+        for expected in (SENSE_COLUMN, RHS_COLUMN):
+            if str(column).strip().lower() == expected.lower():
+                renames[column] = expected
+    table = table.rename(columns=renames)
+    missing = [column for column in (SENSE_COLUMN, RHS_COLUMN) if column not in table.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes: {', '.join(missing)}")
+    if len(table) == 0:
+        raise ValueError("A tabela deve ter ao menos a linha da função objetivo.")
+
+    variables = [str(column) for column in table.columns if column not in (SENSE_COLUMN, RHS_COLUMN)]
+    table = table.rename(columns={column: str(column) for column in table.columns})
+    values = table[variables].apply(pd.to_numeric, errors="coerce").fillna(0.0).astype(float)
+    objective = values.iloc[:1].set_axis(["FO"])
+    constraints = values.iloc[1:].reset_index(drop=True)
+    constraints[SENSE_COLUMN] = table[SENSE_COLUMN].iloc[1:].fillna("<=").astype(str).str.strip().to_numpy()
+    constraints[RHS_COLUMN] = pd.to_numeric(table[RHS_COLUMN].iloc[1:], errors="coerce").to_numpy()
+    return objective, constraints
+
+
+def read_table(file, filename=None):
+    """
+    Lê um modelo de um arquivo CSV ou Parquet (função objetivo na primeira linha).
+    Args:
+        file: Caminho ou objeto de arquivo (por exemplo, o retorno de st.file_uploader).
+        filename (str, opcional): Nome usado para identificar o formato.
+    Retorna:
+        tuple: (objetivo, restricoes).
+    """
+    filename = filename or getattr(file, "name", None) or str(file)
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".parquet":
+        table = pd.read_parquet(file)
+    elif extension == ".csv":
+        table = pd.read_csv(file)
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {extension or filename}")
+    return split_table(table)
+
+
+def model_arrays(objective, constraints):
+    """
+    Converte as tabelas nos arrays do caminho em lote (`Optimizer.from_arrays`).
+    Células vazias valem zero; operadores vazios valem '<='.
+    Retorna:
+        tuple: (c, A, b, senses).
+    """
+    variables = list(objective.columns)
+    c = objective.to_numpy(dtype=float, na_value=0.0).ravel()
+    A = constraints[variables].to_numpy(dtype=float, na_value=0.0)
+    b = constraints[RHS_COLUMN].to_numpy(dtype=float, na_value=0.0)
+    senses = constraints[SENSE_COLUMN].fillna("<=").replace("", "<=").tolist()
+    invalid = sorted(set(senses) - set(SENSE_OPTIONS))
+    if invalid:
+        raise ValueError(f"Operador inválido: {invalid[0]}")
+    return c, A, b, senses
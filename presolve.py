@@ -0,0 +1,354 @@
+"""
+Presolve: reduções aplicadas ao modelo antes de chamar o solver.
+
+As reduções são repetidas até não haver mais mudanças:
+    - linhas com uma única variável: viram limites da variável;
+    - colunas fixas (limite inferior = superior): o valor vai para o RHS;
+    - colunas vazias: fixadas no limite que melhora a F.O.;
+    - linhas vazias: removidas (ou o modelo é inviável);
+    - linhas redundantes: a atividade mínima/máxima, dada pelos limites das
+      variáveis, já satisfaz a restrição;
+    - linhas paralelas (inclusive duplicadas): a · x ≤ b e λa · x ≤ b' definem
+      o mesmo hiperplano; fica apenas a mais apertada de cada lado.
+
+As linhas removidas são implicadas pelas que ficam (ou pelos limites), então
+os preços sombra do modelo reduzido valem para o original (`postsolve`). O preço
+sombra de uma linha convertida em limite vem do custo reduzido da variável
+quando esse limite está ativo; as demais linhas removidas têm preço sombra zero.
+"""
+import time
+
+import numpy as np
+import pulp
+
+from constraint_store import SENSE_SYMBOLS
+
+TOLERANCE = 1e-9
+MAX_PASSES = 20
+# Reduções disponíveis, na ordem em que são aplicadas a cada passada
+REDUCTIONS = ("linhas_singleton", "colunas_fixas", "colunas_vazias", "linhas_vazias",
+              "linhas_redundantes", "linhas_paralelas")
+
+LE, GE, EQ = pulp.LpConstraintLE, pulp.LpConstraintGE, pulp.LpConstraintEQ
+
+
+def _activity_bounds(entry_rows, entry_values, entry_lower, entry_upper, num_rows):
+    """Atividade mínima e máxima de cada linha, dados os limites das variáveis."""
+    positive = entry_values > 0
+    low = np.where(positive, entry_values * entry_lower, entry_values * entry_upper)
+    high = np.where(positive, entry_values * entry_upper, entry_values * entry_lower)
+    minimum = np.bincount(entry_rows, weights=low, minlength=num_rows)
+    maximum = np.bincount(entry_rows, weights=high, minlength=num_rows)
+    return minimum, maximum
+
+
+def _parallel_groups(indptr, indices, data, entry_alive, rows):
+    """
+    Agrupa as linhas paralelas (coeficientes proporcionais).
+    Retorna:
+        list: Grupos com mais de uma linha, cada um como lista de (linha, λ),
+        em que λ é o fator que leva a linha à forma normalizada do grupo.
+    """
+    groups = {}
+    for i in rows.tolist():
+        start, end = indptr[i], indptr[i + 1]
+        alive = entry_alive[start:end]
+        columns = indices[start:end][alive]
+        values = data[start:end][alive]
+        order = np.argsort(columns, kind="stable")
+        columns, values = columns[order], values[order]
+        scale = values[0]
+        key = columns.astype(np.int64).tobytes() + np.round(values / scale, 12).tobytes()
+        groups.setdefault(key, []).append((i, scale))
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def _resolve_group(group, rhs, senses, tol):
+    """
+    Escolhe as linhas mantidas em um grupo de linhas paralelas.
+    Retorna:
+        tuple: (linhas removidas, inviável).
+    """
+    upper, lower = [], []
+    for i, scale in group:
+        bound = rhs[i] / scale
+        sense = senses[i]
+        if scale < 0 and sense != EQ:
+            sense = GE if sense == LE else LE
+        if sense in (LE, EQ):
+            upper.append((bound, sense != EQ, i))
+        if sense in (GE, EQ):
+            lower.append((-bound, sense != EQ, i))
+    # A mais apertada de cada lado (em empate, prefere igualdades e a primeira linha)
+    best_upper = min(upper) if upper else None
+    best_lower = min(lower) if lower else None
+    if best_upper and best_lower and -best_lower[0] > best_upper[0] + tol * max(1.0, abs(best_upper[0])):
+        return [], True
+    keep = {best[2] for best in (best_upper, best_lower) if best}
+    equalities = [i for bound, inequality, i in upper if not inequality]
+    if equalities:
+        keep = {equalities[0]}
+        value = rhs[equalities[0]] / dict(group)[equalities[0]]
+        for bound, _, _ in upper:
+            if bound < value - tol * max(1.0, abs(value)):
+                return [], True
+        for bound, _, _ in lower:
+            if -bound > value + tol * max(1.0, abs(value)):
+                return [], True
+    return [i for i, _ in group if i not in keep], False
+
+
+def has_singleton_rows(optimizer):
+    """Indica se alguma restrição tem um único coeficiente não nulo."""
+    return bool(np.any(np.diff(optimizer.constraints.csr()[0]) == 1))
+
+
+def presolve(optimizer, reductions=REDUCTIONS, tol=TOLERANCE):
+    """
+    Reduz o modelo do otimizador.
+    Args:
+        optimizer (Optimizer): O modelo original (não é alterado).
+        reductions (tuple): As reduções aplicadas (ver `REDUCTIONS`).
+    Retorna:
+        dict: "status" (None, pulp.LpStatusInfeasible ou "interrompido", quando
+        uma coluna vazia torna o modelo possivelmente ilimitado), "linhas" e
+        "colunas" mantidas, "fixos" (valores das colunas removidas), "limites"
+        e "origens" (linhas que definiram cada limite), "modelo" (os arrays do
+        modelo reduzido) e "relatorio".
+    """
+    start = time.perf_counter()
+    store = optimizer.constraints
+    indptr, indices, data = (np.asarray(array) for array in store.csr())
+    m, n = len(store), optimizer.num_variables
+    rhs = store.rhs.astype(float)
+    senses = store.senses.astype(np.int8)
+    lower = np.asarray(optimizer.lower_bounds, dtype=float).copy()
+    upper = np.asarray(optimizer.upper_bounds, dtype=float).copy()
+    # Custos no sentido de minimização
+    cost = np.asarray(optimizer.coef_fo, dtype=float) * (-1.0 if optimizer.sense == pulp.LpMaximize else 1.0)
+    entry_rows = np.repeat(np.arange(m), np.diff(indptr))
+
+    row_alive = np.ones(m, dtype=bool)
+    col_alive = np.ones(n, dtype=bool)
+    fixed = np.full(n, np.nan)
+    # Linha (e coeficiente) que definiu o limite inferior/superior de cada coluna (-1: limite original)
+    lower_source, upper_source = np.full(n, -1), np.full(n, -1)
+    source_coefficient = np.zeros((2, n))
+    source_order = np.full(n, -1)
+    events = 0
+    removed = dict.fromkeys(reductions, 0)
+    status = None
+
+    for _ in range(MAX_PASSES):
+        changed = False
+
+        # Linhas com uma só variável: viram limites (em empate, vence a linha)
+        if "linhas_singleton" in reductions:
+            entry_alive = row_alive[entry_rows] & col_alive[indices]
+            row_count = np.bincount(entry_rows[entry_alive], minlength=m)
+            single = entry_alive & (row_count[entry_rows] == 1)
+            for position in np.flatnonzero(single).tolist():
+                i, j, a = entry_rows[position], indices[position], data[position]
+                bound = rhs[i] / a
+                sense = senses[i]
+                if a < 0 and sense != EQ:
+                    sense = GE if sense == LE else LE
+                if sense != GE and (bound < upper[j] or (bound == upper[j] and upper_source[j] < 0)):
+                    upper[j], upper_source[j], source_coefficient[1, j] = bound, i, a
+                if sense != LE and (bound > lower[j] or (bound == lower[j] and lower_source[j] < 0)):
+                    lower[j], lower_source[j], source_coefficient[0, j] = bound, i, a
+                source_order[j] = events
+                events += 1
+            if single.any():
+                row_alive[entry_rows[single]] = False
+                removed["linhas_singleton"] += int(single.sum())
+                changed = True
+                gap = lower - upper
+                if (gap > tol * np.maximum(1.0, np.abs(upper))).any():
+                    status = pulp.LpStatusInfeasible
+                    break
+                # Diferenças de arredondamento: a variável fica fixa
+                lower = np.where(gap > 0, upper, lower)
+
+        # Colunas fixas: o valor passa para o RHS
+        newly_fixed = col_alive & (lower == upper)
+        if "colunas_fixas" in reductions and newly_fixed.any():
+            fixed[newly_fixed] = lower[newly_fixed]
+            hit = newly_fixed[indices]
+            rhs -= np.bincount(entry_rows[hit], weights=data[hit] * lower[indices[hit]], minlength=m)
+            col_alive &= ~newly_fixed
+            removed["colunas_fixas"] += int(newly_fixed.sum())
+            changed = True
+
+        entry_alive = row_alive[entry_rows] & col_alive[indices]
+
+        # Colunas vazias: o valor ótimo depende apenas do custo e dos limites
+        col_count = np.bincount(indices[entry_alive], minlength=n)
+        empty_cols = np.flatnonzero(col_alive & (col_count == 0))
+        if "colunas_vazias" in reductions and empty_cols.size:
+            c = cost[empty_cols]
+            value = np.where(c > 0, lower[empty_cols], np.where(c < 0, upper[empty_cols], np.nan))
+            # Custo zero: qualquer limite finito (ou zero, se a variável for livre)
+            neutral = np.where(np.isfinite(lower[empty_cols]), lower[empty_cols],
+                               np.where(np.isfinite(upper[empty_cols]), upper[empty_cols], 0.0))
+            value = np.where(np.isnan(value), neutral, value)
+            if not np.isfinite(value).all():
+                status = "interrompido"
+                break
+            fixed[empty_cols] = value
+            col_alive[empty_cols] = False
+            removed["colunas_vazias"] += empty_cols.size
+            changed = True
+
+        # Linhas vazias
+        row_count = np.bincount(entry_rows[entry_alive], minlength=m)
+        empty_rows = np.flatnonzero(row_alive & (row_count == 0))
+        if "linhas_vazias" in reductions and empty_rows.size:
+            b = rhs[empty_rows]
+            slack = tol * np.maximum(1.0, np.abs(b))
+            sense = senses[empty_rows]
+            violated = (((sense == LE) & (b < -slack)) | ((sense == GE) & (b > slack))
+                        | ((sense == EQ) & (np.abs(b) > slack)))
+            if violated.any():
+                status = pulp.LpStatusInfeasible
+                break
+            row_alive[empty_rows] = False
+            removed["linhas_vazias"] += empty_rows.size
+            changed = True
+
+        # Linhas redundantes (ou inviáveis) pela atividade mínima/máxima
+        entry_alive = row_alive[entry_rows] & col_alive[indices]
+        if "linhas_redundantes" in reductions:
+            minimum, maximum = _activity_bounds(entry_rows[entry_alive], data[entry_alive],
+                                                lower[indices[entry_alive]], upper[indices[entry_alive]], m)
+            slack = tol * np.maximum(1.0, np.abs(rhs))
+            infeasible = row_alive & (((senses != GE) & (minimum > rhs + slack))
+                                      | ((senses != LE) & (maximum < rhs - slack)))
+            if infeasible.any():
+                status = pulp.LpStatusInfeasible
+                break
+            redundant = row_alive & (((senses == LE) & (maximum <= rhs + slack))
+                                     | ((senses == GE) & (minimum >= rhs - slack)))
+            if redundant.any():
+                row_alive &= ~redundant
+                removed["linhas_redundantes"] += int(redundant.sum())
+                entry_alive = row_alive[entry_rows] & col_alive[indices]
+                changed = True
+
+        # Linhas paralelas
+        groups = []
+        if "linhas_paralelas" in reductions:
+            groups = _parallel_groups(indptr, indices, data, entry_alive, np.flatnonzero(row_alive))
+        for group in groups:
+            dropped, group_infeasible = _resolve_group(group, rhs, senses, tol)
+            if group_infeasible:
+                status = pulp.LpStatusInfeasible
+                break
+            if dropped:
+                row_alive[dropped] = False
+                removed["linhas_paralelas"] += len(dropped)
+                changed = True
+        if status is not None or not changed:
+            break
+
+    rows = np.flatnonzero(row_alive)
+    columns = np.flatnonzero(col_alive)
+    entry_alive = row_alive[entry_rows] & col_alive[indices]
+    new_column = np.full(n, -1, dtype=np.int64)
+    new_column[columns] = np.arange(columns.size)
+    reduced_indptr = np.zeros(rows.size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(entry_rows[entry_alive], minlength=m)[rows], out=reduced_indptr[1:])
+    names = store.names
+    variable_names = optimizer.variable_names or [f"x{j + 1}" for j in range(n)]
+    model = {
+        "sense": optimizer.sense,
+        "c": np.asarray(optimizer.coef_fo, dtype=float)[columns],
+        "csr": (reduced_indptr, new_column[indices[entry_alive]], data[entry_alive]),
+        "rhs": rhs[rows],
+        "senses": [SENSE_SYMBOLS[int(code)] for code in senses[rows]],
+        "names": [names[i] for i in rows.tolist()],
+        "variable_names": [variable_names[j] for j in columns.tolist()],
+        "lower": lower[columns],
+        "upper": upper[columns],
+    }
+    report = {
+        "linhas_originais": m,
+        "colunas_originais": n,
+        "nnz_original": int(indptr[-1]),
+        "linhas": int(rows.size),
+        "colunas": int(columns.size),
+        "nnz": int(entry_alive.sum()),
+        "removidas": removed,
+        "tempo_presolve": time.perf_counter() - start,
+    }
+    return {"status": status, "linhas": rows, "colunas": columns, "fixos": fixed,
+            "limites": (lower, upper), "origens": (lower_source, upper_source, source_coefficient, source_order),
+            "modelo": model, "relatorio": report}
+
+
+def _bound_duals(optimizer, reduction, x, pi, tol=TOLERANCE):
+    """
+    Atribui o custo reduzido de cada variável à linha que definiu o limite
+    ativo dela (linhas convertidas em limites), na ordem inversa da conversão.
+    """
+    lower_source, upper_source, coefficient, order = reduction["origens"]
+    columns = np.flatnonzero(order >= 0)
+    if columns.size == 0:
+        return
+    lower, upper = reduction["limites"]
+    sign = -1.0 if optimizer.sense == pulp.LpMaximize else 1.0
+    indptr, indices, data = optimizer.constraints.csr()
+    entry_rows = np.repeat(np.arange(len(optimizer.constraints)), np.diff(indptr))
+    by_column = np.argsort(indices, kind="stable")
+    column_start = np.searchsorted(indices[by_column], np.arange(optimizer.num_variables + 1))
+    c = np.asarray(optimizer.coef_fo, dtype=float)
+
+    for j in columns[np.argsort(-order[columns], kind="stable")].tolist():
+        entries = by_column[column_start[j]:column_start[j + 1]]
+        dj = c[j] - pi[entry_rows[entries]] @ data[entries]
+        # Custo reduzido no sentido de minimização: negativo pede aumentar x_j
+        d = sign * dj
+        dual_tol = tol * max(1.0, abs(c[j]))
+        if d < -dual_tol and upper_source[j] >= 0 and x[j] >= upper[j] - 1e-7 * max(1.0, abs(upper[j])):
+            pi[upper_source[j]] = dj / coefficient[1, j]
+        elif d > dual_tol and lower_source[j] >= 0 and x[j] <= lower[j] + 1e-7 * max(1.0, abs(lower[j])):
+            pi[lower_source[j]] = dj / coefficient[0, j]
+
+
+def postsolve(optimizer, reduction, outcome):
+    """
+    Restaura a solução do modelo original a partir da solução do modelo reduzido.
+    As colunas removidas recebem o valor fixado, as linhas convertidas em
+    limites recebem o custo reduzido da variável (quando o limite está ativo),
+    as demais linhas removidas recebem preço sombra zero e os custos reduzidos
+    são recalculados (dj = c - Aᵀπ).
+    Args:
+        optimizer (Optimizer): O modelo original.
+        reduction (dict): O retorno de `presolve`.
+        outcome (dict): O resultado do backend para o modelo reduzido.
+    Retorna:
+        dict: O resultado no formato dos backends, com as dimensões originais.
+    """
+    store = optimizer.constraints
+    x = np.nan_to_num(reduction["fixos"], nan=0.0)
+    x[reduction["colunas"]] = outcome["x"]
+    # Zero com o sinal que o CBC usa nas restrições folgadas (-0.0 na maximização)
+    pi = np.full(len(store), -0.0 if optimizer.sense == pulp.LpMaximize else 0.0)
+    pi[reduction["linhas"]] = outcome["pi"]
+    is_optimal = outcome["status"] == pulp.LpStatusOptimal
+    if is_optimal:
+        _bound_duals(optimizer, reduction, x, pi)
+
+    indptr, indices, data = store.csr()
+    entry_rows = np.repeat(np.arange(len(store)), np.diff(indptr))
+    dj = np.asarray(optimizer.coef_fo, dtype=float) - np.bincount(
+        indices, weights=data * pi[entry_rows], minlength=optimizer.num_variables)
+    if not is_optimal:
+        dj = np.zeros(optimizer.num_variables)
+    return {
+        "status": outcome["status"],
+        "x": x,
+        "dj": dj,
+        "pi": pi,
+        "objetivo": float(np.asarray(optimizer.coef_fo, dtype=float) @ x),
+    }
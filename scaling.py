@@ -0,0 +1,139 @@
+"""
+Escala de linhas e colunas da matriz de coeficientes antes da resolução.
+
+O modelo resolvido é R A S x' (≤, ≥, =) R b, com R e S diagonais positivas e
+x = S x'. Os preços sombra e os custos reduzidos do modelo original saem do
+escalado por pi = R pi' e dj = dj' / S, e o valor da função objetivo não muda.
+Os fatores são arredondados para potências de 2: multiplicar e dividir por
+eles não arredonda os valores, de modo que a desescala é exata.
+
+Métodos:
+    - "media_geometrica": passadas alternadas que dividem cada linha e cada
+      coluna pela média geométrica do maior e do menor coeficiente;
+    - "equilibrio": divide cada linha e depois cada coluna pelo maior coeficiente.
+"""
+import numpy as np
+
+from constraint_store import SENSE_SYMBOLS
+from sensitivity import basis_matrix
+
+METHODS = ("media_geometrica", "equilibrio")
+GEOMETRIC_PASSES = 6
+# As passadas param quando a razão entre o maior e o menor coeficiente melhora menos que isto
+GEOMETRIC_IMPROVEMENT = 0.9
+# Acima deste número de linhas o condicionamento da base (denso) não é estimado
+CONDITION_LIMIT = 2000
+
+
+def coefficient_range(data):
+    """Menor e maior coeficiente não nulo em valor absoluto e a razão entre eles."""
+    magnitudes = np.abs(data[data != 0])
+    if magnitudes.size == 0:
+        return {"minimo": None, "maximo": None, "razao": None}
+    low, high = float(magnitudes.min()), float(magnitudes.max())
+    return {"minimo": low, "maximo": high, "razao": high / low}
+
+
+def _extremes(groups, magnitudes, size):
+    """Maior e menor magnitude de cada linha ou coluna (1 nas vazias)."""
+    high = np.zeros(size)
+    low = np.full(size, np.inf)
+    np.maximum.at(high, groups, magnitudes)
+    np.minimum.at(low, groups, magnitudes)
+    empty = high == 0
+    high[empty] = low[empty] = 1.0
+    return high, low
+
+
+def _power_of_two(factors):
+    return np.exp2(np.round(np.log2(factors)))
+
+
+def scale_factors(optimizer, method="media_geometrica"):
+    """
+    Calcula os fatores de escala das linhas e das colunas.
+    Args:
+        optimizer (Optimizer): O modelo.
+        method (str): "media_geometrica" ou "equilibrio".
+    Retorna:
+        tuple: (fatores das linhas, fatores das colunas), potências de 2.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método de escala desconhecido: {method}. Opções: {', '.join(METHODS)}")
+    indptr, indices, data = optimizer.constraints.csr()
+    m, n = len(optimizer.constraints), optimizer.num_variables
+    rows = np.repeat(np.arange(m), np.diff(indptr))
+    nonzero = data != 0
+    rows, columns, magnitudes = rows[nonzero], indices[nonzero], np.abs(data[nonzero])
+    row_scale, col_scale = np.ones(m), np.ones(n)
+
+    if method == "equilibrio":
+        row_scale = 1.0 / _extremes(rows, magnitudes, m)[0]
+        col_scale = 1.0 / _extremes(columns, magnitudes * row_scale[rows], n)[0]
+        return _power_of_two(row_scale), _power_of_two(col_scale)
+
+    ratio = np.inf
+    for _ in range(GEOMETRIC_PASSES):
+        high, low = _extremes(rows, magnitudes * col_scale[columns], m)
+        row_scale = 1.0 / np.sqrt(high * low)
+        high, low = _extremes(columns, magnitudes * row_scale[rows], n)
+        col_scale = 1.0 / np.sqrt(high * low)
+        scaled = magnitudes * row_scale[rows] * col_scale[columns]
+        new_ratio = scaled.max(initial=1.0) / scaled.min(initial=1.0)
+        if new_ratio > GEOMETRIC_IMPROVEMENT * ratio:
+            break
+        ratio = new_ratio
+    return _power_of_two(row_scale), _power_of_two(col_scale)
+
+
+def scaled_model(optimizer, row_scale, col_scale):
+    """
+    Monta o modelo escalado.
+    Retorna:
+        dict: Os arrays do modelo, no formato de `Optimizer._from_model_arrays`.
+    """
+    indptr, indices, data = optimizer.constraints.csr()
+    rows = np.repeat(np.arange(len(optimizer.constraints)), np.diff(indptr))
+    return {
+        "sense": optimizer.sense,
+        "c": np.asarray(optimizer.coef_fo, dtype=float) * col_scale,
+        "csr": (indptr.copy(), indices.copy(), data * row_scale[rows] * col_scale[indices]),
+        "rhs": optimizer.constraints.rhs * row_scale,
+        "senses": [SENSE_SYMBOLS[int(code)] for code in optimizer.constraints.senses],
+        "names": list(optimizer.constraints.names),
+        "variable_names": optimizer.variable_names,
+        "lower": optimizer.lower_bounds / col_scale,
+        "upper": optimizer.upper_bounds / col_scale,
+    }
+
+
+def unscale(outcome, row_scale, col_scale):
+    """Converte o resultado do modelo escalado (no formato dos backends) para o original."""
+    unscaled = dict(outcome)
+    unscaled["x"] = outcome["x"] * col_scale
+    if "pi" in outcome:
+        unscaled["pi"] = outcome["pi"] * row_scale
+    if "dj" in outcome:
+        unscaled["dj"] = outcome["dj"] / col_scale
+    return unscaled
+
+
+def basis_conditioning(scaled_basis, row_scale, col_scale):
+    """
+    Estima o número de condição (norma 1) da base ótima no modelo original e
+    no escalado, a partir da base do escalado (ver `Optimizer._optimal_basis`).
+    Retorna:
+        dict: "original" e "escalado".
+    """
+    columns = scaled_basis["colunas"]
+    # A norma da inversa exige a inversa densa (por isso o CONDITION_LIMIT)
+    scaled = basis_matrix(scaled_basis["A"], columns).toarray()
+    scaled_inverse = np.linalg.inv(scaled)
+    # As folgas do modelo escalado valem R vezes as do original
+    basis_scale = np.concatenate([col_scale, 1.0 / row_scale])[columns]
+    original = scaled / row_scale[:, None] / basis_scale[None, :]
+    original_inverse = scaled_inverse * basis_scale[:, None] * row_scale[None, :]
+    return {
+        "original": float(np.linalg.norm(original, 1) * np.linalg.norm(original_inverse, 1)),
+        "escalado": float(np.linalg.norm(scaled, 1) * np.linalg.norm(scaled_inverse, 1)),
+    }
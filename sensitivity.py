@@ -0,0 +1,211 @@
+"""
+Análise de sensibilidade a partir da base ótima.
+
+O modelo é visto na forma padrão [A | I] [x; s] = b, em que s = b - A x é a
+folga de cada restrição (a mesma convenção de `slack` do PuLP). Os limites da
+folga dependem do operador: '<=' -> s >= 0, '>=' -> s <= 0, '==' -> s = 0.
+"""
+import numpy as np
+import pulp
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+TOLERANCE = 1e-9
+# Custo máximo, em m²(n + m), da reconstrução da base a partir da solução
+# (`recover_basis`): acima dele, sem a base informada pelo backend, as
+# análises resolvem o modelo de novo
+RECOVERY_LIMIT = 10 ** 9
+# Colunas da inversa da base calculadas por vez nas faixas (limita a memória)
+RANGING_BLOCK = 256
+
+
+def slack_bounds(senses):
+    """
+    Retorna os limites inferior e superior das folgas, dado o código do operador
+    de cada restrição.
+    """
+    senses = np.asarray(senses)
+    lower = np.where(senses == pulp.LpConstraintLE, 0.0, -np.inf)
+    upper = np.where(senses == pulp.LpConstraintGE, 0.0, np.inf)
+    lower[senses == pulp.LpConstraintEQ] = 0.0
+    upper[senses == pulp.LpConstraintEQ] = 0.0
+    return lower, upper
+
+
+def dense_matrix(csr, num_columns):
+    """Converte uma matriz CSR (indptr, indices, data) em um array denso."""
+    indptr, indices, data = csr
+    dense = np.zeros((len(indptr) - 1, num_columns))
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    np.add.at(dense, (rows, indices), data)
+    return dense
+
+
+def sparse_matrix(csr, num_columns):
+    """Converte uma matriz CSR (indptr, indices, data) em uma matriz esparsa do SciPy."""
+    indptr, indices, data = csr
+    return sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, num_columns))
+
+
+def recover_basis(A, values, lower, upper, reduced_costs, tol=TOLERANCE):
+    """
+    Reconstrói uma base ótima a partir de uma solução de vértice.
+
+    Colunas com valor estritamente entre os limites são sempre básicas. Em
+    vértices degenerados a base é completada, mantendo-a não singular, com as
+    colunas de custo reduzido nulo (folgas primeiro) e, por fim, as demais.
+
+    Args:
+        A (array): Matriz densa m x n das restrições.
+        values (array): Valores das n + m colunas da forma padrão [x; s].
+        lower, upper (array): Limites das n + m colunas.
+        reduced_costs (array): Custos reduzidos das n + m colunas.
+    Retorna:
+        array: Os índices das m colunas básicas.
+    """
+    m, n = A.shape
+    gap = np.minimum(values - lower, upper - values)
+    between = np.flatnonzero(gap > tol)
+    zero_cost = np.flatnonzero(np.abs(reduced_costs) <= tol)
+    slacks = np.arange(n, n + m)
+    # Em cada grupo as folgas vêm antes das variáveis estruturais
+    candidates = [between[np.argsort(-gap[between], kind="stable")],
+                  zero_cost[::-1], slacks, np.arange(n)]
+
+    basis = []
+    chosen = np.zeros(n + m, dtype=bool)
+    q = np.empty((m, m))
+    for column in np.concatenate(candidates):
+        if len(basis) == m:
+            break
+        if chosen[column]:
+            continue
+        vector = A[:, column] if column < n else np.eye(1, m, column - n).ravel()
+        residual = vector.copy()
+        # Gram-Schmidt com reortogonalização
+        for _ in range(2):
+            residual -= q[:, :len(basis)] @ (q[:, :len(basis)].T @ residual)
+        norm = np.linalg.norm(residual)
+        if norm > 1e-7 * max(np.linalg.norm(vector), 1.0):
+            q[:, len(basis)] = residual / norm
+            basis.append(column)
+            chosen[column] = True
+    return np.array(basis, dtype=np.int64)
+
+
+def basis_matrix(A, basis):
+    """Monta a matriz básica B (esparsa, por colunas) a partir das colunas de [A | I]."""
+    m, n = A.shape
+    standard = sp.hstack([sp.csc_matrix(A), sp.identity(m, format="csc")], format="csc")
+    return standard[:, np.asarray(basis, dtype=np.int64)]
+
+
+def factorize_basis(A, basis):
+    """
+    Fatora a matriz básica (LU esparsa). As soluções com B e com Bᵀ saem de
+    substituições triangulares: `fator.solve(v)` e `fator.solve(v, trans="T")`.
+    Args:
+        A (sparse): Matriz m x n das restrições.
+        basis (array): Os índices das m colunas básicas de [A | I].
+    Retorna:
+        SuperLU: A fatoração, ou None se a base for singular.
+    """
+    try:
+        return splu(basis_matrix(A, basis))
+    except RuntimeError:
+        return None
+
+
+def inverse_columns(factor, rows, num_rows):
+    """Retorna as colunas `rows` da inversa da base (m x len(rows)) a partir da fatoração."""
+    unit = np.zeros((num_rows, len(rows)))
+    unit[rows, np.arange(len(rows))] = 1.0
+    return factor.solve(unit)
+
+
+def inverse_rows(factor, rows, num_rows):
+    """Retorna as linhas `rows` da inversa da base (len(rows) x m), pela fatoração transposta."""
+    unit = np.zeros((num_rows, len(rows)))
+    unit[rows, np.arange(len(rows))] = 1.0
+    return factor.solve(unit, trans="T").T
+
+
+def rhs_ranging(binv, basic_values, basic_lower, basic_upper, tol=TOLERANCE):
+    """
+    Calcula, para cada restrição, quanto o RHS pode diminuir e aumentar
+    sem que a base atual deixe de ser viável (e, portanto, ótima).
+
+    Args:
+        binv (array): Inversa da matriz básica (m x m).
+        basic_values (array): Valores das variáveis básicas.
+        basic_lower, basic_upper (array): Limites das variáveis básicas.
+    Retorna:
+        tuple: (diminuição permitida, aumento permitido), um valor por restrição.
+    """
+    room_up = (basic_upper - basic_values)[:, None]
+    room_down = (basic_values - basic_lower)[:, None]
+    positive = binv > tol
+    negative = binv < -tol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        increase = np.where(positive, room_up / binv, np.where(negative, room_down / -binv, np.inf))
+        decrease = np.where(positive, room_down / binv, np.where(negative, room_up / -binv, np.inf))
+    allowable_increase = np.maximum(np.min(increase, axis=0, initial=np.inf), 0.0)
+    allowable_decrease = np.maximum(np.min(decrease, axis=0, initial=np.inf), 0.0)
+    return allowable_decrease, allowable_increase
+
+
+def nonbasic_states(values, lower, upper, basis):
+    """
+    Classifica as colunas da forma padrão em relação à base. Uma coluna fora
+    da base está no limite finito mais próximo do seu valor (os solvers
+    arredondam a solução, então a comparação não é exata).
+    Retorna:
+        array: 0 para básicas ou fixas, -1 no limite inferior, 1 no limite
+        superior e 2 para colunas livres fora da base.
+    """
+    with np.errstate(invalid="ignore"):
+        nearer_upper = np.abs(upper - values) < np.abs(values - lower)
+    states = np.where(np.isfinite(lower) & ~(np.isfinite(upper) & nearer_upper), -1,
+                      np.where(np.isfinite(upper), 1, 2))
+    states[upper == lower] = 0
+    states[basis] = 0
+    return states
+
+
+def cost_ranging(tableau, basis, reduced_costs, states, tol=TOLERANCE):
+    """
+    Calcula, para cada coluna, quanto o custo pode diminuir e aumentar sem que
+    a base atual deixe de ser ótima, em um problema de maximização.
+
+    Uma coluna fora da base só muda o próprio custo reduzido; uma básica muda
+    o de todas as colunas fora da base, na proporção da sua linha do tableau.
+
+    Args:
+        tableau (array): B⁻¹ [A | I] (m x (n + m)).
+        basis (array): Os índices das colunas básicas, na ordem das linhas de B.
+        reduced_costs (array): Custos reduzidos (c - yᵀ [A | I]) de todas as colunas.
+        states (array): A posição de cada coluna (ver `nonbasic_states`).
+    Retorna:
+        tuple: (diminuição permitida, aumento permitido), um valor por coluna.
+    """
+    at_lower, at_upper, free = states == -1, states == 1, states == 2
+    # Sinal compatível com a otimalidade: <= 0 no limite inferior, >= 0 no superior
+    d = np.where(at_lower, np.minimum(reduced_costs, 0.0), np.where(at_upper, np.maximum(reduced_costs, 0.0), 0.0))
+
+    decrease = np.full(d.size, np.inf)
+    increase = np.full(d.size, np.inf)
+    increase[at_lower] = -d[at_lower]
+    decrease[at_upper] = d[at_upper]
+    increase[free] = decrease[free] = 0.0
+
+    rows = tableau[:, states != 0]
+    d, at_lower, at_upper, free = d[states != 0], at_lower[states != 0], at_upper[states != 0], free[states != 0]
+    positive = rows > tol
+    negative = rows < -tol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.abs(d) / np.abs(rows)
+    limits_increase = (at_lower & negative) | (at_upper & positive) | (free & (positive | negative))
+    limits_decrease = (at_lower & positive) | (at_upper & negative) | (free & (positive | negative))
+    increase[basis] = np.min(np.where(limits_increase, ratio, np.inf), axis=1, initial=np.inf)
+    decrease[basis] = np.min(np.where(limits_decrease, ratio, np.inf), axis=1, initial=np.inf)
+    return decrease, increase
@@ -0,0 +1,67 @@
+"""
+Modelos das sessões do app, guardados como snapshots compactos.
+
+A sessão do Streamlit não guarda o `Optimizer` (nem o `LpProblem` do PuLP):
+guarda só a chave do seu snapshot, o modelo serializado por
+`Optimizer.to_bytes` (arrays, solução e base ótima). Os snapshots de todas as
+sessões ficam em um único `SolutionCache` do processo, limitado em bytes: ao
+passar do orçamento, os snapshots usados há mais tempo são descartados e a
+sessão correspondente precisa resolver o modelo de novo.
+"""
+import uuid
+
+from linear_optimization import Optimizer
+from solution_cache import SolutionCache
+
+# Memória total dos snapshots, somadas todas as sessões
+SNAPSHOT_BUDGET = 256 * 1024 * 1024
+MAX_SNAPSHOTS = 4096
+
+snapshot_store = SolutionCache(max_entries=MAX_SNAPSHOTS, max_bytes=SNAPSHOT_BUDGET)
+
+
+def new_session_key():
+    """Gera a chave do snapshot de uma sessão."""
+    return ("sessao", uuid.uuid4().hex)
+
+
+def save(key, optimizer, store=snapshot_store):
+    """
+    Guarda o snapshot do modelo (e da última solução) no lugar do anterior da sessão.
+    Args:
+        key (tuple): A chave da sessão (ver `new_session_key`).
+        optimizer (Optimizer): O modelo.
+        store (SolutionCache): O armazenamento dos snapshots.
+    Retorna:
+        int: O tamanho do snapshot em bytes.
+    """
+    payload = optimizer.to_bytes()
+    store.put(key, payload)
+    return len(payload)
+
+
+def load(key, store=snapshot_store, **options):
+    """
+    Reconstrói o otimizador a partir do snapshot da sessão.
+    Args:
+        key (tuple): A chave da sessão.
+        store (SolutionCache): O armazenamento dos snapshots.
+        **options: Argumentos de `Optimizer.from_bytes` (cache, time_limit, ...).
+    Retorna:
+        Optimizer: O otimizador, ou None se o snapshot não existe (ou foi descartado).
+    """
+    if key is None:
+        return None
+    payload = store.get(key)
+    if payload is None:
+        return None
+    return Optimizer.from_bytes(payload, **options)
+
+
+def usage(store=snapshot_store):
+    """
+    Retorna:
+        dict: "sessoes" (snapshots guardados), "bytes" e "orcamento" (bytes).
+    """
+    stats = store.stats()
+    return {"sessoes": stats["entradas"], "bytes": stats["bytes"], "orcamento": store.max_bytes}
@@ -0,0 +1,347 @@
+"""
+Simplex revisado em NumPy para problemas pequenos e médios.
+
+O problema é resolvido na forma padrão [A | I] [x; s] = b, com limites em
+todas as colunas (as folgas seguem a convenção de `sensitivity.slack_bounds`).
+A Fase I minimiza a soma das inviabilidades a partir de qualquer base, o que
+permite partir de uma base anterior (warm start) mesmo que ela tenha deixado
+de ser viável. A inversa da base é atualizada por pivoteamento e refatorada
+periodicamente.
+
+Os modelos com variáveis inteiras são resolvidos por branch and bound
+(`branch_and_bound`), com o simplex nos nós.
+"""
+import time
+
+import numpy as np
+import pulp
+
+from sensitivity import slack_bounds
+
+TOLERANCE = 1e-9
+PIVOT_TOLERANCE = 1e-11
+REFACTOR_INTERVAL = 50
+# Pivôs degenerados seguidos antes de trocar para a regra de Bland (anticiclagem)
+DEGENERATE_LIMIT = 20
+# Distância máxima de um valor ao inteiro mais próximo para ser considerado inteiro
+INTEGER_TOLERANCE = 1e-6
+
+PRICING_RULES = ("dantzig", "bland", "steepest_edge")
+
+
+def _initial_values(lower, upper, at_upper):
+    """Posiciona cada coluna não básica em um de seus limites (ou em zero, se livre)."""
+    values = np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 0.0))
+    if at_upper is not None:
+        values = np.where(at_upper & np.isfinite(upper), upper, values)
+    return values
+
+
+def _choose_entering(d, values, lower, upper, nonbasic, pricing, dual_tol, binv, M):
+    """
+    Escolhe a coluna que entra na base.
+    Retorna:
+        tuple: (índice da coluna, direção +1/-1), ou (None, 0) se não houver candidata.
+    """
+    can_increase = nonbasic & (d < -dual_tol) & (values < upper)
+    can_decrease = nonbasic & (d > dual_tol) & (values > lower)
+    candidates = np.flatnonzero(can_increase | can_decrease)
+    if candidates.size == 0:
+        return None, 0
+    if pricing == "bland":
+        j = candidates[0]
+    elif pricing == "steepest_edge":
+        columns = binv @ M[:, candidates]
+        norms = 1.0 + np.einsum("ij,ij->j", columns, columns)
+        j = candidates[np.argmax(d[candidates] ** 2 / norms)]
+    else:
+        j = candidates[np.argmax(np.abs(d[candidates]))]
+    return j, (1 if can_increase[j] else -1)
+
+
+def solve(c, A, b, senses, lower, upper, sense=pulp.LpMinimize, basis=None, at_upper=None,
+          pricing="dantzig", max_iterations=None, time_limit=None, tol=TOLERANCE):
+    """
+    Resolve o PL pelo método simplex revisado com variáveis limitadas.
+
+    Args:
+        c (array): Coeficientes da função objetivo (n).
+        A (array): Matriz densa das restrições (m x n).
+        b (array): Lados direitos (m).
+        senses (array): Códigos de operador das restrições (constantes do PuLP).
+        lower, upper (array): Limites das variáveis (podem ser infinitos).
+        sense (pulp.LpMaximize ou pulp.LpMinimize): O sentido da otimização.
+        basis (array, opcional): Base inicial (m índices de colunas de [A | I]).
+        at_upper (array, opcional): Máscara das colunas não básicas no limite superior.
+        pricing (str): Regra de escolha da coluna: "dantzig", "bland" ou "steepest_edge".
+        max_iterations (int, opcional): Limite de iterações.
+        time_limit (float, opcional): Limite de tempo em segundos. Se ele se
+            esgota na Fase II, a solução atual (viável) é devolvida.
+
+    Retorna:
+        dict: "status", "x", "objetivo", "pi", "dj" (mesmas convenções do PuLP),
+        "basis" e "at_upper" (para warm start e análise de sensibilidade),
+        "iteracoes" e "tempo_esgotado" (True se o limite de tempo interrompeu
+        a Fase II; o status fica `pulp.LpStatusNotSolved`).
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    if pricing not in PRICING_RULES:
+        raise ValueError(f"Regra de pricing desconhecida: {pricing}")
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    slack_lower, slack_upper = slack_bounds(senses)
+    lower = np.concatenate([np.asarray(lower, dtype=float), slack_lower])
+    upper = np.concatenate([np.asarray(upper, dtype=float), slack_upper])
+    M = np.hstack([A, np.eye(m)])
+    # Trabalha sempre com minimização; `sign` desfaz a troca nos resultados
+    sign = -1.0 if sense == pulp.LpMaximize else 1.0
+    cost = np.concatenate([sign * np.asarray(c, dtype=float), np.zeros(m)])
+    if max_iterations is None:
+        max_iterations = 50 * (m + n) + 1000
+    feas_tol = tol * max(1.0, np.abs(b).max(initial=0.0))
+    dual_tol = tol * max(1.0, np.abs(cost).max(initial=0.0))
+
+    values = _initial_values(lower, upper, at_upper)
+    binv = None
+    if basis is not None and len(basis) == m:
+        basis = np.array(basis, dtype=np.int64)
+        try:
+            binv = np.linalg.inv(M[:, basis])
+        except np.linalg.LinAlgError:
+            binv = None
+    if binv is None:
+        basis = np.arange(n, n + m)
+        binv = np.eye(m)
+    nonbasic = np.ones(n + m, dtype=bool)
+    nonbasic[basis] = False
+
+    def basic_values():
+        fixed = np.where(nonbasic, values, 0.0)
+        return binv @ (b - M @ fixed)
+
+    values[basis] = basic_values()
+    status = pulp.LpStatusNotSolved
+    timed_out = False
+    iterations = 0
+    since_refactor = 0
+    degenerate = 0
+    y = np.zeros(m)
+    d = np.zeros(n + m)
+
+    while iterations < max_iterations:
+        xb = values[basis]
+        lb, ub = lower[basis], upper[basis]
+        below = xb < lb - feas_tol
+        above = xb > ub + feas_tol
+        phase_one = bool(below.any() or above.any())
+
+        if phase_one:
+            # Fase I: minimiza a soma das inviabilidades das variáveis básicas
+            y = np.where(below, -1.0, np.where(above, 1.0, 0.0)) @ binv
+            d = -(y @ M)
+            # Uma variável inviável só bloqueia o passo ao alcançar o limite violado
+            lb, ub = (np.where(below, -np.inf, np.where(above, ub, lb)),
+                      np.where(below, lb, np.where(above, np.inf, ub)))
+        else:
+            y = cost[basis] @ binv
+            d = cost - y @ M
+        d[basis] = 0.0
+        if deadline is not None and time.perf_counter() > deadline:
+            timed_out = not phase_one
+            break
+
+        rule = "bland" if degenerate > DEGENERATE_LIMIT else pricing
+        j, direction = _choose_entering(d, values, lower, upper, nonbasic, rule, dual_tol, binv, M)
+        if j is None:
+            status = pulp.LpStatusInfeasible if phase_one else pulp.LpStatusOptimal
+            break
+
+        alpha = binv @ M[:, j]
+        delta = -direction * alpha
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(delta < -PIVOT_TOLERANCE, (xb - lb) / -delta,
+                              np.where(delta > PIVOT_TOLERANCE, (ub - xb) / delta, np.inf))
+        ratios = np.maximum(ratios, 0.0)
+        step_flip = upper[j] - lower[j]
+        step = min(ratios.min(initial=np.inf), step_flip)
+        if np.isinf(step):
+            status = pulp.LpStatusUnbounded
+            break
+
+        iterations += 1
+        degenerate = degenerate + 1 if step <= feas_tol else 0
+        values[j] += direction * step
+        values[basis] += delta * step
+
+        if step_flip <= ratios.min(initial=np.inf):
+            # A coluna apenas troca de limite; a base não muda
+            values[j] = upper[j] if direction > 0 else lower[j]
+            continue
+
+        ties = np.flatnonzero(ratios <= step + feas_tol)
+        if rule == "bland":
+            r = ties[np.argmin(basis[ties])]
+        else:
+            r = ties[np.argmax(np.abs(alpha[ties]))]
+        leaving = basis[r]
+        values[leaving] = lb[r] if delta[r] < 0 else ub[r]
+
+        # Atualização da inversa por pivoteamento na linha r
+        pivot_row = binv[r] / alpha[r]
+        binv -= np.outer(alpha, pivot_row)
+        binv[r] = pivot_row
+        basis[r] = j
+        nonbasic[j] = False
+        nonbasic[leaving] = True
+
+        since_refactor += 1
+        if since_refactor >= REFACTOR_INTERVAL:
+            binv = np.linalg.inv(M[:, basis])
+            values[basis] = basic_values()
+            since_refactor = 0
+
+    x = values[:n].copy()
+    is_optimal = status == pulp.LpStatusOptimal
+    return {
+        "status": status,
+        "x": x,
+        "objetivo": float(np.asarray(c, dtype=float) @ x),
+        "pi": sign * y if is_optimal else np.zeros(m),
+        "dj": sign * d[:n] if is_optimal else np.zeros(n),
+        "basis": basis.copy(),
+        "at_upper": nonbasic & np.isfinite(upper) & (values >= upper),
+        "iteracoes": iterations,
+        "tempo_esgotado": timed_out,
+    }
+
+
+def _is_integer_feasible(x, A, b, senses, lower, upper, integer, tol=INTEGER_TOLERANCE):
+    """Verifica se `x` respeita as restrições, os limites e a integralidade."""
+    slack_lower, slack_upper = slack_bounds(senses)
+    slack = b - A @ x
+    row_tol = tol * (1 + np.abs(b))
+    return bool(np.all(slack >= slack_lower - row_tol) and np.all(slack <= slack_upper + row_tol)
+                and np.all(x >= lower - tol) and np.all(x <= upper + tol)
+                and np.all(np.abs(x[integer] - np.round(x[integer])) <= tol))
+
+
+def branch_and_bound(c, A, b, senses, lower, upper, integer, sense=pulp.LpMinimize, incumbent=None,
+                     mip_gap=None, pricing="dantzig", max_iterations=None, time_limit=None):
+    """
+    Resolve o problema com variáveis inteiras por branch and bound em
+    profundidade. Cada nó é o PL com os limites das variáveis ramificadas
+    alterados, resolvido por `solve` a partir da base do nó pai (warm start).
+
+    Args:
+        integer (array): Máscara das variáveis inteiras.
+        incumbent (array, opcional): Solução inicial; usada se for viável.
+        mip_gap (float, opcional): Gap relativo em que a busca para: nós que
+            não melhoram a incumbente em mais que isso são descartados.
+        Os demais argumentos são os de `solve`; o limite de tempo vale para a busca toda.
+
+    Retorna:
+        dict: As chaves de `solve`, com "x" e "objetivo" da melhor solução
+        inteira, "pi", "dj", "basis" e "at_upper" da relaxação linear da raiz,
+        "limite" (o melhor limite dual: o valor que nenhuma solução inteira
+        supera, ou None) e "nos" (PLs resolvidos). "tempo_esgotado" é True se
+        o limite de tempo interrompeu a busca depois de haver uma solução inteira.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    c = np.asarray(c, dtype=float)
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    integer = np.asarray(integer, dtype=bool)
+    m, n = A.shape
+    sign = -1.0 if sense == pulp.LpMaximize else 1.0
+    gap = 0.0 if mip_gap is None else mip_gap
+
+    best_x, best = None, np.inf
+    if incumbent is not None:
+        incumbent = np.asarray(incumbent, dtype=float)
+        if incumbent.size == n and _is_integer_feasible(incumbent, A, b, senses, lower, upper, integer):
+            best_x = np.where(integer, np.round(incumbent), incumbent)
+            best = sign * float(c @ best_x)
+
+    def prunable(value):
+        # Descarta o nó se ele não melhora a incumbente além do gap (e da tolerância numérica)
+        return value >= best - max(gap * abs(best), TOLERANCE * (1 + abs(best)))
+
+    # Nós a explorar: (limites inferiores, superiores, base e colunas no limite superior do pai, limite do pai)
+    stack = [(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float), None, None, -np.inf)]
+    # Menor limite entre os nós descartados pelo gap ou não resolvidos
+    discarded = np.inf
+    root = None
+    nodes = iterations = 0
+    timed_out = False
+    while stack:
+        node_lower, node_upper, basis, at_upper, parent = stack[-1]
+        remaining = None if deadline is None else deadline - time.perf_counter()
+        if remaining is not None and remaining <= 0:
+            timed_out = True
+            break
+        stack.pop()
+        if prunable(parent):
+            discarded = min(discarded, parent)
+            continue
+        result = solve(c, A, b, senses, node_lower, node_upper, sense=sense, basis=basis, at_upper=at_upper,
+                       pricing=pricing, max_iterations=max_iterations, time_limit=remaining)
+        nodes += 1
+        iterations += result["iteracoes"]
+        if root is None:
+            root = result
+        if result["tempo_esgotado"]:
+            stack.append((node_lower, node_upper, basis, at_upper, parent))
+            timed_out = True
+            break
+        if root["status"] != pulp.LpStatusOptimal:
+            break
+        if result["status"] == pulp.LpStatusInfeasible:
+            continue
+        if result["status"] != pulp.LpStatusOptimal:
+            # Limite de iterações: o nó fica sem resposta e o limite dual, com o do pai
+            discarded = min(discarded, parent)
+            continue
+
+        value = sign * result["objetivo"]
+        if prunable(value):
+            discarded = min(discarded, value)
+            continue
+        x = result["x"]
+        fractional = np.where(integer, np.abs(x - np.round(x)), 0.0)
+        if fractional.max(initial=0.0) <= INTEGER_TOLERANCE:
+            best_x, best = np.where(integer, np.round(x), x), value
+            continue
+
+        # Ramifica na variável mais fracionária; o lado do arredondamento é explorado primeiro
+        j = int(np.argmax(fractional))
+        down_upper = node_upper.copy()
+        down_upper[j] = np.floor(x[j])
+        up_lower = node_lower.copy()
+        up_lower[j] = np.ceil(x[j])
+        down = (node_lower, down_upper, result["basis"], result["at_upper"], value)
+        up = (up_lower, node_upper, result["basis"], result["at_upper"], value)
+        stack.extend([down, up] if x[j] - np.floor(x[j]) < 0.5 else [up, down])
+
+    bound = min([best, discarded] + [node[4] for node in stack])
+    if root is not None and root["status"] != pulp.LpStatusOptimal:
+        status, bound = root["status"], np.inf
+    elif best_x is not None:
+        status = pulp.LpStatusNotSolved if timed_out else pulp.LpStatusOptimal
+    else:
+        status = pulp.LpStatusNotSolved if timed_out else pulp.LpStatusInfeasible
+    x = best_x if best_x is not None else np.zeros(n)
+    root_optimal = root is not None and root["status"] == pulp.LpStatusOptimal
+    return {
+        "status": status,
+        "x": x,
+        "objetivo": float(c @ x),
+        "pi": root["pi"] if root_optimal else np.zeros(m),
+        "dj": root["dj"] if root_optimal else np.zeros(n),
+        "basis": root["basis"] if root is not None else None,
+        "at_upper": root["at_upper"] if root is not None else None,
+        "limite": sign * float(bound) if np.isfinite(bound) else None,
+        "iteracoes": iterations,
+        "nos": nodes,
+        "tempo_esgotado": timed_out and best_x is not None,
+    }
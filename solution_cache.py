@@ -0,0 +1,166 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def canonical_key(optimizer):
+    """
+    Calcula o hash canônico do modelo (sentido, c, A, b, operadores, limites e
+    variáveis inteiras).
+    As linhas são ordenadas pelo seu conteúdo, de modo que a ordem das
+    restrições e os nomes (de variáveis e restrições) não alteram a chave.
+
+    Retorna:
+        tuple: (chave hexadecimal, ordem), em que `ordem[k]` é o índice original
+        da linha que ocupa a posição canônica k.
+    """
+    indptr, indices, data = optimizer.constraints.csr()
+    rhs = optimizer.constraints.rhs
+    senses = optimizer.constraints.senses
+    rows = [senses[i:i + 1].tobytes() + rhs[i:i + 1].tobytes()
+            + indices[indptr[i]:indptr[i + 1]].tobytes() + data[indptr[i]:indptr[i + 1]].tobytes()
+            for i in range(len(rhs))]
+    order = np.array(sorted(range(len(rows)), key=rows.__getitem__), dtype=np.int64)
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((optimizer.sense, optimizer.num_variables)).encode())
+    for array in (optimizer.coef_fo, optimizer.lower_bounds, optimizer.upper_bounds):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    if optimizer.integer.any():
+        # Só os modelos com variáveis inteiras incluem a máscara: a chave dos contínuos não muda
+        digest.update(np.packbits(optimizer.integer).tobytes())
+    for k in order.tolist():
+        row = rows[k]
+        digest.update(len(row).to_bytes(8, "little"))
+        digest.update(row)
+    return digest.hexdigest(), order
+
+
+def _entry_size(value):
+    """Estimativa do tamanho de uma entrada em bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, bytes):
+        return len(value) + 33
+    if isinstance(value, dict):
+        return 240 + sum(_entry_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(_entry_size(v) for v in value)
+    return 32
+
+
+class SolutionCache:
+    """
+    Cache LRU de resultados, limitado em número de entradas e em bytes, seguro
+    para uso entre threads (sessões do Streamlit). Opcionalmente persiste as
+    entradas em disco, uma por arquivo, para sobreviver a reinícios.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, directory=None):
+        """
+        Args:
+            max_entries (int): Número máximo de entradas em memória.
+            max_bytes (int): Tamanho máximo estimado das entradas em memória.
+            directory (str, opcional): Diretório para persistir as entradas.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def get(self, key):
+        """
+        Busca uma entrada, primeiro em memória e depois em disco.
+        Retorna:
+            O valor armazenado, ou None se a chave não existir.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as file:
+                    value = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def __contains__(self, key):
+        """Verifica se a chave existe, em memória ou em disco, sem contar acerto ou falta."""
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.directory is not None and os.path.exists(self._path(key))
+
+    def put(self, key, value):
+        """Armazena uma entrada (e a grava em disco, se configurado)."""
+        self._store(key, value)
+        if self.directory is not None:
+            path = self._path(key)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+
+    def _store(self, key, value):
+        size = _entry_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Esvazia o cache em memória e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Retorna:
+            dict: Acertos, faltas, remoções, entradas e bytes em memória.
+        """
+        with self._lock:
+            return {
+                "acertos": self.hits,
+                "faltas": self.misses,
+                "remocoes": self.evictions,
+                "entradas": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+# Cache compartilhado por todo o processo (todas as sessões do Streamlit)
+shared_cache = SolutionCache()
@@ -0,0 +1,115 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+class SolveResult(MutableMapping):
+    """
+    Resultados de `Optimizer.solve()`. Os valores das variáveis, os preços
+    sombra, as folgas e os custos reduzidos ficam em arrays float64 contíguos
+    (`x`, `pi`, `slack` e `dj`), indexados como as colunas e as linhas do
+    modelo. O acesso por chave continua o de antes ("valores_otimos",
+    "precos_sombra", ...): os arrays só viram listas quando a chave é lida,
+    uma única vez.
+    """
+
+    def __init__(self, x, pi, dj, slack, objective, status, variable_names=None, constraint_names=None):
+        """
+        Args:
+            x, pi, dj, slack (np.ndarray): Valores das variáveis, preços sombra,
+                custos reduzidos e folgas (RHS - atividade) das restrições.
+            objective (float): O valor da função objetivo.
+            status (int): O status da resolução.
+            variable_names (list, opcional): Nomes das variáveis. Padrão: x1, x2, ...
+            constraint_names (list, opcional): Nomes das restrições, na ordem das linhas.
+        """
+        self.x = x
+        self.pi = pi
+        self.dj = dj
+        self.slack = slack
+        self._variable_names = variable_names
+        self._constraint_names = constraint_names
+        self._variable_index = None
+        self._constraint_index = None
+        self._data = {
+            "valores_otimos": x,
+            "valor_objetivo": objective,
+            "precos_sombra": pi,
+            "viavel": status,
+        }
+
+    def add_cost_ranges(self, decrease, increase):
+        """Inclui os custos reduzidos e as faixas dos coeficientes da função objetivo."""
+        self._data["custos_reduzidos"] = self.dj
+        self._data["diminuicao_custos"] = decrease
+        self._data["aumento_custos"] = increase
+
+    def add_mip_bound(self, bound, gap):
+        """
+        Inclui o melhor limite dual e o gap relativo de um modelo com variáveis
+        inteiras e indica que os preços sombra vêm da relaxação linear.
+        """
+        self._data["limite_dual"] = bound
+        self._data["gap"] = gap
+        self._data["precos_sombra_origem"] = "relaxacao_linear"
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados pelos arrays dos resultados."""
+        return self.x.nbytes + self.pi.nbytes + self.dj.nbytes + self.slack.nbytes
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, np.ndarray):
+            value = self._data[key] = value.tolist()
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"SolveResult(status={self._data['viavel']}, objetivo={self._data['valor_objetivo']})"
+
+    def _column(self, name):
+        """Índice da variável `name`; o índice de nomes é montado na primeira consulta."""
+        if self._variable_index is None:
+            names = self._variable_names or [f"x{j + 1}" for j in range(self.x.size)]
+            self._variable_index = {name: j for j, name in enumerate(names)}
+        try:
+            return self._variable_index[name]
+        except KeyError:
+            raise KeyError(f"Variável inexistente: {name}") from None
+
+    def _row(self, name):
+        """Índice da restrição `name`; o índice de nomes é montado na primeira consulta."""
+        if self._constraint_index is None:
+            self._constraint_index = {name: i for i, name in enumerate(self._constraint_names or [])}
+        try:
+            return self._constraint_index[name]
+        except KeyError:
+            raise KeyError(f"Restrição inexistente: {name}") from None
+
+    def value(self, name):
+        """Valor da variável `name` (ex: "x1")."""
+        return float(self.x[self._column(name)])
+
+    def reduced_cost(self, name):
+        """Custo reduzido da variável `name`."""
+        return float(self.dj[self._column(name)])
+
+    def shadow_price(self, name):
+        """Preço sombra da restrição `name` (ex: "R1")."""
+        return float(self.pi[self._row(name)])
+
+    def row_slack(self, name):
+        """Folga (RHS - atividade) da restrição `name`."""
+        return float(self.slack[self._row(name)])
@@ -0,0 +1,512 @@
+import os
+import sys
+import tempfile
+import weakref
+
+import numpy as np
+import pulp
+
+import simplex
+from metrics import PhaseTimer, cbc_best_bound, cbc_iterations
+from sensitivity import dense_matrix
+
+# Status de uma resolução interrompida pelo limite de tempo (`Optimizer.time_limit`)
+# com uma solução viável, ainda sem prova de otimalidade. O PuLP não tem um código
+# para esse caso; sem solução viável o status é `pulp.LpStatusNotSolved`.
+STATUS_TIME_LIMIT = 2
+# Gap relativo padrão do HiGHS nos modelos inteiros
+HIGHS_MIP_GAP = 1e-4
+
+
+def _loaded_revision(loaded, optimizer):
+    """
+    A revisão do modelo carregado em um backend com estado, se ele for o
+    modelo de `optimizer`.
+    Args:
+        loaded (tuple): (referência fraca ao otimizador, revisão), ou None.
+        optimizer (Optimizer): O otimizador a ser resolvido.
+    Retorna:
+        int: A revisão, ou None se o backend tiver outro modelo carregado
+        (o de outro otimizador, como um modelo reduzido ou escalado).
+    """
+    if loaded is None or loaded[0]() is not optimizer:
+        return None
+    return loaded[1]
+
+
+class SolverBackend:
+    """
+    Interface dos solvers usados por `Optimizer.solve`.
+
+    Um backend recebe o otimizador (com as restrições no armazenamento
+    compacto), respeita o seu `time_limit` e devolve um dict com as chaves:
+        "status": código de status do PuLP (pulp.LpStatusOptimal, ...) ou
+            STATUS_TIME_LIMIT, se o limite de tempo interromper o solver;
+        "x": array com os valores das variáveis;
+        "dj": array com os custos reduzidos das variáveis;
+        "pi": array com os preços sombra das restrições;
+        "objetivo": valor da função objetivo.
+    Opcionalmente, "metricas": {"fases": tempos por fase (ver `metrics.PhaseTimer`),
+    "iteracoes": iterações do solver ou None}.
+
+    Nos modelos com variáveis inteiras (`Optimizer.is_mip`), o backend também
+    respeita `mip_gap`, `threads` e parte da incumbente (`Optimizer.incumbent`)
+    se ela existir, e inclui "limite": o melhor limite dual, ou None. Os "pi"
+    e "dj" desses modelos não são usados (`Optimizer` os calcula na relaxação linear).
+    """
+
+    name = None
+
+    def solve(self, optimizer, rhs=None):
+        """
+        Resolve o modelo do otimizador.
+        Args:
+            optimizer (Optimizer): O modelo a ser resolvido.
+            rhs (array, opcional): Lados direitos que substituem os armazenados,
+                usados nas simulações sem alterar o modelo original.
+        Retorna:
+            dict: O resultado no formato descrito na classe.
+        """
+        raise NotImplementedError
+
+
+class CbcCmdBackend(SolverBackend):
+    """
+    Resolve o modelo do PuLP com o CBC por linha de comando (o padrão do PuLP):
+    o modelo é escrito em um arquivo MPS e resolvido em um subprocesso.
+    """
+
+    name = "cbc_cmd"
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: Opções repassadas para `pulp.PULP_CBC_CMD`.
+        """
+        self.solver = pulp.PULP_CBC_CMD(**options)
+
+    def solve(self, optimizer, rhs=None):
+        timer = PhaseTimer()
+        model = optimizer.model
+        if rhs is not None:
+            model = model.copy()
+            stored = optimizer.constraints.rhs
+            for index in np.flatnonzero(rhs != stored).tolist():
+                constraint = optimizer._pulp_constraint(index)
+                # PuLP move o RHS para o lado esquerdo (ex: x <= 10 se torna x - 10 <= 0)
+                constraint.constant -= rhs[index] - stored[index]
+                model.constraints[constraint.name] = constraint
+        timer.lap("montagem_modelo")
+
+        # O PuLP escreve o MPS, roda o CBC e lê a solução em uma só chamada: as
+        # marcas entre as fases vêm de `writeMPS` e `readsol_MPS`
+        write_mps, read_solution = model.writeMPS, self.solver.readsol_MPS
+
+        def timed_write_mps(*args, **kwargs):
+            written = write_mps(*args, **kwargs)
+            timer.lap("escrita_arquivo")
+            return written
+
+        def timed_read_solution(*args, **kwargs):
+            timer.lap("solver")
+            return read_solution(*args, **kwargs)
+
+        # O número de iterações só aparece no log do CBC. Sem um `logPath` o log vai
+        # para um arquivo temporário e, com msg=True, é repassado à saída padrão
+        options = self.solver.optionsDict
+        log_path = options.get("logPath")
+        own_log, echo = log_path is None, self.solver.msg
+        if own_log:
+            handle, log_path = tempfile.mkstemp(suffix="-cbc.log")
+            os.close(handle)
+            options["logPath"], self.solver.msg = log_path, False
+        time_limit = self.solver.timeLimit
+        if optimizer.time_limit is not None:
+            self.solver.timeLimit = optimizer.time_limit
+        mip_options = self._mip_options(optimizer) if optimizer.is_mip else {}
+        saved = {option: options.get(option) for option in mip_options}
+        options.update(mip_options)
+        model.writeMPS, self.solver.readsol_MPS = timed_write_mps, timed_read_solution
+        try:
+            model.solve(self.solver)
+        finally:
+            del model.writeMPS, self.solver.readsol_MPS
+            self.solver.timeLimit = time_limit
+            options.update(saved)
+            if own_log:
+                del options["logPath"]
+                self.solver.msg = echo
+
+        status = model.status
+        if model.sol_status == pulp.LpSolutionIntegerFeasible:
+            # "Stopped on time" com solução: o PuLP o trata como ótimo
+            status = STATUS_TIME_LIMIT
+
+        model_constraints = model.constraints
+        outcome = {
+            "status": status,
+            "x": np.array([v.varValue if v.varValue is not None else 0 for v in optimizer.variables],
+                          dtype=float),
+            "dj": np.array([v.dj if v.dj is not None else 0 for v in optimizer.variables], dtype=float),
+            "pi": np.array([model_constraints[name].pi if model_constraints[name].pi is not None else 0
+                            for name in optimizer.constraints.names], dtype=float),
+            "objetivo": pulp.value(model.objective),
+        }
+        with open(log_path, encoding="utf-8", errors="replace") as log:
+            log = log.read()
+        if own_log:
+            os.remove(log_path)
+            if echo:
+                sys.stdout.write(log)
+        timer.lap("leitura_solucao")
+        outcome["metricas"] = {"fases": timer.phases, "iteracoes": cbc_iterations(log)}
+        if optimizer.is_mip:
+            # Sem a linha do limite no log, o CBC terminou a busca: o limite é o próprio ótimo
+            bound = cbc_best_bound(log)
+            if bound is None and status == pulp.LpStatusOptimal:
+                bound = outcome["objetivo"]
+            outcome["limite"] = bound
+        return outcome
+
+    def _mip_options(self, optimizer):
+        """
+        Opções do CBC para a resolução de um modelo inteiro. A incumbente vai
+        como valor inicial das variáveis, gravado pelo PuLP no arquivo de partida.
+        """
+        options = {}
+        if optimizer.mip_gap is not None:
+            options["gapRel"] = optimizer.mip_gap
+        if optimizer.threads is not None:
+            options["threads"] = optimizer.threads
+        if optimizer.incumbent is not None:
+            for variable, value in zip(optimizer.variables, optimizer.incumbent.tolist()):
+                variable.setInitialValue(value, check=False)
+            options["warmStart"] = True
+        return options
+
+
+class HighsBackend(SolverBackend):
+    """
+    Resolve o modelo em memória com o HiGHS (pacote opcional `highspy`),
+    sem arquivos temporários nem subprocessos. A instância do solver é mantida
+    entre as chamadas: enquanto o modelo não muda, apenas os RHS são
+    atualizados e o HiGHS parte da última base (warm start). A base ótima
+    vai no resultado, para a análise de sensibilidade.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: Opções do HiGHS (ex: time_limit=10).
+        """
+        try:
+            import highspy
+        except ImportError:
+            raise pulp.PulpSolverError("O backend 'inprocess' requer o pacote highspy "
+                                       "(pip install highspy).") from None
+        self._highspy = highspy
+        self._highs = highspy.Highs()
+        self._highs.setOptionValue("output_flag", False)
+        for option, value in options.items():
+            self._highs.setOptionValue(option, value)
+        # Limite de tempo, gap e threads das opções, usados quando o otimizador não os define
+        self._time_limit = options.get("time_limit", highspy.kHighsInf)
+        self._mip_gap = options.get("mip_rel_gap", HIGHS_MIP_GAP)
+        self._threads = options.get("threads", 0)
+        self._loaded = None
+
+    def _pass_model(self, optimizer):
+        """Envia o modelo do otimizador ao HiGHS a partir dos arrays CSR."""
+        highspy = self._highspy
+        indptr, indices, data = optimizer.constraints.csr()
+        lp = highspy.HighsLp()
+        lp.num_col_ = optimizer.num_variables
+        lp.num_row_ = len(optimizer.constraints)
+        lp.col_cost_ = np.asarray(optimizer.coef_fo, dtype=float)
+        lp.col_lower_ = np.where(np.isinf(optimizer.lower_bounds), -highspy.kHighsInf, optimizer.lower_bounds)
+        lp.col_upper_ = np.where(np.isinf(optimizer.upper_bounds), highspy.kHighsInf, optimizer.upper_bounds)
+        lp.row_lower_ = np.zeros(lp.num_row_)
+        lp.row_upper_ = np.zeros(lp.num_row_)
+        lp.sense_ = (highspy.ObjSense.kMaximize if optimizer.sense == pulp.LpMaximize
+                     else highspy.ObjSense.kMinimize)
+        if optimizer.is_mip:
+            lp.integrality_ = [highspy.HighsVarType.kInteger if integer else highspy.HighsVarType.kContinuous
+                               for integer in optimizer.integer.tolist()]
+        matrix = lp.a_matrix_
+        matrix.format_ = highspy.MatrixFormat.kRowwise
+        matrix.start_ = np.asarray(indptr, dtype=np.int32)
+        matrix.index_ = np.asarray(indices, dtype=np.int32)
+        matrix.value_ = np.asarray(data, dtype=float)
+        lp.a_matrix_ = matrix
+        self._highs.passModel(lp)
+        self._loaded = (weakref.ref(optimizer), optimizer._revision)
+
+    def _apply_edits(self, optimizer):
+        """
+        Aplica ao modelo carregado as alterações pontuais feitas desde a última
+        carga. O HiGHS mantém a base atual, que serve de ponto de partida.
+        Retorna:
+            bool: False se as alterações não puderem ser aplicadas uma a uma.
+        """
+        edits = optimizer.edits_since(_loaded_revision(self._loaded, optimizer))
+        if edits is None:
+            return False
+        inf = self._highspy.kHighsInf
+        for edit in edits:
+            kind = edit[0]
+            if kind == "objective":
+                self._highs.changeColCost(edit[1], edit[2])
+            elif kind == "objective_function":
+                # Os valores atuais: as alterações pontuais seguintes são reaplicadas depois desta
+                n = optimizer.num_variables
+                self._highs.changeColsCost(n, np.arange(n, dtype=np.int32),
+                                           np.asarray(optimizer.coef_fo, dtype=float))
+            elif kind == "coefficient":
+                self._highs.changeCoeff(edit[1], edit[2], edit[3])
+            elif kind == "add_row":
+                indices, values = edit[1], edit[2]
+                self._highs.addRow(-inf, inf, len(indices), np.asarray(indices, dtype=np.int32),
+                                   np.asarray(values, dtype=float))
+            elif kind == "remove_row":
+                self._highs.deleteRows(1, np.array([edit[1]], dtype=np.int32))
+            elif kind == "bounds":
+                self._highs.changeColBounds(edit[1], max(edit[2], -inf), min(edit[3], inf))
+            elif kind == "type":
+                var_type = self._highspy.HighsVarType
+                self._highs.changeColIntegrality(edit[1], var_type.kInteger if edit[2] else var_type.kContinuous)
+            elif kind not in ("rhs", "sense"):
+                # RHS e operadores são atualizados a cada resolução em `_set_rhs`
+                return False
+        self._loaded = (weakref.ref(optimizer), optimizer._revision)
+        return True
+
+    def _set_rhs(self, optimizer, rhs):
+        """Atualiza os limites das linhas a partir dos RHS e dos operadores."""
+        inf = self._highspy.kHighsInf
+        senses = optimizer.constraints.senses
+        lower = np.where(senses == pulp.LpConstraintLE, -inf, rhs)
+        upper = np.where(senses == pulp.LpConstraintGE, inf, rhs)
+        rows = np.arange(len(rhs), dtype=np.int32)
+        self._highs.changeRowsBounds(len(rhs), rows, lower, upper)
+
+    def _set_mip_options(self, optimizer):
+        """Define o gap e as threads e passa a incumbente, se houver, como solução inicial."""
+        self._highs.setOptionValue("mip_rel_gap", float(optimizer.mip_gap if optimizer.mip_gap is not None
+                                                        else self._mip_gap))
+        self._highs.setOptionValue("threads", int(optimizer.threads if optimizer.threads is not None
+                                                  else self._threads))
+        if optimizer.incumbent is not None:
+            solution = self._highspy.HighsSolution()
+            solution.col_value = np.asarray(optimizer.incumbent, dtype=float)
+            solution.value_valid = True
+            self._highs.setSolution(solution)
+
+    def _basis(self, optimizer):
+        """
+        A base ótima do HiGHS nas colunas de [A | I] (ver `sensitivity`): a
+        linha básica do HiGHS corresponde à folga básica.
+        Retorna:
+            array: Os índices das colunas básicas, ou None se a base não for válida.
+        """
+        basis = self._highs.getBasis()
+        if not basis.valid:
+            return None
+        basic = self._highspy.HighsBasisStatus.kBasic
+        columns = np.flatnonzero([status == basic for status in basis.col_status])
+        rows = np.flatnonzero([status == basic for status in basis.row_status])
+        if columns.size + rows.size != len(optimizer.constraints):
+            return None
+        return np.concatenate([columns, optimizer.num_variables + rows]).astype(np.int64)
+
+    def solve(self, optimizer, rhs=None):
+        highspy = self._highspy
+        timer = PhaseTimer()
+        if _loaded_revision(self._loaded, optimizer) != optimizer._revision and not self._apply_edits(optimizer):
+            self._pass_model(optimizer)
+        self._set_rhs(optimizer, optimizer.constraints.rhs if rhs is None else np.asarray(rhs, dtype=float))
+        self._highs.setOptionValue("time_limit", float(optimizer.time_limit if optimizer.time_limit is not None
+                                                       else self._time_limit))
+        if optimizer.is_mip:
+            self._set_mip_options(optimizer)
+        timer.lap("montagem_modelo")
+        self._highs.run()
+
+        model_status = self._highs.getModelStatus()
+        if model_status in (highspy.HighsModelStatus.kUnboundedOrInfeasible,
+                            highspy.HighsModelStatus.kInfeasible):
+            # O presolve não distingue bem inviável de ilimitado: confirma sem ele
+            self._highs.setOptionValue("presolve", "off")
+            self._highs.run()
+            self._highs.setOptionValue("presolve", "choose")
+            model_status = self._highs.getModelStatus()
+        timer.lap("solver")
+
+        statuses = {
+            highspy.HighsModelStatus.kOptimal: pulp.LpStatusOptimal,
+            highspy.HighsModelStatus.kInfeasible: pulp.LpStatusInfeasible,
+            highspy.HighsModelStatus.kUnbounded: pulp.LpStatusUnbounded,
+        }
+        status = statuses.get(model_status, pulp.LpStatusNotSolved)
+        solution = self._highs.getSolution()
+        num_rows = len(optimizer.constraints)
+        info = self._highs.getInfo()
+        if model_status == highspy.HighsModelStatus.kTimeLimit and solution.value_valid:
+            status = STATUS_TIME_LIMIT
+        outcome = {
+            "status": status,
+            "x": np.array(solution.col_value, dtype=float) if solution.value_valid
+            else np.zeros(optimizer.num_variables),
+            "dj": np.array(solution.col_dual, dtype=float) if solution.dual_valid
+            else np.zeros(optimizer.num_variables),
+            "pi": np.array(solution.row_dual, dtype=float) if solution.dual_valid else np.zeros(num_rows),
+            "objetivo": info.objective_function_value,
+        }
+        if optimizer.is_mip:
+            # As inteiras vêm dentro da tolerância de integralidade (ex: 4,9999999 ou -0,0)
+            integer = optimizer.integer
+            outcome["x"][integer] = np.round(outcome["x"][integer]) + 0.0
+            outcome["limite"] = info.mip_dual_bound if status in (pulp.LpStatusOptimal, STATUS_TIME_LIMIT) else None
+        elif status == pulp.LpStatusOptimal and rhs is None:
+            basis = self._basis(optimizer)
+            if basis is not None:
+                outcome["basis"] = basis
+        # Contagens que não se aplicam à execução vêm como -1
+        iterations = sum(max(count, 0) for count in (info.simplex_iteration_count, info.ipm_iteration_count,
+                                                     info.crossover_iteration_count))
+        timer.lap("leitura_solucao")
+        outcome["metricas"] = {"fases": timer.phases, "iteracoes": iterations}
+        return outcome
+
+
+class SimplexBackend(SolverBackend):
+    """
+    Resolve o modelo com o simplex revisado em NumPy (ver `simplex.py`), sem
+    dependências externas. Indicado para problemas pequenos e médios, em que
+    iniciar um solver externo custa mais que a própria resolução. A base ótima
+    é devolvida no resultado e reaproveitada como ponto de partida (warm start)
+    das resoluções seguintes.
+    """
+
+    name = "simplex"
+
+    def __init__(self, pricing="dantzig", max_iterations=None):
+        """
+        Args:
+            pricing (str): Regra de escolha da coluna: "dantzig", "bland" ou "steepest_edge".
+            max_iterations (int, opcional): Limite de iterações por resolução.
+        """
+        if pricing not in simplex.PRICING_RULES:
+            raise ValueError(f"Regra de pricing desconhecida: {pricing}")
+        self.pricing = pricing
+        self.max_iterations = max_iterations
+        self._dense = (None, None)
+        self._warm_start = None
+
+    def _replay(self, edits, A, warm_start):
+        """
+        Aplica as alterações pontuais à matriz densa e à base de warm start.
+        A base é mantida: linhas novas entram com a folga básica, e ao remover
+        uma linha sai a folga dela ou, se a folga não for básica, a coluna com
+        maior peso na linha removida (o que mantém a base não singular).
+        """
+        basis, at_upper = (None, None) if warm_start is None else (warm_start[1].copy(), warm_start[2].copy())
+        for edit in edits:
+            kind = edit[0]
+            m, n = A.shape
+            if kind == "coefficient":
+                A[edit[1], edit[2]] = edit[3]
+            elif kind == "add_row":
+                row = np.zeros((1, n))
+                row[0, edit[1]] = edit[2]
+                A = np.vstack([A, row])
+                if basis is not None:
+                    basis = np.append(basis, n + m)
+                    at_upper = np.append(at_upper, False)
+            elif kind == "remove_row":
+                i = edit[1]
+                if basis is not None:
+                    slack = n + i
+                    if slack in basis:
+                        position = np.flatnonzero(basis == slack)[0]
+                    else:
+                        B = np.hstack([A, np.eye(m)])[:, basis]
+                        try:
+                            position = np.argmax(np.abs(np.linalg.solve(B, np.eye(m)[:, i])))
+                        except np.linalg.LinAlgError:
+                            position = None
+                    if position is None:
+                        basis = at_upper = None
+                    else:
+                        basis = np.delete(basis, position)
+                        basis[basis > slack] -= 1
+                        at_upper = np.delete(at_upper, slack)
+                A = np.delete(A, i, axis=0)
+        if basis is None:
+            return A, None
+        return A, (A.shape, basis, at_upper)
+
+    def solve(self, optimizer, rhs=None):
+        timer = PhaseTimer()
+        loaded, A = self._dense
+        revision = _loaded_revision(loaded, optimizer)
+        if revision != optimizer._revision:
+            edits = optimizer.edits_since(revision)
+            if edits is None:
+                A = dense_matrix(optimizer.constraints.csr(), optimizer.num_variables)
+            else:
+                A, self._warm_start = self._replay(edits, A.copy(), self._warm_start)
+            self._dense = ((weakref.ref(optimizer), optimizer._revision), A)
+        basis, at_upper = None, None
+        if self._warm_start is not None and self._warm_start[0] == A.shape:
+            _, basis, at_upper = self._warm_start
+        timer.lap("montagem_modelo")
+
+        b = optimizer.constraints.rhs if rhs is None else rhs
+        if optimizer.is_mip:
+            # As threads não se aplicam: a busca roda no próprio processo
+            result = simplex.branch_and_bound(optimizer.coef_fo, A, b, optimizer.constraints.senses,
+                                              optimizer.lower_bounds, optimizer.upper_bounds, optimizer.integer,
+                                              sense=optimizer.sense, incumbent=optimizer.incumbent,
+                                              mip_gap=optimizer.mip_gap, pricing=self.pricing,
+                                              max_iterations=self.max_iterations, time_limit=optimizer.time_limit)
+        else:
+            result = simplex.solve(optimizer.coef_fo, A, b, optimizer.constraints.senses, optimizer.lower_bounds,
+                                   optimizer.upper_bounds, sense=optimizer.sense, basis=basis, at_upper=at_upper,
+                                   pricing=self.pricing, max_iterations=self.max_iterations,
+                                   time_limit=optimizer.time_limit)
+        if result["tempo_esgotado"]:
+            result["status"] = STATUS_TIME_LIMIT
+        if rhs is None and result["status"] == pulp.LpStatusOptimal:
+            self._warm_start = (A.shape, result["basis"], result["at_upper"])
+        timer.lap("solver")
+        result["metricas"] = {"fases": timer.phases, "iteracoes": result["iteracoes"]}
+        return result
+
+
+# Backends disponíveis por nome (ver `get_backend`)
+BACKENDS = {
+    CbcCmdBackend.name: CbcCmdBackend,
+    HighsBackend.name: HighsBackend,
+    SimplexBackend.name: SimplexBackend,
+}
+
+
+def get_backend(backend, **options):
+    """
+    Cria o backend de solver.
+    Args:
+        backend (str ou SolverBackend): Nome registrado em `BACKENDS` ou uma
+            instância já criada.
+        **options: Opções repassadas ao construtor do backend.
+    Retorna:
+        SolverBackend: O backend.
+    """
+    if isinstance(backend, SolverBackend):
+        return backend
+    try:
+        backend_class = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Backend desconhecido: {backend}. Opções: {', '.join(BACKENDS)}") from None
+    return backend_class(**options)
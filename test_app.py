@@ -1,10 +1,19 @@
+import time
+
+import pandas as pd
+import pytest
 from streamlit.testing.v1 import AppTest
 
+import background
+import session_store
+from linear_optimization import Optimizer
+from model_table import split_table
+
 
 def run_optimization_test(num_vars: int, num_restrs: int, objective_coeffs: list, constraints: list,
-                          objective_sense: str = "Maximizar") -> AppTest:
+                          objective_sense: str = "Maximizar", app: AppTest = None) -> AppTest:
 
-    at = AppTest.from_file("app.py", default_timeout=30).run()
+    at = app if app is not None else AppTest.from_file("app.py", default_timeout=30).run()
 
     # --- Configuração dos Inputs ---
     at.number_input(key="num_vars").set_value(num_vars).run()
@@ -26,6 +35,15 @@ def run_optimization_test(num_vars: int, num_restrs: int, objective_coeffs: list
 
     # Clica no botão para calcular
     at.button[0].click().run()
+    return wait_for_solve(at)
+
+
+def wait_for_solve(at: AppTest) -> AppTest:
+    # A resolução roda em segundo plano: roda o script de novo até ela terminar
+    deadline = time.monotonic() + 30
+    while at.session_state["solve_job"] is not None and time.monotonic() < deadline:
+        time.sleep(0.1)
+        at.run()
 
     return at
 
@@ -122,6 +140,73 @@ def test_caso_otimo_classico_2_variaveis_2_restricoes():
     assert at.metric[3].value == "2.50"
     assert at.metric[4].value == "12.50"
 
+    # As faixas só são calculadas quando pedidas
+    custos = at.dataframe[0].value
+    assert "Pode Diminuir" not in custos.columns
+
+    # Faixas dos coeficientes da FO: 15 <= c₁ <= 45 e 80/3 <= c₂ <= 80
+    at.toggle(key="show_cost_ranges").set_value(True).run()
+    custos = at.dataframe[0].value
+    assert custos["Custo Reduzido"].round(2).tolist() == [0.0, 0.0]
+    assert custos["Pode Diminuir"].round(2).tolist() == [25.0, 3.33]
+    assert custos["Pode Aumentar"].round(2).tolist() == [5.0, 50.0]
+
+def test_analise_parametrica_do_rhs():
+    """
+    Varre o RHS de R1 de 0 a 40 no problema Max Z = 40x₁ + 30x₂
+    (x₁ + 2x₂ <= t, 3x₁ + 2x₂ <= 24): quebras em t = 8 e t = 24.
+    """
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=2,
+        objective_coeffs=[40, 30],
+        constraints=[
+            {'coeffs': [1, 2], 'op': '<=', 'rhs': 16},
+            {'coeffs': [3, 2], 'op': '<=', 'rhs': 24},
+        ]
+    )
+    at.selectbox(key="sweep_parameter").select("RHS: R1")
+    at.number_input(key="sweep_start").set_value(0.0)
+    at.number_input(key="sweep_stop").set_value(40.0)
+    at.button[2].click().run()
+
+    assert not at.exception
+    trechos = at.dataframe[1].value
+    assert trechos["Início"].round(2).tolist() == [0.0, 8.0, 24.0]
+    assert trechos["Inclinação"].round(2).tolist() == [40.0, 2.5, 0.0]
+    assert at.caption[-1].value.startswith("2 pontos de quebra")
+
+def test_painel_de_desempenho():
+    # Modelo que nenhum outro teste usa: o cache de soluções é compartilhado
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=2,
+        objective_coeffs=[41, 29],
+        constraints=[
+            {'coeffs': [1, 2], 'op': '<=', 'rhs': 17},
+            {'coeffs': [3, 2], 'op': '<=', 'rhs': 23},
+        ]
+    )
+
+    painel, = [expander for expander in at.expander if expander.label == "Desempenho"]
+    fases = painel.dataframe[0].value
+    assert {"Montagem do modelo", "Solver", "Leitura da solução"} <= set(fases["Fase"])
+    assert (fases["Tempo (ms)"] >= 0).all()
+    assert "2 linhas, 2 colunas, 4 coeficientes não nulos" in painel.markdown[0].value
+
+    # Por padrão, o pico de memória residente; o tracemalloc só quando pedido no painel
+    memoria, = [metric for metric in painel.metric if metric.label == "Pico de Memória (MB)"]
+    assert float(memoria.value) > 0
+    assert at.session_state["resultados"]["metrics"]["pico_memoria_mb"] is None
+    assert not any("tracemalloc" in markdown.value for markdown in painel.markdown)
+    painel.checkbox(key="trace_memory").check().run()
+    at.button[0].click().run()
+    wait_for_solve(at)
+    painel, = [expander for expander in at.expander if expander.label == "Desempenho"]
+    assert at.session_state["resultados"]["metrics"]["pico_memoria_mb"] > 0
+    assert any("tracemalloc" in markdown.value for markdown in painel.markdown)
+    assert painel.checkbox(key="trace_memory").value
+
 def test_caso_otimo_classico_2_variaveis_3_restricoes(capfd):
     """
     Testa o problema: Max Z = 3x₁ + 5x₂
@@ -309,6 +394,27 @@ def test_caso_inviavel():
     assert at.error[0].value == "Solução Inviável"
 
 
+def test_caso_inviavel_destaca_restricoes_em_conflito():
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=3,
+        objective_coeffs=[2, 1],
+        constraints=[
+            {'coeffs': [1, 1], 'op': '<=', 'rhs': 3},
+            {'coeffs': [1, 0], 'op': '<=', 'rhs': 10},
+            {'coeffs': [1, 1], 'op': '>=', 'rhs': 6},
+        ]
+    )
+
+    # --- Verificação dos Resultados ---
+    assert at.error[0].value == "Solução Inviável"
+    assert any("Restrições em conflito" in md.value and "R1" in md.value and "R3" in md.value
+               and "R2" not in md.value for md in at.markdown)
+    conflito = at.dataframe[0].value
+    assert list(conflito["Restrição"]) == ["R1", "R3"]
+    assert list(conflito["Expressão"]) == ["1·x1 + 1·x2 <= 3", "1·x1 + 1·x2 >= 6"]
+
+
 def test_caso_ilimitado():
     at = run_optimization_test(
         num_vars=2,
@@ -322,3 +428,198 @@ def test_caso_ilimitado():
     # --- Verificação dos Resultados ---
     assert at.warning[0].value == "Solução Ilimitada"
 
+
+
+def test_edicao_incremental_apos_resolver():
+    """
+    Resolve o problema de 3 variáveis, altera um RHS e uma restrição e resolve
+    de novo: apenas as diferenças são aplicadas ao otimizador reconstruído do
+    snapshot da sessão, que é então atualizado.
+    """
+    at = run_optimization_test(
+        num_vars=3,
+        num_restrs=3,
+        objective_coeffs=[3, 2, 5],
+        constraints=[
+            {'coeffs': [1, 2, 1], 'op': '<=', 'rhs': 430},
+            {'coeffs': [3, 0, 2], 'op': '<=', 'rhs': 460},
+            {'coeffs': [1, 4, 0], 'op': '<=', 'rhs': 420},
+        ]
+    )
+    snapshot_key = at.session_state.snapshot_key
+
+    at.number_input(key="b_0").set_value(440)
+    at.number_input(key="num_restrs").set_value(2).run()
+    at.button[0].click().run()
+
+    # --- Verificação dos Resultados ---
+    # A sessão guarda só o snapshot do modelo, não o otimizador
+    assert "optimizer" not in at.session_state
+    assert at.session_state.snapshot_key == snapshot_key
+    optimizer = session_store.load(snapshot_key)
+    assert len(optimizer.constraints) == 2
+    assert optimizer.constraints.rhs.tolist() == [440.0, 460.0]
+    assert optimizer._solution is not None
+    assert at.metric[3].value == "1360.00"
+
+
+def test_snapshot_descartado_pede_nova_resolucao():
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=2,
+        objective_coeffs=[40, 30],
+        constraints=[
+            {'coeffs': [1, 2], 'op': '<=', 'rhs': 16},
+            {'coeffs': [3, 2], 'op': '<=', 'rhs': 24},
+        ]
+    )
+    painel, = [expander for expander in at.expander if expander.label == "Desempenho"]
+    assert painel.markdown[1].value.startswith("Memória da sessão:")
+    assert at.session_state.snapshot_bytes > 0
+
+    # O limite de memória descarta o snapshot: a análise pede uma nova resolução
+    session_store.snapshot_store.clear()
+    at.button[1].click().run()
+
+    assert not at.exception
+    assert at.warning[0].value.startswith("O modelo desta sessão saiu da memória do servidor")
+
+
+def test_variaveis_inteiras_com_limite_dual_e_relaxacao():
+    """
+    Testa o problema: Max Z = 5x₁ + 8x₂, com x₁ e x₂ inteiras
+    Sujeito a:
+    1x₁ + 1x₂ <= 6
+    5x₁ + 9x₂ <= 45
+    (a relaxação linear vale 41,25; o ótimo inteiro, 40)
+    """
+    at = AppTest.from_file("app.py", default_timeout=30).run()
+    at.selectbox(key="type_0").select("Inteira")
+    at.selectbox(key="type_1").select("Inteira")
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=2,
+        objective_coeffs=[5, 8],
+        constraints=[
+            {'coeffs': [1, 1], 'op': '<=', 'rhs': 6},
+            {'coeffs': [5, 9], 'op': '<=', 'rhs': 45},
+        ],
+        app=at,
+    )
+
+    assert not at.exception
+    assert [metric.value for metric in at.metric[:3]] == ["0.00", "5.00", "40.00"]
+    assert at.metric[3].label == "Limite Dual"
+    assert at.metric[4].value == "0.00%"
+    assert "Preços Sombra (relaxação LP)" in [subheader.value for subheader in at.subheader]
+
+    # A nova resolução parte da incumbente guardada no snapshot da sessão
+    assert session_store.load(at.session_state.snapshot_key).incumbent.tolist() == [0, 5]
+    at.number_input(key="b_1").set_value(48)
+    at.button[0].click().run()
+    deadline = time.monotonic() + 30
+    while at.session_state["solve_job"] is not None and time.monotonic() < deadline:
+        time.sleep(0.1)
+        at.run()
+    assert at.metric[2].value == "42.00"
+
+
+def test_otimizacao_lexicografica_com_dois_objetivos():
+    """
+    Testa o problema: Max Z = 5x₁ + 8x₂, com 10% de tolerância, e depois Min x₂
+    Sujeito a:
+    1x₁ + 1x₂ <= 6
+    5x₁ + 9x₂ <= 45
+    (Z* = 41,25; com Z >= 37,125, o mínimo de x₂ é 2,375)
+    """
+    at = AppTest.from_file("app.py", default_timeout=30).run()
+    at.number_input(key="num_objectives").set_value(2).run()
+    at.number_input(key="obj_tol_0").set_value(10.0)
+    at.radio(key="obj_sense_1").set_value("Minimizar")
+    at.number_input(key="obj_1_1").set_value(1)
+    at = run_optimization_test(
+        num_vars=2,
+        num_restrs=2,
+        objective_coeffs=[5, 8],
+        constraints=[
+            {'coeffs': [1, 1], 'op': '<=', 'rhs': 6},
+            {'coeffs': [5, 9], 'op': '<=', 'rhs': 45},
+        ],
+        app=at,
+    )
+
+    assert not at.exception
+    assert at.metric[2].value == "41.25"
+    lexicographic = at.session_state.lexicographic
+    assert [stage["valor"] for stage in lexicographic["estagios"]] == pytest.approx([41.25, 2.375])
+    assert lexicographic["estagios"][0]["trava"] == pytest.approx(37.125)
+    assert lexicographic["valores_otimos"] == pytest.approx([3.625, 2.375])
+    assert "Otimização Lexicográfica" in "".join(markdown.value for markdown in at.markdown)
+
+
+def test_modo_grade_com_tabela_do_modelo():
+    """
+    Testa o modo de grade com o problema: Min Z = 2x₁ + 3x₂
+    Sujeito a:
+    1x₁ + 3x₂ >= 6
+    2x₁ + 1x₂ >= 4
+    """
+    at = AppTest.from_file("app.py", default_timeout=30).run()
+    at.radio(key="input_mode").set_value("Grade").run()
+    at.radio(key="objective_sense").set_value("Minimizar").run()
+
+    objective, constraints = split_table(pd.DataFrame({
+        "x1": [2, 1, 2],
+        "x2": [3, 3, 1],
+        "operador": [None, ">=", ">="],
+        "ld": [None, 6, 4],
+    }))
+    at.session_state["grid_objective"] = objective
+    at.session_state["grid_constraints"] = constraints
+    at.run()
+    at.button[0].click().run()
+
+    assert not at.exception
+    assert at.metric[0].value == "7.20"
+    assert at.success[0].value == "Solução Viável"
+    valores = at.dataframe[2].value
+    assert valores["Valor"].round(2).tolist() == [1.2, 1.6]
+    precos = at.dataframe[3].value
+    assert precos["Preço Sombra"].round(2).tolist() == [0.8, 0.6]
+
+def test_nova_resolucao_parte_da_base_anterior(monkeypatch):
+    """
+    Max Z = 3x₁ + 2x₂ + 5x₃ (x₁ fora da base ótima): depois de alterar um
+    coeficiente de x₁, o processo da sessão recebe só a alteração e resolve a
+    partir da base anterior, que continua ótima.
+    """
+    # Todos os modelos vão a um processo de resolução, e não ao processo do app
+    pool = background.WorkerPool(size=1)
+    monkeypatch.setattr(background, "_pool", pool)
+    monkeypatch.setattr(background, "INLINE_LIMIT", -1)
+    try:
+        at = run_optimization_test(
+            num_vars=3,
+            num_restrs=3,
+            objective_coeffs=[3, 2, 5],
+            constraints=[
+                {'coeffs': [1, 2, 1], 'op': '<=', 'rhs': 430},
+                {'coeffs': [3, 0, 2], 'op': '<=', 'rhs': 460},
+                {'coeffs': [1, 4, 0], 'op': '<=', 'rhs': 421},
+            ]
+        )
+        fria = at.session_state["resultados"]["metrics"]
+        assert not fria["partida_quente"]
+        assert fria["iteracoes"] > 0
+
+        at.number_input(key="a_0_0").set_value(1.5)
+        at.button[0].click().run()
+        resultados = wait_for_solve(at).session_state["resultados"]
+        assert resultados["metrics"]["partida_quente"]
+        assert resultados["metrics"]["iteracoes"] == 0
+        esperado = Optimizer.from_arrays([3, 2, 5], [[1.5, 2, 1], [3, 0, 2], [1, 4, 0]], [430, 460, 421],
+                                         ['<=', '<=', '<=']).solve()
+        assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+        assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    finally:
+        pool.close()
@@ -0,0 +1,115 @@
+import time
+
+import pulp
+import pytest
+
+import background
+from linear_optimization import Optimizer
+from solution_cache import SolutionCache
+
+C = [3, 2, 5]
+A = [[1, 2, 1], [3, 0, 2], [1, 4, 0]]
+B = [430, 460, 420]
+SENSES = ["<=", "<=", "<="]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Um conjunto próprio, com um processo, e todos os modelos resolvidos nele
+    pool = background.WorkerPool(size=1)
+    monkeypatch.setattr(background, "_pool", pool)
+    monkeypatch.setattr(background, "INLINE_LIMIT", -1)
+    yield pool
+    pool.close()
+
+
+def test_job_resolve_em_outro_processo_e_adota_a_solucao(pool):
+    cache = SolutionCache()
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, cache=cache)
+    job = background.SolveJob(optimizer, time_limit=30, ranging=True)
+
+    assert job.wait(60)
+    assert job.state == background.DONE
+    resultados = job.result()
+    assert resultados["valor_objetivo"] == pytest.approx(1350)
+    # A solução passa ao otimizador: análises e cache funcionam sem nova resolução
+    assert optimizer.status == pulp.LpStatusOptimal
+    assert optimizer.analyze_delta(0, 5)["melhora"] == pytest.approx(5)
+    assert cache.stats()["entradas"] >= 1
+
+    # Com a solução no cache o job termina na hora, sem processo
+    repetido = background.SolveJob(optimizer)
+    assert repetido.done() and repetido.result()["valor_objetivo"] == pytest.approx(1350)
+
+    # O processo continua vivo e atende ao próximo job
+    processo = pool._idle[0].process
+    optimizer.update_rhs(0, 500)
+    job = background.SolveJob(optimizer)
+    assert job.wait(60) and job.result()["valor_objetivo"] == pytest.approx(1360)
+    assert pool._idle == [pool._idle[0]] and pool._idle[0].process is processo
+
+
+def test_modelo_pequeno_resolvido_no_processo_do_app(monkeypatch):
+    pool = background.WorkerPool(size=1)
+    monkeypatch.setattr(background, "_pool", pool)
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES)
+    job = background.SolveJob(optimizer, time_limit=30)
+
+    assert job.done() and job.result()["valor_objetivo"] == pytest.approx(1350)
+    assert pool._started == 0
+    assert optimizer.time_limit is None
+
+
+def test_processo_guarda_o_otimizador_da_sessao(pool):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES)
+    job = background.SolveJob(optimizer, session="s")
+    assert job.wait(60) and not job.result()["metrics"]["partida_quente"]
+
+    # Só a alteração vai ao processo, que resolve a partir da base anterior
+    optimizer.update_rhs(0, 500)
+    job = background.SolveJob(optimizer, session="s", edits=[("update_rhs", (0, 500.0))])
+    resultados = job.result() if job.wait(60) else None
+    assert resultados["metrics"]["partida_quente"]
+    assert resultados["valor_objetivo"] == pytest.approx(1360)
+
+    # Alterações que não levam ao modelo do job: o modelo inteiro é enviado
+    optimizer.update_rhs(0, 440)
+    job = background.SolveJob(optimizer, session="s", edits=[])
+    resultados = job.result() if job.wait(60) else None
+    assert not resultados["metrics"]["partida_quente"]
+    assert resultados["valor_objetivo"] == pytest.approx(Optimizer.from_arrays(C, A, [440] + B[1:], SENSES)
+                                                         .solve()["valor_objetivo"])
+
+
+def test_job_cancelado_e_modelo_alterado(pool):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES)
+    job = background.SolveJob(optimizer)
+    job.cancel()
+
+    assert job.wait(10)
+    assert job.state == background.CANCELLED
+    with pytest.raises(RuntimeError):
+        job.result()
+
+    job = background.SolveJob(optimizer)
+    optimizer.update_rhs(0, 440)
+    assert job.wait(60) and job.state == background.DONE
+    with pytest.raises(RuntimeError, match="alterado"):
+        job.result()
+
+
+def test_cancelamento_substitui_o_processo(pool):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES)
+    job = background.SolveJob(optimizer)
+    # O primeiro processo ainda está iniciando: o job é cancelado durante a resolução
+    while job.state == background.QUEUED:
+        time.sleep(0.01)
+    processo = job._worker.process
+    job.cancel()
+
+    assert job.wait(10) and job.state == background.CANCELLED
+    assert processo.poll() is not None
+    # Outro processo entra no lugar e atende ao próximo job
+    assert len(pool._idle) == 1 and pool._idle[0].process is not processo
+    job = background.SolveJob(optimizer)
+    assert job.wait(60) and job.result()["valor_objetivo"] == pytest.approx(1350)
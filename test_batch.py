@@ -0,0 +1,41 @@
+import io
+import json
+
+import pytest
+
+import batch
+
+PROBLEMA = {"c": [3, 2, 5], "A": [[1, 2, 1], [3, 0, 2], [1, 4, 0]], "b": [430, 460, 420],
+            "senses": ["<=", "<=", "<="], "deltas": [["R1", 5], {"R1": 5, "R3": -10}]}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lote_grava_um_resultado_por_problema(workers):
+    linhas = [json.dumps(dict(PROBLEMA, id=f"p{i}", b=[430 + i, 460, 420])) for i in range(5)]
+    linhas.insert(2, "")
+    linhas.append(json.dumps({"id": "ruim", "c": [1], "A": [[1]], "b": [], "senses": []}))
+    saida = io.StringIO()
+
+    stats = batch.run_batch(iter(linhas), saida, workers=workers, max_pending=2, backend="simplex")
+    resultados = {r["id"]: r for r in map(json.loads, saida.getvalue().splitlines())}
+
+    assert (stats["problemas"], stats["erros"]) == (6, 1)
+    assert stats["problemas_por_segundo"] > 0
+    assert "ValueError" in resultados.pop("ruim")["erro"]
+    for i in range(5):
+        resultado = resultados[f"p{i}"]
+        assert resultado["resultados"]["valor_objetivo"] == pytest.approx(1350 + i)
+        # R1 tem preço sombra 1: +5 no RHS melhora o objetivo em 5
+        assert len(resultado["deltas"]) == 2
+        assert resultado["deltas"][0]["melhora"] == pytest.approx(5)
+
+
+def test_linha_de_comando(tmp_path, capsys):
+    entrada = tmp_path / "problemas.jsonl"
+    saida = tmp_path / "resultados.jsonl"
+    entrada.write_text(json.dumps(dict(PROBLEMA, sense="min")) + "\n", encoding="utf-8")
+
+    assert batch.main([str(entrada), "--output", str(saida), "--workers", "1"]) == 0
+    resultado, = map(json.loads, saida.read_text(encoding="utf-8").splitlines())
+    assert resultado["id"] == 1 and resultado["resultados"]["valor_objetivo"] == 0
+    assert "problemas/s" in capsys.readouterr().err
@@ -0,0 +1,39 @@
+import json
+
+import pulp
+import pytest
+
+import benchmark
+from linear_optimization import Optimizer
+
+
+@pytest.mark.parametrize("gerador", list(benchmark.GENERATORS))
+def test_geradores_reprodutiveis_e_viaveis(gerador):
+    modelo = benchmark.GENERATORS[gerador](200, seed=3)
+    repetido = benchmark.GENERATORS[gerador](200, seed=3)
+
+    assert (modelo["csr"][2] == repetido["csr"][2]).all()
+    assert abs(modelo["c"].size - 200) <= 24
+    resultados = Optimizer._from_model_arrays(modelo, backend="inprocess").solve()
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+
+
+def test_execucao_em_json_e_regressoes(tmp_path):
+    referencia = tmp_path / "referencia.json"
+    saida = tmp_path / "saida.json"
+
+    assert benchmark.main(["--sizes", "20", "--generators", "transporte", "--output", str(referencia)]) == 0
+    resultados = json.loads(referencia.read_text(encoding="utf-8"))
+    caso, = resultados["casos"]
+    assert caso["status"] == "Optimal"
+    assert caso["fases"]["resolucao"]["segundos"] > 0
+    assert caso["fases"]["analise_delta"]["pico_memoria_mb"] > 0
+
+    # Uma referência muito mais rápida em uma fase acusa regressão (e código de saída 1)
+    caso["fases"]["resolucao"]["segundos"] = 1e-6
+    referencia.write_text(json.dumps(resultados), encoding="utf-8")
+    status = benchmark.main(["--sizes", "20", "--generators", "transporte", "--output", str(saida),
+                             "--baseline", str(referencia), "--max-time-ratio", "2", "--min-seconds", "0"])
+    regressoes = json.loads(saida.read_text(encoding="utf-8"))["regressoes"]
+    assert status == 1
+    assert {(r["fase"], r["medida"]) for r in regressoes} >= {("resolucao", "segundos")}
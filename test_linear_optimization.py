@@ -0,0 +1,881 @@
+import pickle
+
+import numpy as np
+import pulp
+import pytest
+
+import linear_optimization
+import presolve
+import sensitivity
+import session_store
+import simplex
+from linear_optimization import Optimizer
+from solution_cache import SolutionCache
+from solver_backends import STATUS_TIME_LIMIT
+
+# Max Z = 3x₁ + 2x₂ + 5x₃ (mesmo problema de test_app.py)
+C = [3, 2, 5]
+A = [[1, 2, 1],
+     [3, 0, 2],
+     [1, 4, 0]]
+B = [430, 460, 420]
+SENSES = ['<=', '<=', '<=']
+
+
+def build_per_row(c=C, a=A, b=B, senses=SENSES, sense=pulp.LpMaximize):
+    optimizer = Optimizer(len(c), sense=sense)
+    optimizer.set_objective_function(c)
+    for i, row in enumerate(a):
+        optimizer.add_constraint(row, b[i], f"R{i + 1}", senses[i])
+    return optimizer
+
+
+def test_from_arrays_denso_igual_api_por_linha():
+    esperado = build_per_row().solve()
+    resultados = Optimizer.from_arrays(C, np.array(A), B, SENSES).solve()
+
+    # --- Verificação dos Resultados ---
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+
+
+def test_from_arrays_ignora_coeficientes_nulos():
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES)
+
+    assert len(optimizer.model.constraints["R2"]) == 2
+    assert len(optimizer.model.constraints["R3"]) == 2
+
+
+def test_from_arrays_esparso_minimizacao():
+    sparse = pytest.importorskip("scipy.sparse")
+    a = [[1, 3], [2, 1]]
+    esperado = build_per_row([2, 3], a, [6, 4], ['>=', '>='], pulp.LpMinimize).solve()
+    resultados = Optimizer.from_arrays([2, 3], sparse.coo_matrix(a), [6, 4], ['>=', '>='],
+                                       sense=pulp.LpMinimize).solve()
+
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+
+
+def test_from_arrays_dimensoes_invalidas():
+    with pytest.raises(ValueError):
+        Optimizer.from_arrays(C, A, B[:2], SENSES)
+
+
+def test_armazenamento_compacto_das_restricoes():
+    optimizer = build_per_row()
+    store = optimizer.constraints
+
+    # O modelo do PuLP só é montado quando o solver precisa dele
+    assert optimizer._model is None
+    assert len(store) == 3
+    assert store.nnz == 7
+    assert store.index("R3") == 2
+    assert store.sense("R1") == '<='
+    assert store.rhs.tolist() == B
+    assert store.dense_row("R2").tolist() == A[1]
+
+    resultados = optimizer.solve()
+    delta = optimizer.analyze_delta("R3", 10)
+
+    assert resultados["valor_objetivo"] == pytest.approx(1350)
+    assert delta == optimizer.analyze_delta(2, 10)
+
+
+def test_restricao_duplicada_ou_operador_invalido():
+    optimizer = build_per_row()
+
+    with pytest.raises(ValueError):
+        optimizer.add_constraint([1, 1, 1], 10, "R1", '<=')
+    with pytest.raises(ValueError):
+        optimizer.add_constraint([1, 1, 1], 10, "R4", '<')
+
+
+def test_faixas_de_rhs_da_base_otima():
+    optimizer = build_per_row()
+    optimizer.solve()
+    ranges = optimizer.rhs_ranges()
+
+    # Base ótima: x₂ = 100, x₃ = 230 e folga de R3 = 20
+    assert ranges["precos_sombra"] == pytest.approx([1, 2, 0])
+    assert ranges["aumento"] == pytest.approx([10, 400, np.inf])
+    assert ranges["diminuicao"] == pytest.approx([200, 20, 20])
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_base_otima_do_backend_ou_resolucao_acima_do_limite(backend, monkeypatch):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+    # HiGHS e simplex informam a base; com o CBC ela é reconstruída a partir da solução
+    assert (optimizer._solution["basis"] is None) == (backend == "cbc_cmd")
+    assert sorted(optimizer._optimal_basis()["colunas"].tolist()) == [1, 2, 5]
+    assert optimizer.analyze_delta(1, 50)["metodo"] == "preco_sombra"
+
+    # Acima do limite, sem a base do backend, as análises resolvem o modelo de novo
+    monkeypatch.setattr(sensitivity, "RECOVERY_LIMIT", 0)
+    optimizer.solve()
+    if backend == "cbc_cmd":
+        assert optimizer.rhs_ranges() is None and optimizer.cost_ranges() is None
+    resultado = optimizer.analyze_delta(1, 50)
+    assert resultado["metodo"] == ("resolucao" if backend == "cbc_cmd" else "preco_sombra")
+    assert resultado["novo_valor_objetivo"] == pytest.approx(1450)
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_faixas_dos_custos_da_base_otima(backend):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    resultados = optimizer.solve(ranging=True)
+
+    # x₁ fica fora da base com custo reduzido 3 - (1·1 + 3·2) = -4
+    assert resultados["custos_reduzidos"] == pytest.approx([-4, 0, 0], abs=1e-9)
+    assert resultados["aumento_custos"] == pytest.approx([4, 8, np.inf])
+    assert resultados["diminuicao_custos"] == pytest.approx([np.inf, 2, 8 / 3])
+    # Dentro da faixa a solução não muda; logo além dela, muda
+    for j in range(3):
+        for step, limit in ((1, resultados["aumento_custos"][j]), (-1, resultados["diminuicao_custos"][j])):
+            if np.isinf(limit):
+                continue
+            for fraction, same in ((0.9, True), (1.1, False)):
+                c = list(C)
+                c[j] += step * fraction * limit
+                esperado = Optimizer.from_arrays(c, A, B, SENSES).solve()
+                assert (esperado["valores_otimos"] == pytest.approx(resultados["valores_otimos"])) == same
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "simplex"])
+def test_sweep_pontos_de_quebra_exatos(backend):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+
+    rhs = optimizer.sweep(("rhs", "R1"), 0, 1000)
+    assert rhs["pontos_de_quebra"] == pytest.approx([230, 440])
+    assert [s["inclinacao"] for s in rhs["segmentos"]] == pytest.approx([5, 1, 0])
+    assert [s["valor_fim"] for s in rhs["segmentos"]] == pytest.approx([1150, 1360, 1360])
+    assert rhs["segmentos"][1]["valores_otimos_inicio"] == pytest.approx([0, 0, 230], abs=1e-6)
+
+    # Varredura decrescente do preço de x₁: a solução é constante em cada trecho
+    custo = optimizer.sweep(("objective", 0), 10, -2)
+    assert custo["pontos_de_quebra"] == pytest.approx([8, 7])
+    assert [s["valor_inicio"] for s in custo["segmentos"]] == pytest.approx([5000 / 3, 1360, 1350])
+    assert custo["segmentos"][-1]["valores_otimos_fim"] == pytest.approx([0, 100, 230])
+    # O modelo original não é alterado
+    assert optimizer.coef_fo.tolist() == C
+    assert optimizer.constraints.rhs.tolist() == B
+
+
+def test_sweep_com_trechos_inviaveis():
+    # Min 2x₁ + 3x₂ com x₁ + x₂ >= t e x₁ + x₂ <= 10: viável só para t <= 10
+    optimizer = Optimizer.from_arrays([2, 3], [[1, 1], [1, 1]], [5, 10], ['>=', '<='],
+                                      sense=pulp.LpMinimize)
+    optimizer.solve()
+
+    resultado = optimizer.sweep(("rhs", 0), 12, -5)
+    inviavel, custo, zero = resultado["segmentos"]
+    assert inviavel["status"] == pulp.LpStatusInfeasible
+    assert (inviavel["inicio"], inviavel["fim"]) == pytest.approx((12, 10))
+    assert custo["inclinacao"] == pytest.approx(2)
+    assert (custo["valor_inicio"], custo["valor_fim"]) == pytest.approx((20, 0))
+    assert zero["valor_fim"] == pytest.approx(0)
+    assert resultado["pontos_de_quebra"] == pytest.approx([10, 0])
+
+
+@pytest.mark.parametrize("backend, fases", [
+    ("cbc_cmd", {"montagem_modelo", "escrita_arquivo", "solver", "leitura_solucao"}),
+    ("inprocess", {"montagem_modelo", "solver", "leitura_solucao"}),
+    ("simplex", {"montagem_modelo", "solver"}),
+])
+def test_metricas_por_fase(backend, fases):
+    coletadas = []
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend, profiler=coletadas.append)
+    metricas = optimizer.solve(ranging=True, trace_memory=True)["metrics"]
+
+    assert coletadas == [metricas]
+    assert set(metricas["fases"]) == fases | {"resultados", "faixas"}
+    assert (metricas["linhas"], metricas["colunas"], metricas["nao_zeros"]) == (3, 3, 7)
+    assert metricas["iteracoes"] > 0
+    assert metricas["pico_memoria_mb"] > 0
+    # As fases cobrem a resolução inteira
+    assert sum(f["segundos"] for f in metricas["fases"].values()) == pytest.approx(metricas["segundos"])
+    assert all(f["segundos"] >= 0 and f["cpu_segundos"] >= 0 for f in metricas["fases"].values())
+
+    # Com presolve e cache: o acerto no cache não passa pelo solver
+    optimizer.cache = SolutionCache()
+    metricas = optimizer.solve(presolve=True)["metrics"]
+    assert {"presolve", "cache", "solver", "postsolve"} <= set(metricas["fases"])
+    assert metricas["pico_memoria_mb"] is None
+    metricas = optimizer.solve()["metrics"]
+    assert "solver" not in metricas["fases"] and metricas["iteracoes"] is None
+    assert len(coletadas) == 3
+
+
+def test_limite_de_tempo_devolve_solucao_viavel_fora_do_cache():
+    cache = SolutionCache()
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend="simplex", cache=cache, time_limit=1e-9)
+    resultados = optimizer.solve()
+
+    # O simplex para na base inicial (viável), sem provar a otimalidade
+    assert resultados["viavel"] == STATUS_TIME_LIMIT
+    assert resultados["valor_objetivo"] == pytest.approx(np.dot(C, resultados["valores_otimos"]))
+    assert cache.stats()["entradas"] == 0
+
+    optimizer.time_limit = None
+    resultados = optimizer.solve()
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(1350)
+    assert cache.stats()["entradas"] == 1
+
+
+@pytest.mark.parametrize("constr_index, delta_b", [(0, 5), (0, -150), (1, 50), (2, -10), (0, 40), (2, -30)])
+def test_analyze_delta_preco_sombra_igual_a_resolucao(constr_index, delta_b):
+    optimizer = build_per_row()
+    optimizer.solve()
+    resultado = optimizer.analyze_delta(constr_index, delta_b)
+
+    b = list(B)
+    b[constr_index] += delta_b
+    esperado = build_per_row(b=b).solve()
+    ranges = optimizer.rhs_ranges()
+    dentro = -ranges["diminuicao"][constr_index] <= delta_b <= ranges["aumento"][constr_index]
+
+    assert resultado["metodo"] == ("preco_sombra" if dentro else "resolucao")
+    assert resultado["novo_valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    # A simulação não altera o modelo original
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(1350)
+
+
+@pytest.mark.parametrize("delta_b", [1, -1, 10, -3])
+def test_analyze_delta_minimizacao(delta_b):
+    a, senses = [[1, 3], [2, 1]], ['>=', '>=']
+    optimizer = build_per_row([2, 3], a, [6, 4], senses, pulp.LpMinimize)
+    optimizer.solve()
+    resultado = optimizer.analyze_delta("R1", delta_b)
+    esperado = build_per_row([2, 3], a, [6 + delta_b, 4], senses, pulp.LpMinimize).solve()
+
+    assert resultado["novo_valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultado["pode_aumentar"] == (esperado["valor_objetivo"] <= 7.2 + 1e-9)
+
+
+def test_resultado_em_arrays_com_acesso_por_chave_e_nome():
+    resultados = Optimizer.from_arrays(C, A, B, SENSES, names=["a", "b", "c"], backend="simplex").solve()
+
+    assert resultados.x.dtype == np.float64 and resultados.x.flags["C_CONTIGUOUS"]
+    assert resultados.x == pytest.approx([0, 100, 230])
+    assert resultados.slack == pytest.approx([0, 0, 20])
+    assert resultados.value("x3") == pytest.approx(230)
+    assert resultados.shadow_price("b") == pytest.approx(2)
+    assert resultados.row_slack("c") == pytest.approx(20)
+    assert resultados.reduced_cost("x1") == pytest.approx(-4)
+    with pytest.raises(KeyError, match="inexistente"):
+        resultados.shadow_price("R1")
+
+    # O acesso por chave devolve as listas de antes e o resultado segue comparável a um dict
+    assert isinstance(resultados["valores_otimos"], list)
+    assert set(resultados) == {"valores_otimos", "valor_objetivo", "precos_sombra", "viavel", "metrics"}
+    copia = pickle.loads(pickle.dumps(resultados))
+    assert copia == dict(resultados)
+    assert copia.pi == pytest.approx([1, 2, 0])
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_iis_isola_as_restricoes_em_conflito(backend):
+    # R1 e R3 não cabem juntas (com x ≥ 0); R2, R4 e R5 são viáveis com qualquer uma delas
+    optimizer = Optimizer.from_arrays(
+        [1, 1, 1],
+        [[1, 1, 0], [0, 0, 1], [1, 0, 0], [0, 1, 1], [1, -1, 0]],
+        [2, 4, 3, 1, 1],
+        ["<=", "<=", ">=", ">=", "=="],
+        backend=backend,
+    )
+
+    assert optimizer.solve()["viavel"] == pulp.LpStatusInfeasible
+    conflito = optimizer.infeasible_subset()
+    assert conflito["nomes"] == ["R1", "R3"]
+    assert conflito["violacao_minima"] > 0
+    assert conflito["testes"] == conflito["candidatas"] >= 2
+    assert optimizer.infeasible_subset() is conflito
+
+    # Sem R3 (RHS relaxado) o modelo fica viável e não há conflito
+    optimizer.update_rhs("R3", 1)
+    assert optimizer.infeasible_subset()["linhas"] == []
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+@pytest.mark.parametrize("metodo", ["media_geometrica", "equilibrio"])
+def test_escala_desfeita_na_solucao_e_relatorio(backend, metodo):
+    # O problema de referência com linhas e colunas em escalas de 1e-4 a 1e5
+    linhas, colunas = np.array([1e-4, 1e3, 1e5]), np.array([1e2, 1.0, 1e-3])
+    optimizer = Optimizer.from_arrays(np.array(C) * colunas, np.array(A) * linhas[:, None] * colunas,
+                                      np.array(B) * linhas, SENSES, backend=backend)
+    sem_escala = optimizer.solve(ranging=True)
+    resultados = optimizer.solve(ranging=True, scaling=metodo)
+
+    assert resultados["valor_objetivo"] == pytest.approx(1350)
+    assert resultados.x == pytest.approx(np.array([0, 100, 230]) / colunas, rel=1e-6)
+    assert resultados.pi == pytest.approx(np.array([1, 2, 0]) / linhas, rel=1e-6)
+    assert resultados.dj == pytest.approx(sem_escala.dj, rel=1e-6, abs=1e-9)
+    assert {"escala", "desescala"} <= set(resultados["metrics"]["fases"])
+
+    relatorio = optimizer.scaling_report
+    assert relatorio["metodo"] == metodo
+    # Fatores em potências de 2: a desescala é exata
+    assert np.all(np.log2(relatorio["fatores_linhas"]) % 1 == 0)
+    assert np.all(np.log2(relatorio["fatores_colunas"]) % 1 == 0)
+    assert relatorio["faixa_coeficientes_escalada"]["razao"] < relatorio["faixa_coeficientes"]["razao"] / 1e3
+    condicionamento = relatorio["condicionamento_base"]
+    assert condicionamento["escalado"] < condicionamento["original"]
+    assert relatorio["iteracoes_sem_escala"] == sem_escala["metrics"]["iteracoes"]
+    assert relatorio["iteracoes_com_escala"] is not None
+
+    with pytest.raises(ValueError, match="escala desconhecido"):
+        optimizer.solve(scaling="log")
+
+
+@pytest.mark.parametrize("backend", ["inprocess", "simplex"])
+def test_modelo_escalado_usa_outra_instancia_do_backend(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+    optimizer.solve(scaling="equilibrio")
+    # O backend principal continua com o modelo original, pronto para a edição incremental
+    assert _loaded_model(optimizer) is optimizer
+    optimizer.update_rhs(0, 500)
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(1360)
+
+
+def build_blocks(linking_rhs=None):
+    """
+    Três fábricas independentes (4 linhas e 3 colunas cada); com `linking_rhs`,
+    duas linhas de ligação: capacidade total <= 12 e mínimo das colunas pares >= linking_rhs.
+    """
+    rng = np.random.default_rng(3)
+    a = np.zeros((14 if linking_rhs is not None else 12, 9))
+    b, senses = [], []
+    for k in range(3):
+        a[4 * k:4 * k + 4, 3 * k:3 * k + 3] = rng.integers(1, 6, (4, 3))
+        b += rng.integers(10, 30, 4).tolist()
+        senses += ["<="] * 4
+    if linking_rhs is not None:
+        a[12, :], a[13, ::2] = 1, 1
+        b += [12, linking_rhs]
+        senses += ["<=", ">="]
+    return np.array([19, 12, 17, 8, 3, 10, 9, 13, 19]), a, b, senses
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_blocos_independentes_iguais_ao_modelo_inteiro(backend, workers):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    c, a, b, senses = build_blocks()
+    inteiro = Optimizer.from_arrays(c, a, b, senses, backend=backend).solve()
+    optimizer = Optimizer.from_arrays(c, a, b, senses, backend=backend)
+    resultados = optimizer.solve(decomposition="blocos", workers=workers)
+
+    estrutura = optimizer.block_structure(max_linking=0)
+    assert [bloco["colunas"].tolist() for bloco in estrutura["blocos"]] == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+    assert optimizer.decomposition_report["decomposto"]
+    assert optimizer.decomposition_report["processos"] == workers
+    assert resultados["valor_objetivo"] == pytest.approx(inteiro["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(inteiro["valores_otimos"], abs=1e-6)
+    assert resultados["precos_sombra"] == pytest.approx(inteiro["precos_sombra"], abs=1e-6)
+    assert resultados.dj == pytest.approx(inteiro.dj, abs=1e-6)
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "simplex"])
+def test_dantzig_wolfe_com_linhas_de_ligacao(backend):
+    c, a, b, senses = build_blocks(linking_rhs=3)
+    inteiro = Optimizer.from_arrays(c, a, b, senses, backend=backend).solve()
+    optimizer = Optimizer.from_arrays(c, a, b, senses, backend=backend)
+    resultados = optimizer.solve(decomposition="dantzig_wolfe", workers=2)
+
+    relatorio = optimizer.decomposition_report
+    assert (relatorio["blocos"], relatorio["linhas_ligacao"]) == (3, 2)
+    assert relatorio["decomposto"] and relatorio["rodadas"] > 1
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(inteiro["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(inteiro["valores_otimos"], abs=1e-6)
+    assert resultados["precos_sombra"] == pytest.approx(inteiro["precos_sombra"], abs=1e-6)
+
+    # As linhas de ligação impossíveis de atender são detectadas na primeira fase
+    inviavel = Optimizer.from_arrays(*build_blocks(linking_rhs=100), backend=backend)
+    assert inviavel.solve(decomposition="dantzig_wolfe", workers=1)["viavel"] == pulp.LpStatusInfeasible
+    with pytest.raises(ValueError, match="Decomposição desconhecida"):
+        optimizer.solve(decomposition="benders")
+
+
+def test_serializacao_compacta_preserva_modelo_e_solucao():
+    optimizer = build_per_row()
+    optimizer.solve()
+    copia = Optimizer.from_bytes(optimizer.to_bytes())
+
+    assert copia.constraints.names == optimizer.constraints.names
+    assert copia.analyze_delta("R1", 5) == optimizer.analyze_delta("R1", 5)
+    assert copia.solve()["valor_objetivo"] == pytest.approx(1350)
+
+
+def test_snapshots_de_sessao_com_orcamento_de_memoria():
+    optimizer = build_per_row()
+    optimizer.solve()
+    optimizer.analyze_delta("R1", 5)
+    tamanho = len(optimizer.to_bytes())
+    store = SolutionCache(max_bytes=2 * tamanho + 100)
+
+    chaves = [session_store.new_session_key() for _ in range(3)]
+    for chave in chaves:
+        assert session_store.save(chave, optimizer, store) == tamanho
+    # O terceiro snapshot passa do orçamento e descarta o usado há mais tempo
+    assert session_store.load(chaves[0], store) is None
+    assert session_store.usage(store)["sessoes"] == 2
+
+    copia = session_store.load(chaves[2], store, cache=SolutionCache())
+    assert copia.cache is not None
+    # A base reconstruída vai no snapshot: a cópia não precisa recuperá-la
+    assert copia._solution["basis"] is not None
+    assert copia.analyze_delta("R1", 5) == optimizer.analyze_delta("R1", 5)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_deltas_em_lote(workers, monkeypatch):
+    optimizer = build_per_row()
+    optimizer.solve()
+    cenarios = [(0, 5), ("R2", 50), (0, 40), [("R1", 5), ("R3", -5)], {"R1": 40, "R2": -100}]
+
+    resultados = list(optimizer.analyze_deltas(cenarios, workers=workers))
+
+    # --- Verificação dos Resultados ---
+    assert resultados[0] == optimizer.analyze_delta(0, 5)
+    assert resultados[1] == optimizer.analyze_delta("R2", 50)
+    assert resultados[2] == optimizer.analyze_delta(0, 40)
+    assert resultados[3]["metodo"] == "preco_sombra"
+    assert resultados[3]["novo_valor_objetivo"] == pytest.approx(1355)
+    assert resultados[4]["metodo"] == "resolucao"
+    esperado = build_per_row(b=[470, 360, 420]).solve()
+    assert resultados[4]["novo_valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+
+    # Os cenários respondidos pelo preço sombra não vão para os processos
+    monkeypatch.setattr(linear_optimization, "ProcessPoolExecutor", None)
+    assert list(optimizer.analyze_deltas(cenarios[:2] + cenarios[3:4], workers=workers)) == [
+        resultados[0], resultados[1], resultados[3]]
+
+
+@pytest.mark.parametrize("backend", ["inprocess", "simplex"])
+@pytest.mark.parametrize("c, a, b, senses, sense", [
+    (C, A, B, SENSES, pulp.LpMaximize),
+    ([2, 3], [[1, 3], [2, 1]], [6, 4], ['>=', '>='], pulp.LpMinimize),
+    ([1, 1], [[1, 1], [1, 1]], [2, 5], ['<=', '>='], pulp.LpMaximize),
+    ([2, 1], [[1, -1]], [10], ['<='], pulp.LpMaximize),
+])
+def test_backends_em_memoria_iguais_ao_cbc(c, a, b, senses, sense, backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    cbc = Optimizer.from_arrays(c, a, b, senses, sense=sense)
+    esperado = cbc.solve()
+    optimizer = Optimizer.from_arrays(c, a, b, senses, sense=sense, backend=backend)
+    resultados = optimizer.solve()
+
+    assert resultados["viavel"] == esperado["viavel"]
+    if esperado["viavel"] == pulp.LpStatusOptimal:
+        assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+        assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+        assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+        # A mesma instância do solver atende às simulações fora da faixa
+        for delta_b in (1000, -1):
+            delta = optimizer.analyze_delta(0, delta_b)
+            delta_esperado = cbc.analyze_delta(0, delta_b)
+            assert delta["novo_valor_objetivo"] == pytest.approx(delta_esperado["novo_valor_objetivo"])
+            assert delta["metodo"] == delta_esperado["metodo"]
+
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        Optimizer(2, backend="nao_existe")
+
+
+@pytest.mark.parametrize("pricing", simplex.PRICING_RULES)
+def test_simplex_variaveis_limitadas_livres_e_igualdade(pricing):
+    """
+    Max Z = x₁ + 2x₂ - x₃, com 0 <= x₁ <= 4, x₂ <= 3 (x₂ livre abaixo) e x₃ livre
+    Sujeito a:
+    x₁ + x₂ + x₃ == 5
+    x₁ - x₃ >= -2
+    """
+    codes = np.array([pulp.LpConstraintEQ, pulp.LpConstraintGE])
+    resultado = simplex.solve([1, 2, -1], [[1, 1, 1], [1, 0, -1]], [5, -2], codes,
+                              [0, -np.inf, -np.inf], [4, 3, np.inf], sense=pulp.LpMaximize, pricing=pricing)
+
+    # --- Verificação dos Resultados ---
+    assert resultado["status"] == pulp.LpStatusOptimal
+    assert resultado["x"] == pytest.approx([4, 3, -2])
+    assert resultado["objetivo"] == pytest.approx(12)
+    # Dualidade forte: Z = pi·b + dj·x
+    assert resultado["pi"] @ [5, -2] + resultado["dj"] @ resultado["x"] == pytest.approx(12)
+
+
+def test_simplex_warm_start_e_status():
+    codes = np.full(3, pulp.LpConstraintLE)
+    frio = simplex.solve(C, A, B, codes, np.zeros(3), np.full(3, np.inf), sense=pulp.LpMaximize)
+    quente = simplex.solve(C, A, [440, 460, 420], codes, np.zeros(3), np.full(3, np.inf),
+                           sense=pulp.LpMaximize, basis=frio["basis"], at_upper=frio["at_upper"])
+    inviavel = simplex.solve([1, 1], [[1, 1], [1, 1]], [2, 5], np.array([-1, 1]), np.zeros(2), np.full(2, np.inf))
+    ilimitado = simplex.solve([2, 1], [[1, -1]], [10], np.array([-1]), np.zeros(2), np.full(2, np.inf),
+                              sense=pulp.LpMaximize)
+
+    assert quente["status"] == pulp.LpStatusOptimal
+    assert quente["iteracoes"] < frio["iteracoes"]
+    assert quente["objetivo"] == pytest.approx(1360)
+    assert inviavel["status"] == pulp.LpStatusInfeasible
+    assert ilimitado["status"] == pulp.LpStatusUnbounded
+
+
+def test_cache_ignora_ordem_das_linhas_e_nomes(tmp_path):
+    cache = SolutionCache(directory=str(tmp_path))
+    original = Optimizer.from_arrays(C, A, B, SENSES, cache=cache)
+    esperado = original.solve()
+    permutado = Optimizer.from_arrays(C, A[::-1], B[::-1], SENSES, names=["c", "b", "a"], cache=cache)
+    resultados = permutado.solve()
+
+    # --- Verificação dos Resultados ---
+    assert cache.stats()["acertos"] == 1
+    assert cache.stats()["faltas"] == 1
+    assert resultados["valores_otimos"] == esperado["valores_otimos"]
+    assert resultados["precos_sombra"] == esperado["precos_sombra"][::-1]
+
+    assert permutado.analyze_delta("a", 5) == original.analyze_delta("R1", 5)
+    assert cache.stats()["acertos"] == 2
+
+    # Um novo cache no mesmo diretório recupera a solução gravada em disco
+    persistido = SolutionCache(directory=str(tmp_path))
+    restaurado = Optimizer.from_arrays(C, A, B, SENSES, cache=persistido).solve()
+    # As métricas (tempos da resolução) são as únicas que mudam
+    assert restaurado.pop("metrics")["fases"].keys() == {"cache", "resultados"}
+    esperado.pop("metrics")
+    assert restaurado == esperado
+    assert persistido.stats()["acertos"] == 1
+
+
+def test_cache_lru_limitado_por_entradas_e_bytes():
+    cache = SolutionCache(max_entries=2, max_bytes=1000)
+    cache.put("a", np.zeros(10))
+    cache.put("b", np.zeros(10))
+    cache.get("a")
+    cache.put("c", np.zeros(10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["remocoes"] == 1
+
+    cache.put("d", np.zeros(100))
+    assert cache.stats()["entradas"] == 1
+    assert cache.stats()["bytes"] <= 1000
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_edicao_incremental_igual_a_reconstrucao(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+
+    optimizer.update_objective_coeff(0, 4)
+    optimizer.update_rhs("R1", 440)
+    optimizer.update_coefficient("R2", 1, 1)
+    optimizer.update_coefficient("R3", 0, 0)
+    optimizer.add_constraint([1, 1, 1], 200, "R4", '<=')
+    optimizer.update_sense("R4", '>=')
+    optimizer.remove_constraint("R1")
+    resultados = optimizer.solve()
+
+    esperado = Optimizer.from_arrays([4, 2, 5], [[3, 1, 2], [0, 4, 0], [1, 1, 1]], [460, 420, 200],
+                                     ['<=', '<=', '>='], names=["R2", "R3", "R4"]).solve()
+
+    # --- Verificação dos Resultados ---
+    assert optimizer.constraints.names == ["R2", "R3", "R4"]
+    assert resultados["viavel"] == esperado["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+
+
+@pytest.mark.parametrize("backend", ["inprocess", "simplex"])
+def test_backend_com_outro_modelo_carregado_recarrega_o_modelo(backend):
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+    optimizer.solve(scaling="equilibrio")
+    optimizer.update_rhs(0, 500)
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(1360)
+
+    # Outro otimizador no mesmo backend: só a revisão não identifica o modelo carregado
+    outro = Optimizer.from_arrays([1, 1, 1], A, B, SENSES, backend=optimizer.backend)
+    outro.solve()
+    optimizer.update_rhs(0, 430)
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(1350)
+    esperado = Optimizer.from_arrays([1, 1, 1], A, B, SENSES).solve()
+    assert outro.solve()["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+
+
+def test_resolucao_incremental_parte_da_base_anterior():
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend="simplex")
+    frio = optimizer.backend.solve(optimizer)
+    optimizer.solve()
+
+    optimizer.update_rhs("R1", 435)
+    optimizer.add_constraint([1, 1, 1], 1000, "R4", '<=')
+    quente = optimizer.backend.solve(optimizer)
+
+    assert quente["status"] == pulp.LpStatusOptimal
+    assert quente["iteracoes"] < frio["iteracoes"]
+    assert optimizer.edits_since(0) is None
+
+
+def build_presolve_model():
+    # Problema base + linha paralela folgada, linha vazia, linha redundante,
+    # coluna vazia (x4) e coluna fixa (x5 = 2)
+    a = [row + [0, 0] for row in A]
+    a[2][4] = 1
+    a += [[2, 4, 2, 0, 0], [0, 0, 0, 0, 0], [1, 1, 1, 0, 0], [1, 2, 1, 0, 0]]
+    b = B[:2] + [422, 960, 5, 10000, 500]
+    return Optimizer.from_arrays(C + [-1, 4], a, b, SENSES + ['<=', '<=', '<=', '<='],
+                                 lower=[0, 0, 0, 0, 2], upper=[500, 500, 500, 500, 2])
+
+
+def test_presolve_remove_e_restaura_a_solucao_completa():
+    optimizer = build_presolve_model()
+    esperado = optimizer.solve()
+    resultados = optimizer.solve(presolve=True)
+
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+    assert len(resultados["precos_sombra"]) == 7
+
+    relatorio = optimizer.presolve_report
+    assert relatorio["removidas"] == {"linhas_singleton": 0, "colunas_fixas": 1, "colunas_vazias": 1, "linhas_vazias": 1,
+                                      "linhas_redundantes": 1, "linhas_paralelas": 2}
+    assert (relatorio["linhas"], relatorio["colunas"]) == (3, 3)
+    assert relatorio["tempo_economizado"] is not None
+    # Sem uma resolução sem presolve do mesmo modelo não há tempo a comparar
+    sem_referencia = build_presolve_model()
+    sem_referencia.solve(presolve=True)
+    assert "tempo_economizado" not in sem_referencia.presolve_report
+
+    # A análise de sensibilidade continua usando o modelo completo
+    assert optimizer.analyze_delta(0, 10)["melhora"] == pytest.approx(10)
+
+
+def test_presolve_detecta_inviabilidade_em_linhas_paralelas():
+    optimizer = Optimizer.from_arrays([1, 1], [[1, 1], [2, 2]], [1, 10], ['<=', '>='])
+    resultados = optimizer.solve(presolve=True)
+
+    assert resultados["viavel"] == pulp.LpStatusInfeasible
+    assert optimizer.presolve_report["status"] == pulp.LpStatusInfeasible
+    assert resultados["precos_sombra"] == [0, 0]
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_limites_nativos_iguais_a_restricoes(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    # x₁ <= 100 e x₂ livre >= -10 como limites, em vez de linhas da matriz
+    com_linhas = Optimizer.from_arrays(C, A + [[1, 0, 0]], B + [100], SENSES + ['<='],
+                                       singleton_bounds=False).solve()
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, upper=[100, np.inf, np.inf], backend=backend)
+    resultados = optimizer.solve()
+
+    assert resultados["valor_objetivo"] == pytest.approx(com_linhas["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(com_linhas["valores_otimos"])
+    assert len(resultados["precos_sombra"]) == 3
+
+    # Alteração incremental dos limites
+    optimizer.set_variable_bounds(1, lower=None, upper=50)
+    optimizer.set_variable_bounds(2, lower=None, upper=None)
+    esperado = Optimizer.from_arrays(C, A, B, SENSES, lower=[0, -np.inf, -np.inf],
+                                     upper=[100, 50, np.inf]).solve()
+    resultados = optimizer.solve()
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+
+    with pytest.raises(ValueError):
+        optimizer.set_variable_bounds(0, lower=5, upper=1)
+
+
+@pytest.mark.parametrize("sense", [pulp.LpMaximize, pulp.LpMinimize])
+def test_restricoes_de_uma_variavel_viram_limites(sense):
+    # Max/Min de 5x₁ + 4x₂ com limites em linhas de uma variável (inclusive -2x₂ >= -6)
+    c = [5, 4] if sense == pulp.LpMaximize else [-5, -4]
+    a = [[6, 4], [1, 2], [1, 0], [0, -2], [1, 0]]
+    b = [24, 6, 2, -6, 10]
+    senses = ['<=', '<=', '<=', '>=', '<=']
+    esperado = Optimizer.from_arrays(c, a, b, senses, sense=sense, singleton_bounds=False).solve()
+    optimizer = Optimizer.from_arrays(c, a, b, senses, sense=sense)
+    resultados = optimizer.solve()
+
+    assert presolve.has_singleton_rows(optimizer)
+    assert resultados["valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    assert resultados["valores_otimos"] == pytest.approx(esperado["valores_otimos"])
+    # Preço sombra de x₁ <= 2 (ativa) vem do custo reduzido de x₁; x₁ <= 10 fica com zero
+    assert resultados["precos_sombra"] == pytest.approx(esperado["precos_sombra"])
+    assert resultados["precos_sombra"][2] != 0
+    assert resultados["precos_sombra"][4] == 0
+    assert optimizer.analyze_delta(2, 0.5)["melhora"] == pytest.approx(0.5 * resultados["precos_sombra"][2])
+
+
+def _loaded_model(optimizer):
+    # Referência fraca ao otimizador cujo modelo está carregado no backend com estado
+    backend = optimizer.backend
+    loaded = backend._loaded if backend.name == "inprocess" else backend._dense and backend._dense[0]
+    return loaded[0]() if loaded else None
+
+
+@pytest.mark.parametrize("backend", ["inprocess", "simplex"])
+def test_modelo_reduzido_usa_outra_instancia_do_backend(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    # A linha x₃ <= 100 vira limite: o modelo reduzido não pode ocupar o backend do original
+    optimizer = Optimizer.from_arrays(C, A + [[0, 0, 1]], B + [100], SENSES + ['<='], backend=backend)
+    optimizer.solve()
+    assert _loaded_model(optimizer) in (None, optimizer)
+    assert optimizer.analyze_delta(1, 1000)["novo_valor_objetivo"] == pytest.approx(1490)
+
+    # Linha de uma variável incluída e depois removida no modelo montado linha a linha
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    optimizer.solve()
+    optimizer.add_constraint([0, 0, 1], 100, "cap", "<=")
+    optimizer.solve()
+    assert _loaded_model(optimizer) is optimizer
+    optimizer.remove_constraint("cap")
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(1350)
+
+
+# Max Z = 5x₁ + 8x₂ com x inteiro: a relaxação linear dá 41,25 em (2,25; 3,75) e o ótimo inteiro, 40 em (0; 5)
+C_MIP = [5, 8]
+A_MIP = [[1, 1], [5, 9]]
+B_MIP = [6, 45]
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_modelo_inteiro_com_limite_gap_e_relaxacao(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    relaxacao = Optimizer.from_arrays(C_MIP, A_MIP, B_MIP, ['<=', '<='], backend=backend).solve()
+    optimizer = Optimizer.from_arrays(C_MIP, A_MIP, B_MIP, ['<=', '<='], integer=True, backend=backend)
+    resultados = optimizer.solve()
+
+    assert optimizer.is_mip
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["valor_objetivo"] == pytest.approx(40)
+    assert resultados["valores_otimos"] == pytest.approx([0, 5])
+    assert 40 - 1e-6 <= resultados["limite_dual"] <= relaxacao["valor_objetivo"] + 1e-6
+    assert resultados["gap"] == pytest.approx(0, abs=1e-3)
+    # Os preços sombra são os da relaxação linear, e não há faixas da base
+    assert resultados["precos_sombra_origem"] == "relaxacao_linear"
+    assert resultados["precos_sombra"] == pytest.approx(relaxacao["precos_sombra"])
+    assert optimizer.rhs_ranges() is None
+    np.testing.assert_allclose(optimizer.incumbent, [0, 5])
+
+    # A análise de delta resolve o modelo inteiro de novo, a partir da incumbente
+    delta = optimizer.analyze_delta(1, 3)
+    esperado = Optimizer.from_arrays(C_MIP, A_MIP, [6, 48], ['<=', '<='], integer=True).solve()
+    assert delta["metodo"] == "resolucao"
+    assert delta["novo_valor_objetivo"] == pytest.approx(esperado["valor_objetivo"])
+    with pytest.raises(ValueError):
+        optimizer.sweep(("rhs", 0), 0, 10)
+    with pytest.raises(ValueError):
+        optimizer.solve(presolve=True)
+
+    # Tipos alterados incrementalmente: x₂ binária e x₁ contínua
+    optimizer.set_variable_type(1, pulp.LpBinary)
+    optimizer.set_variable_type(0, pulp.LpContinuous)
+    resultados = optimizer.solve()
+    assert optimizer.upper_bounds[1] == 1
+    assert resultados["valores_otimos"] == pytest.approx([5, 1])
+    assert resultados["valor_objetivo"] == pytest.approx(33)
+    with pytest.raises(ValueError):
+        optimizer.set_variable_type(0, "Semicontinua")
+
+
+def test_modelo_inteiro_com_gap_limite_de_tempo_e_incumbente():
+    rng = np.random.default_rng(7)
+    pesos = rng.integers(10, 60, (3, 30))
+    valores = rng.integers(10, 60, 30)
+    capacidades = pesos.sum(axis=1) // 3
+    optimizer = Optimizer.from_arrays(valores, pesos, capacidades, ['<='] * 3, integer=True, upper=1,
+                                      backend="simplex", mip_gap=0.05)
+    resultados = optimizer.solve()
+    assert resultados["viavel"] == pulp.LpStatusOptimal
+    assert resultados["limite_dual"] >= resultados["valor_objetivo"]
+    assert resultados["gap"] <= 0.05
+
+    # Sem tempo para explorar nós, a resolução devolve a incumbente informada
+    incumbente = np.zeros(30)
+    incumbente[np.argmax(valores)] = 1
+    copia = Optimizer.from_bytes(optimizer.to_bytes(), time_limit=1e-9)
+    assert copia.is_mip and copia.mip_gap == 0.05
+    copia.set_incumbent(incumbente)
+    resultados = copia.solve()
+    assert resultados["viavel"] == STATUS_TIME_LIMIT
+    assert resultados["valores_otimos"] == incumbente.tolist()
+    assert resultados["valor_objetivo"] == valores.max()
+
+    # Com gap zero a busca prova o ótimo, que bate com o CBC
+    cbc = Optimizer.from_arrays(valores, pesos, capacidades, ['<='] * 3, integer=True, upper=1).solve()
+    resultado = simplex.branch_and_bound(valores, pesos, capacidades, optimizer.constraints.senses, np.zeros(30),
+                                         np.ones(30), np.ones(30, dtype=bool), sense=pulp.LpMaximize,
+                                         incumbent=incumbente)
+    assert resultado["objetivo"] == pytest.approx(cbc["valor_objetivo"])
+    assert resultado["limite"] == pytest.approx(resultado["objetivo"])
+
+
+@pytest.mark.parametrize("backend", ["cbc_cmd", "inprocess", "simplex"])
+def test_otimizacao_lexicografica_com_estagios_travados(backend):
+    if backend == "inprocess":
+        pytest.importorskip("highspy")
+    # Primeiro o lucro (máx), depois x₃ (mín) no lucro ótimo e por fim x₁ + x₂ + x₃ (máx)
+    optimizer = Optimizer.from_arrays(C, A, B, SENSES, backend=backend)
+    resultado = optimizer.solve_lexicographic([
+        C,
+        {"coeficientes": [0, 0, 1], "sentido": pulp.LpMinimize, "nome": "x3"},
+        {"coeficientes": [1, 1, 1], "sentido": pulp.LpMaximize},
+    ])
+
+    assert resultado["status"] == pulp.LpStatusOptimal
+    assert [estagio["nome"] for estagio in resultado["estagios"]] == ["Objetivo 1", "x3", "Objetivo 3"]
+    assert resultado["valores_objetivos"] == pytest.approx([1350, 230, 330], abs=1e-3)
+    assert resultado["valores_otimos"] == pytest.approx([0, 100, 230], abs=1e-3)
+    assert resultado["estagios"][0]["trava"] == pytest.approx(1350)
+    assert resultado["estagios"][-1]["trava"] is None
+    assert all(estagio["segundos"] > 0 for estagio in resultado["estagios"])
+    if backend == "simplex":
+        # Os estágios seguintes partem da base do anterior
+        assert resultado["estagios"][1]["iteracoes"] <= 1
+    # O modelo original não muda
+    assert optimizer.coef_fo.tolist() == C
+    assert len(optimizer.constraints) == 3
+
+
+def test_otimizacao_lexicografica_com_tolerancia_e_inteiras():
+    # Lucro (40 no ótimo inteiro) com 10% de tolerância, depois o mínimo de x₂
+    optimizer = Optimizer.from_arrays(C_MIP, A_MIP, B_MIP, ['<=', '<='], integer=True, backend="simplex")
+    resultado = optimizer.solve_lexicographic([
+        {"coeficientes": C_MIP, "tolerancia": 0.1},
+        {"coeficientes": [0, 1], "sentido": pulp.LpMinimize},
+    ])
+    assert resultado["estagios"][0]["valor"] == pytest.approx(40)
+    assert resultado["estagios"][0]["trava"] == pytest.approx(36)
+    assert resultado["valores_otimos"] == pytest.approx([4, 2])
+    assert resultado["valores_objetivos"] == pytest.approx([36, 2])
+
+    # Um estágio inviável encerra a sequência
+    inviavel = Optimizer.from_arrays([1, 1], [[1, 1], [1, 1]], [1, 2], ['<=', '>='])
+    resultado = inviavel.solve_lexicographic([[1, 0], [0, 1]])
+    assert resultado["status"] == pulp.LpStatusInfeasible
+    assert len(resultado["estagios"]) == 1
+    assert resultado["valores_otimos"] is None
+    with pytest.raises(ValueError):
+        optimizer.solve_lexicographic([[1, 2, 3]])
+    with pytest.raises(ValueError):
+        optimizer.solve_lexicographic([{"coeficientes": [1, 1], "tolerancia": -0.1}])
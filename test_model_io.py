@@ -0,0 +1,159 @@
+import tracemalloc
+
+import numpy as np
+import pulp
+import pytest
+
+from linear_optimization import Optimizer
+
+
+def pulp_problem():
+    problem = pulp.LpProblem("teste", pulp.LpMaximize)
+    x = pulp.LpVariable("x", 0, 4)
+    y = pulp.LpVariable("y")
+    z = pulp.LpVariable("z", -3)
+    problem += 3 * x + 2 * y - z
+    problem += x + y <= 4, "c1"
+    problem += x - 2 * z >= -2, "c2"
+    problem += y + z == 1, "c3"
+    return problem
+
+
+@pytest.mark.parametrize("formato", ["lp", "mps"])
+def test_leitura_de_arquivos_do_pulp(tmp_path, formato):
+    problem = pulp_problem()
+    caminho = str(tmp_path / f"modelo.{formato}")
+    if formato == "lp":
+        problem.writeLP(caminho)
+        optimizer = Optimizer.read_lp(caminho)
+    else:
+        problem.writeMPS(caminho)
+        optimizer = Optimizer.read_mps(caminho)
+
+    assert optimizer.sense == pulp.LpMaximize
+    assert optimizer.variable_names == ["x", "y", "z"]
+    assert optimizer.constraints.names == ["c1", "c2", "c3"]
+    np.testing.assert_allclose(optimizer.lower_bounds, [0, -np.inf, -3])
+    np.testing.assert_allclose(optimizer.upper_bounds, [4, np.inf, np.inf])
+
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    resultados = optimizer.solve()
+    assert resultados["valor_objetivo"] == pytest.approx(pulp.value(problem.objective))
+    assert resultados["precos_sombra"] == pytest.approx([c.pi for c in problem.constraints.values()])
+    assert optimizer.read_stats["nnz"] == 6
+
+
+def test_lp_com_restricoes_em_varias_linhas_e_limites(tmp_path):
+    caminho = tmp_path / "modelo.lp"
+    caminho.write_text(
+        "\\ comentário\n"
+        "Minimize\n obj: 2 x1 + 3 x2\n"
+        "Subject To\n"
+        " cobertura: x1 + 3 x2\n   >= 6\n"
+        " 2 x1 + x2 - 1 >= 3\n"
+        "Bounds\n 0 <= x1 <= 10\n x2 >= -1\n"
+        "End\n")
+    optimizer = Optimizer.read_lp(str(caminho))
+
+    assert optimizer.constraints.names == ["cobertura", "R2"]
+    np.testing.assert_allclose(optimizer.constraints.rhs, [6, 4])
+    np.testing.assert_allclose(optimizer.upper_bounds, [10, np.inf])
+    np.testing.assert_allclose(optimizer.lower_bounds, [0, -1])
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(7.2)
+
+
+def test_mps_com_faixas(tmp_path):
+    caminho = tmp_path / "modelo.mps"
+    caminho.write_text(
+        "NAME faixas\nOBJSENSE\n    MAX\nROWS\n N obj\n L r1\n E r2\n"
+        "COLUMNS\n    x obj 1 r1 1\n    x r2 1\n    y obj 1 r1 1\n"
+        "RHS\n    rhs r1 10 r2 2\nRANGES\n    rng r1 4 r2 3\nENDATA\n")
+    optimizer = Optimizer.read_mps(str(caminho))
+
+    # r1: 6 <= x + y <= 10 e r2: 2 <= x <= 5
+    assert optimizer.constraints.names == ["r1", "r2", "r1_faixa", "r2_faixa"]
+    assert [optimizer.constraints.sense(i) for i in range(4)] == ["<=", ">=", ">=", "<="]
+    np.testing.assert_allclose(optimizer.constraints.rhs, [10, 2, 6, 5])
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(10)
+
+
+@pytest.mark.parametrize("formato", ["lp", "mps"])
+def test_variaveis_inteiras_lidas_e_gravadas(tmp_path, formato):
+    problem = pulp.LpProblem("inteiro", pulp.LpMaximize)
+    x = pulp.LpVariable("x", 0, cat=pulp.LpInteger)
+    y = pulp.LpVariable("y", 0)
+    z = pulp.LpVariable("z", cat=pulp.LpBinary)
+    problem += 5 * x + 8 * y + 3 * z
+    problem += x + y + z <= 6, "c1"
+    problem += 5 * x + 9 * y <= 45, "c2"
+    caminho = str(tmp_path / f"modelo.{formato}")
+    if formato == "lp":
+        problem.writeLP(caminho)
+        optimizer = Optimizer.read_lp(caminho)
+    else:
+        problem.writeMPS(caminho)
+        optimizer = Optimizer.read_mps(caminho)
+
+    assert optimizer.integer.tolist() == [True, False, True]
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    assert optimizer.solve()["valor_objetivo"] == pytest.approx(pulp.value(problem.objective))
+
+    # A gravação mantém as inteiras entre os marcadores INTORG/INTEND
+    copia = str(tmp_path / "copia.mps")
+    optimizer.write_mps(copia)
+    assert Optimizer.read_mps(copia).integer.tolist() == [True, False, True]
+
+
+def test_gravacao_mps_preserva_limites_e_nome_do_objetivo(tmp_path):
+    # Uma restrição chamada OBJ, um limite superior negativo com inferior 0 e uma inteira sem limites
+    optimizer = Optimizer.from_arrays([1, 1, 2], [[1, 1, 1], [0, 1, 1]], [10, 4], ["<=", "<="],
+                                      names=["OBJ", "R2"], lower=[0, -5, 0], upper=[np.inf, -1, np.inf],
+                                      integer=[False, False, True])
+    caminho = tmp_path / "modelo.mps"
+    optimizer.write_mps(str(caminho))
+    lido = Optimizer.read_mps(str(caminho))
+
+    assert " N  OBJ_1" in caminho.read_text()
+    assert " PL BND  x3" in caminho.read_text()
+    assert lido.constraints.names == ["OBJ", "R2"]
+    np.testing.assert_array_equal(lido.coef_fo, [1, 1, 2])
+    np.testing.assert_array_equal(lido.lower_bounds, [0, -5, 0])
+    np.testing.assert_array_equal(lido.upper_bounds, [np.inf, -1, np.inf])
+    assert lido.integer.tolist() == [False, False, True]
+
+    # Com o LO 0 explícito, a ordem das linhas não muda o limite inferior
+    invertido = tmp_path / "invertido.mps"
+    invertido.write_text("NAME t\nROWS\n N obj\n L r\nCOLUMNS\n    x obj 1 r 1\nRHS\n    rhs r 1\n"
+                         "BOUNDS\n UP BND x -2\n LO BND x 0\nENDATA\n")
+    sem_inferior = tmp_path / "sem_inferior.mps"
+    sem_inferior.write_text(invertido.read_text().replace(" LO BND x 0\n", ""))
+    assert Optimizer.read_mps(str(invertido)).lower_bounds.tolist() == [0]
+    assert Optimizer.read_mps(str(sem_inferior)).lower_bounds.tolist() == [-np.inf]
+
+
+def test_arquivo_grande_ida_e_volta_com_memoria_limitada(tmp_path):
+    rng = np.random.default_rng(7)
+    m, n, nnz = 2000, 5000, 40000
+    A = np.zeros((m, n))
+    A[rng.integers(0, m, nnz), rng.integers(0, n, nnz)] = rng.uniform(0.5, 2.0, nnz)
+    upper = np.full(n, np.inf)
+    upper[::7] = 50.0
+    original = Optimizer.from_arrays(rng.random(n), A, rng.uniform(10, 100, m), ["<="] * m, upper=upper)
+    caminho = str(tmp_path / "grande.mps")
+    original.write_mps(caminho)
+    del A
+
+    tracemalloc.start()
+    lido = Optimizer.read_mps(caminho)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    for esperado, obtido in zip(original.constraints.csr(), lido.constraints.csr()):
+        np.testing.assert_array_equal(esperado, obtido)
+    np.testing.assert_array_equal(original.coef_fo, lido.coef_fo)
+    np.testing.assert_array_equal(original.upper_bounds, lido.upper_bounds)
+    assert lido.sense == pulp.LpMaximize
+    # Memória de pico proporcional aos não nulos (nomes incluídos), longe do tamanho denso m x n
+    assert pico < 300 * original.constraints.nnz + 2_000_000
+    assert lido.read_stats["linhas"] > original.constraints.nnz
+    assert lido.read_stats["mb_por_segundo"] > 0
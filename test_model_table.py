@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from linear_optimization import Optimizer
+from model_table import empty_tables, model_arrays, read_table, resize_tables
+
+TABELA = pd.DataFrame({
+    "x1": [3, 1, 0, 3],
+    "x2": [5, 0, 2, 2],
+    "Operador": [None, "<=", "<=", "<="],
+    "LD": [None, 4, 12, 18],
+})
+
+
+@pytest.mark.parametrize("extensao", ["csv", "parquet"])
+def test_leitura_de_arquivo_e_caminho_em_lote(tmp_path, extensao):
+    caminho = tmp_path / f"modelo.{extensao}"
+    if extensao == "csv":
+        TABELA.to_csv(caminho, index=False)
+    else:
+        TABELA.to_parquet(caminho, index=False)
+
+    objetivo, restricoes = read_table(str(caminho))
+    c, A, b, senses = model_arrays(objetivo, restricoes)
+
+    assert list(objetivo.columns) == ["x1", "x2"]
+    np.testing.assert_allclose(c, [3, 5])
+    np.testing.assert_allclose(A, [[1, 0], [0, 2], [3, 2]])
+    np.testing.assert_allclose(b, [4, 12, 18])
+    assert senses == ["<=", "<=", "<="]
+
+    resultado = Optimizer.from_arrays(c, A, b, senses).solve()
+    assert resultado["valor_objetivo"] == pytest.approx(36)
+
+
+def test_celulas_vazias_e_operador_invalido():
+    objetivo, restricoes = empty_tables(2, 1)
+    restricoes.loc[1] = [1.0, None, None, None]  # Linha adicionada pelo editor
+    c, A, b, senses = model_arrays(objetivo, restricoes)
+    np.testing.assert_allclose(A, [[0, 0], [1, 0]])
+    assert senses == ["<=", "<="]
+
+    restricoes.loc[0, "Operador"] = "=<"
+    with pytest.raises(ValueError):
+        model_arrays(objetivo, restricoes)
+    with pytest.raises(ValueError):
+        read_table("modelo.xlsx")
+
+
+def test_redimensionamento_mantem_valores():
+    objetivo, restricoes = empty_tables(2, 1)
+    objetivo.loc["FO", "x2"] = 7.0
+    objetivo, restricoes = resize_tables(objetivo, restricoes, 3)
+    assert list(objetivo.columns) == ["x1", "x2", "x3"]
+    assert list(restricoes.columns) == ["x1", "x2", "x3", "Operador", "LD"]
+    assert objetivo.loc["FO", "x2"] == 7.0